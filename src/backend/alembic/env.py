@@ -11,6 +11,9 @@ from app.api.v1.models.token import Token
 from app.api.v1.models.user_game import UserGame
 from app.api.v1.models.review import Review, ReviewLike, ReviewComment
 from app.api.v1.models.game import Game
+from app.api.v1.models.game_raw_data import GameRawData
+from app.api.v1.models.game_facet import GameFacet
+from app.api.v1.models.discovery_ranking import DiscoveryRanking
 from app.api.v1.models.user_list import UserList, user_list_games
 from app.api.v1.models.user_platform_link import UserPlatformLink
 
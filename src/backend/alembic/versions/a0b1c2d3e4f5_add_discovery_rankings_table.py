@@ -0,0 +1,36 @@
+"""add discovery_rankings for precomputed homepage lists
+
+Trending, anticipated, highly rated and latest games were each a filtered sort
+over the whole games table on every discovery cache miss. discovery_rankings
+keeps each list's ordered game ids, refreshed by the scheduler after its
+featured-games sync; the endpoints read a list by primary key. The table
+starts empty and each list is ranked on first read.
+
+Revision ID: a0b1c2d3e4f5
+Revises: f0a1b2c3d4e5
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a0b1c2d3e4f5'
+down_revision: Union[str, None] = 'f0a1b2c3d4e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'discovery_rankings',
+        sa.Column('list_name', sa.String(length=20), primary_key=True),
+        sa.Column('position', sa.Integer(), primary_key=True),
+        sa.Column('game_id', sa.Integer(), sa.ForeignKey('games.id', ondelete='CASCADE'), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('discovery_rankings')
@@ -0,0 +1,76 @@
+"""add overall_rating, overall_rating_count and weighted_score to games
+
+The blended IGDB + community overall rating was recomputed for every
+serialized game, and the "rating" sort of /all-games evaluated its Bayesian
+weighted score for every row before sorting. Both are now stored on games,
+kept current by the write paths (models/game.py), and indexed for the rating
+sorts. On PostgreSQL the sort indexes are declared DESC NULLS LAST, matching
+the ORDER BY the list endpoints page with. Backfilled from the rating columns.
+
+Revision ID: b1c2d3e4f5a6
+Revises: a0b1c2d3e4f5
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b1c2d3e4f5a6'
+down_revision: Union[str, None] = 'a0b1c2d3e4f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('games', sa.Column('overall_rating', sa.Float(), nullable=True))
+    op.add_column('games', sa.Column('overall_rating_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('games', sa.Column('weighted_score', sa.Float(), nullable=True))
+
+    # Same formulas as models/game.py: blend_overall_rating (vote-weighted IGDB +
+    # community, else whichever rating exists) and weighted_score (m = 50, C = 7.0).
+    op.execute(
+        """
+        UPDATE games SET
+            overall_rating = CASE
+                WHEN sub.votes > 0 THEN sub.weighted_sum / sub.votes
+                ELSE COALESCE(total_rating, community_rating)
+            END,
+            overall_rating_count = COALESCE(total_rating_count, 0) + COALESCE(community_rating_count, 0),
+            weighted_score = CASE
+                WHEN rating IS NOT NULL AND total_rating_count > 0
+                THEN (total_rating_count * rating + 50 * 7.0) / (total_rating_count + 50)
+            END
+        FROM (
+            SELECT
+                id,
+                CASE WHEN total_rating IS NOT NULL AND total_rating_count > 0 THEN total_rating_count ELSE 0 END
+                + CASE WHEN community_rating IS NOT NULL AND community_rating_count > 0 THEN community_rating_count ELSE 0 END
+                    AS votes,
+                CASE WHEN total_rating IS NOT NULL AND total_rating_count > 0 THEN total_rating * total_rating_count ELSE 0 END
+                + CASE WHEN community_rating IS NOT NULL AND community_rating_count > 0 THEN community_rating * community_rating_count ELSE 0 END
+                    AS weighted_sum
+            FROM games
+        ) sub
+        WHERE games.id = sub.id
+        """
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE INDEX ix_games_weighted_score ON games (weighted_score DESC NULLS LAST, id)")
+        op.execute("CREATE INDEX ix_games_overall_rating ON games (overall_rating DESC NULLS LAST, id)")
+    else:
+        op.create_index('ix_games_weighted_score', 'games', ['weighted_score', 'id'])
+        op.create_index('ix_games_overall_rating', 'games', ['overall_rating', 'id'])
+    op.create_index('ix_games_overall_rating_count', 'games', ['overall_rating_count'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_games_overall_rating_count', table_name='games')
+    op.drop_index('ix_games_overall_rating', table_name='games')
+    op.drop_index('ix_games_weighted_score', table_name='games')
+    op.drop_column('games', 'weighted_score')
+    op.drop_column('games', 'overall_rating_count')
+    op.drop_column('games', 'overall_rating')
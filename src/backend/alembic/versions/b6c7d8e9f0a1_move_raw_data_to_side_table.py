@@ -0,0 +1,107 @@
+"""move games.raw_data to a compressed game_raw_data side table
+
+The full IGDB response was a JSON column on games, so every list query read and
+decoded it for up to 100 rows even though no response schema exposes it. It now
+lives gzip-compressed in game_raw_data and is only loaded by the admin accessor.
+Existing payloads are copied over in batches before the column is dropped.
+
+Revision ID: b6c7d8e9f0a1
+Revises: a5b6c7d8e9f0
+Create Date: 2026-10-16
+
+"""
+import gzip
+import json
+from datetime import datetime, UTC
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'b6c7d8e9f0a1'
+down_revision: Union[str, None] = 'a5b6c7d8e9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def _as_dict(value):
+    # Depending on the driver the JSON column comes back decoded or as text.
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def upgrade() -> None:
+    op.create_table(
+        'game_raw_data',
+        sa.Column('game_id', sa.Integer(), sa.ForeignKey('games.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('encoding', sa.String(length=10), nullable=False, server_default='gzip'),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+    conn = op.get_bind()
+    columns = {col['name'] for col in sa.inspect(conn).get_columns('games')}
+    if 'raw_data' not in columns:
+        return
+
+    raw_table = sa.table(
+        'game_raw_data',
+        sa.column('game_id', sa.Integer),
+        sa.column('encoding', sa.String),
+        sa.column('data', sa.LargeBinary),
+        sa.column('updated_at', sa.DateTime),
+    )
+    now = datetime.now(UTC).replace(tzinfo=None)
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, raw_data, updated_at FROM games "
+                "WHERE id > :last_id AND raw_data IS NOT NULL ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(raw_table.insert(), [
+            {
+                "game_id": row.id,
+                "encoding": "gzip",
+                "data": gzip.compress(
+                    json.dumps(_as_dict(row.raw_data), separators=(",", ":")).encode(), compresslevel=6
+                ),
+                "updated_at": row.updated_at or now,
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+    op.drop_column('games', 'raw_data')
+
+
+def downgrade() -> None:
+    op.add_column('games', sa.Column('raw_data', sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    games = sa.table('games', sa.column('id', sa.Integer), sa.column('raw_data', sa.JSON))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT game_id, data FROM game_raw_data "
+                "WHERE game_id > :last_id ORDER BY game_id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            conn.execute(
+                games.update().where(games.c.id == row.game_id),
+                {"raw_data": json.loads(gzip.decompress(row.data))},
+            )
+        last_id = rows[-1].game_id
+
+    op.drop_table('game_raw_data')
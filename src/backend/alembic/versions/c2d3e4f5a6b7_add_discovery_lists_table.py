@@ -0,0 +1,35 @@
+"""add discovery_lists to record when each discovery list was ranked
+
+A discovery list with no stored rows was taken to be unranked, so a list that
+legitimately ranks to no games was re-ranked (DELETE, INSERT, COMMIT) on every
+read. discovery_lists keeps one row per ranked list; lists without one are
+ranked on first read as before.
+
+Revision ID: c2d3e4f5a6b7
+Revises: b1c2d3e4f5a6
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c2d3e4f5a6b7'
+down_revision: Union[str, None] = 'b1c2d3e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'discovery_lists',
+        sa.Column('list_name', sa.String(length=20), primary_key=True),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('ranked_at', sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('discovery_lists')
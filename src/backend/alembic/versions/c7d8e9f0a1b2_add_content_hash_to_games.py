@@ -0,0 +1,32 @@
+"""add content_hash and checked_at to games
+
+content_hash is a SHA-256 of the last processed IGDB payload. Refreshes that
+hash the same only set checked_at, instead of rewriting every column and
+bumping updated_at. Staleness checks use coalesce(checked_at, updated_at).
+Existing rows start without a hash, so their first refresh writes normally.
+
+Revision ID: c7d8e9f0a1b2
+Revises: b6c7d8e9f0a1
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c7d8e9f0a1b2'
+down_revision: Union[str, None] = 'b6c7d8e9f0a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('games', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('games', sa.Column('checked_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('games', 'checked_at')
+    op.drop_column('games', 'content_hash')
@@ -0,0 +1,43 @@
+"""add weighted full-text search_vector to games
+
+/search used to OR eight ILIKE '%q%' predicates, which no index can serve. This
+adds a generated tsvector (name A, alternative names B, developers/keywords C,
+summary/storyline D) kept current by Postgres on every write, plus a GIN index.
+search_service matches it with websearch_to_tsquery and orders by ts_rank.
+PostgreSQL only; other dialects keep the ILIKE search.
+
+Revision ID: d8e9f0a1b2c3
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'd8e9f0a1b2c3'
+down_revision: Union[str, None] = 'c7d8e9f0a1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("""
+        ALTER TABLE games ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(replace(alt_names_search, '|', ' '), '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(developers, '') || ' ' || coalesce(keywords::text, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(summary, '') || ' ' || coalesce(storyline, '')), 'D')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX ix_games_search_vector ON games USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_games_search_vector")
+    op.execute("ALTER TABLE games DROP COLUMN IF EXISTS search_vector")
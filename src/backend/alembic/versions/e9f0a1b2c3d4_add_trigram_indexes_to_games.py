@@ -0,0 +1,35 @@
+"""add pg_trgm indexes on games.name and games.alt_names_search
+
+Backs the typo-tolerant name search: misspelled queries ("elden rign") are
+matched by trigram similarity against these indexes instead of falling through
+to a live IGDB search. PostgreSQL only.
+
+Revision ID: e9f0a1b2c3d4
+Revises: d8e9f0a1b2c3
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'e9f0a1b2c3d4'
+down_revision: Union[str, None] = 'd8e9f0a1b2c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_games_name_trgm ON games USING GIN (name gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_games_alt_names_search_trgm ON games USING GIN (alt_names_search gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_games_alt_names_search_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_games_name_trgm")
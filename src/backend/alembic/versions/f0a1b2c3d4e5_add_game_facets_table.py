@@ -0,0 +1,89 @@
+"""add game_facets for exact genre/theme/platform filtering
+
+Genre and theme pages matched the comma-joined games.genres/themes strings with
+two ILIKE '%slug%' patterns: a sequential scan, and imprecise. game_facets holds
+one (game_id, kind, slug) row per genre, theme, platform, game mode and player
+perspective, indexed on (kind, slug, game_id). Existing games are backfilled
+from their display strings in batches.
+
+Revision ID: f0a1b2c3d4e5
+Revises: e9f0a1b2c3d4
+Create Date: 2026-10-16
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f0a1b2c3d4e5'
+down_revision: Union[str, None] = 'e9f0a1b2c3d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Same mapping and slug rules as core/facets.py at the time of this migration
+FACET_COLUMNS = {
+    "genres": "genre",
+    "themes": "theme",
+    "platforms": "platform",
+    "game_modes": "game_mode",
+    "player_perspectives": "player_perspective",
+}
+NAME_SEPARATOR = re.compile(r",\s*(?![^()]*\))")
+
+
+def _slug(name: str) -> str:
+    name = ''.join(c for c in unicodedata.normalize('NFD', name) if unicodedata.category(c) != 'Mn')
+    slug = name.lower().replace("&", " and ").replace("'", "")
+    return re.sub(r"[^a-z0-9]+", "-", slug).strip("-")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'game_facets',
+        sa.Column('game_id', sa.Integer(), sa.ForeignKey('games.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('kind', sa.String(length=20), primary_key=True),
+        sa.Column('slug', sa.String(length=100), primary_key=True),
+    )
+    op.create_index('ix_game_facets_kind_slug', 'game_facets', ['kind', 'slug', 'game_id'])
+
+    conn = op.get_bind()
+    facets_table = sa.table(
+        'game_facets',
+        sa.column('game_id', sa.Integer),
+        sa.column('kind', sa.String),
+        sa.column('slug', sa.String),
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                f"SELECT id, {', '.join(FACET_COLUMNS)} FROM games "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).mappings().fetchall()
+        if not rows:
+            break
+        facet_rows = {
+            (row["id"], kind, slug)
+            for row in rows
+            for column, kind in FACET_COLUMNS.items()
+            for slug in (_slug(name) for name in NAME_SEPARATOR.split(row[column] or ""))
+            if slug
+        }
+        if facet_rows:
+            conn.execute(facets_table.insert(), [
+                {"game_id": game_id, "kind": kind, "slug": slug} for game_id, kind, slug in facet_rows
+            ])
+        last_id = rows[-1]["id"]
+
+
+def downgrade() -> None:
+    op.drop_index('ix_game_facets_kind_slug', table_name='game_facets')
+    op.drop_table('game_facets')
@@ -20,6 +20,18 @@ class Settings(BaseSettings):
     IGDB_ACCESS_TOKEN: str = os.getenv("IGDB_ACCESS_TOKEN", "")
     IGDB_WEBHOOK_SECRET: str = os.getenv("IGDB_WEBHOOK_SECRET", "")
     IGDB_URL: str = "https://api.igdb.com/v4/games"
+    # Base URL for every IGDB endpoint (games, game_time_to_beats, external_games, ...).
+    # Overridable so benchmarks and local stubs can stand in for api.igdb.com.
+    IGDB_API_BASE: str = os.getenv("IGDB_API_BASE", "https://api.igdb.com/v4")
+    # Shared async IGDB client: pooled keep-alive connections, optionally over HTTP/2
+    # (needs the `h2` package; silently falls back to HTTP/1.1 when it's missing).
+    IGDB_HTTP2: bool = os.getenv("IGDB_HTTP2", "false").lower() == "true"
+    IGDB_MAX_CONNECTIONS: int = int(os.getenv("IGDB_MAX_CONNECTIONS", "8"))
+    # Outbound IGDB throttle (core/igdb_governor.py). IGDB allows 4 req/s and 8 open
+    # requests; the bucket is shared through Redis when REDIS_URL is set.
+    IGDB_RATE_LIMIT: float = float(os.getenv("IGDB_RATE_LIMIT", "4"))
+    IGDB_RATE_BURST: int = int(os.getenv("IGDB_RATE_BURST", "4"))
+    IGDB_MAX_IN_FLIGHT: int = int(os.getenv("IGDB_MAX_IN_FLIGHT", "8"))
     
     # Steam Integration settings (optional - leave empty to disable)
     STEAM_API_KEY: str = os.getenv("STEAM_API_KEY", "")
@@ -69,6 +81,24 @@ class Settings(BaseSettings):
     # in production to enable.
     REDIS_URL: str = os.getenv("REDIS_URL", "")
     DISCOVERY_CACHE_TTL: int = int(os.getenv("DISCOVERY_CACHE_TTL", "600"))
+    # How long past DISCOVERY_CACHE_TTL an entry may still be served while one
+    # request recomputes it (core/cache.cached_json).
+    DISCOVERY_CACHE_STALE_TTL: int = int(os.getenv("DISCOVERY_CACHE_STALE_TTL", "3600"))
+    # How long slugs, ids and search terms IGDB had nothing for are remembered
+    # (core/negative_cache.py). Kept in process, and in Redis when REDIS_URL is set.
+    NEGATIVE_CACHE_TTL: int = int(os.getenv("NEGATIVE_CACHE_TTL", "3600"))
+
+    # Responses smaller than this many bytes are sent uncompressed (core/compression.py):
+    # below ~1 KB the gzip framing and CPU cost outweigh the savings.
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+
+    # Background refreshes of stale games (core/refresh_coordinator.py): at most this
+    # many run at once per API worker, most-viewed games first.
+    REFRESH_MAX_CONCURRENCY: int = int(os.getenv("REFRESH_MAX_CONCURRENCY", "4"))
+
+    # Admin-only endpoints (e.g. a game's raw IGDB payload) require this key in the
+    # X-Admin-Key header. Leave empty to disable them entirely.
+    ADMIN_API_KEY: str = os.getenv("ADMIN_API_KEY", "")
 
     def validate(self):
         if not self.DATABASE_URL:
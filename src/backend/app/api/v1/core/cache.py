@@ -2,24 +2,69 @@
 """
 Lightweight async Redis cache for the discovery list endpoints.
 
+Two tiers: a bounded in-process LRU (L1) holding encoded bodies in front of
+Redis (L2), so a hot key costs neither a round trip nor a json.loads. L1
+entries live at most L1_MAX_TTL_SECONDS and never past the value's own TTL;
+invalidate() publishes the keys on INVALIDATION_CHANNEL so every worker drops
+its L1 copy (listen_for_invalidations). Values served from L1 are shared
+between requests and must not be mutated.
+
+Endpoints that return a cached list as is use cached_body, whose result
+(CachedBody: the encoded bytes, their gzip/brotli variants and an ETag) they
+send as a raw Response, skipping response-model validation, encoding and
+compression on every hit.
+
 Caching is opt-in: when settings.REDIS_URL is empty the helpers become a
 pass-through and callers hit the database exactly as before. Redis is never
 allowed to break a request — any connection or protocol error falls back to
 the producer and is logged.
+
+cached_json guards its keys against stampedes: concurrent misses share one
+producer run, and expiring values are recomputed by a single caller (chosen
+early, XFetch-style, or by a refresh lock once stale) while the rest keep
+being served the previous value.
 """
+import asyncio
+import hashlib
 import json
 import logging
+import math
+import random
+import time
+from collections import OrderedDict
 from typing import Any, Awaitable, Callable
 
 import redis.asyncio as aioredis
 
 from ...settings import settings
+from . import compression
 
 logger = logging.getLogger(__name__)
 
+# XFetch early-expiration aggressiveness; 1.0 is the usual choice
+XFETCH_BETA = 1.0
+REFRESH_LOCK_TTL_MS = 30000
+
+L1_MAX_ENTRIES = 256
+# Budget for L1 bodies, plain and compressed
+L1_MAX_BYTES = 64 * 1024 * 1024
+# Short enough that each worker still sees values other workers refreshed, and
+# gets its XFetch chances, soon after they happen
+L1_MAX_TTL_SECONDS = 30
+INVALIDATION_CHANNEL = "cache:invalidate"
+RESUBSCRIBE_DELAY_SECONDS = 5
+
 # Lazy module-level singleton. None means caching is disabled.
 _client: aioredis.Redis | None = None
 _initialized = False
+# Keys this process is recomputing
+_refreshing: set[str] = set()
+
+# key -> (expires at (monotonic), body, bytes held)
+_l1: OrderedDict[str, tuple[float, "CachedBody", int]] = OrderedDict()
+_l1_bytes = 0
+_MISSING = object()
+_stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "l1_evictions": 0, "invalidations_received": 0}
 
 
 def _get_client() -> aioredis.Redis | None:
@@ -43,49 +88,313 @@ def _get_client() -> aioredis.Redis | None:
     return _client
 
 
-async def cached_json(
+class CachedBody:
+    """A JSON value encoded once, as it is served: body bytes, their compressed
+    variants and a strong ETag. L1 holds these, so a hit skips decoding,
+    response-model validation, re-encoding and compression. Variants are built
+    on first use, and when the body enters L1 (once per cache fill); Redis
+    holds only the plain JSON."""
+
+    __slots__ = ("content", "etag", "_encoded", "_value")
+
+    def __init__(self, content: bytes, value: Any = _MISSING):
+        self.content = content
+        self.etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+        self._encoded = {}
+        self._value = value
+
+    @classmethod
+    def from_value(cls, value: Any) -> "CachedBody":
+        # Same encoding as FastAPI's JSONResponse
+        return cls(json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8"), value)
+
+    def encoded(self, encoding: str) -> bytes:
+        """The body compressed with `encoding` ("gzip" or "br")."""
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compression.compress(self.content, encoding)
+        return self._encoded[encoding]
+
+    @property
+    def value(self) -> Any:
+        """The decoded value (decoded once, then shared: do not mutate)."""
+        if self._value is _MISSING:
+            self._value = json.loads(self.content)
+        return self._value
+
+
+def _l1_get(key: str) -> CachedBody | None:
+    entry = _l1.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        _l1_drop(key)
+        return None
+    _l1.move_to_end(key)
+    return entry[1]
+
+
+def _l1_put(key: str, body: CachedBody, computed_at: float, ttl_seconds: int) -> None:
+    global _l1_bytes
+    lifetime = min(computed_at + ttl_seconds - time.time(), L1_MAX_TTL_SECONDS)
+    size = len(body.content)
+    if lifetime <= 0 or size > L1_MAX_BYTES:
+        return
+    size += sum(len(body.encoded(encoding)) for encoding in compression.available_encodings())
+    _l1_drop(key)
+    _l1[key] = (time.monotonic() + lifetime, body, size)
+    _l1_bytes += size
+    while len(_l1) > L1_MAX_ENTRIES or _l1_bytes > L1_MAX_BYTES:
+        _, (_, _, evicted_size) = _l1.popitem(last=False)
+        _l1_bytes -= evicted_size
+        _stats["l1_evictions"] += 1
+
+
+def _l1_drop(*keys: str) -> None:
+    global _l1_bytes
+    for key in keys:
+        entry = _l1.pop(key, None)
+        if entry is not None:
+            _l1_bytes -= entry[2]
+
+
+def _envelope(body: CachedBody, delta: float) -> str:
+    # A one-line header, then the body exactly as served: hits need no JSON parsing
+    return f"{time.time()!r} {delta!r}\n{body.content.decode('utf-8')}"
+
+
+def _open_envelope(raw: str) -> tuple[CachedBody, float, float]:
+    """(body, computed_at, delta) of a cached entry.
+
+    Values written before entries carried their age are treated as just computed.
+    """
+    header, _, content = raw.partition("\n")
+    try:
+        computed_at, delta = (float(field) for field in header.split(" "))
+        return CachedBody(content.encode("utf-8")), computed_at, delta
+    except ValueError:
+        pass
+    data = json.loads(raw)
+    if isinstance(data, dict) and data.keys() == {"value", "computed_at", "delta"}:
+        return CachedBody.from_value(data["value"]), data["computed_at"], data["delta"]
+    return CachedBody(raw.encode("utf-8"), data), time.time(), 0.0
+
+
+def _should_refresh(computed_at: float, delta: float, ttl_seconds: int) -> bool:
+    """XFetch: refresh once past the TTL, or early with a probability that rises
+    as expiry nears and with how long the value takes to recompute (delta)."""
+    return time.time() - delta * XFETCH_BETA * math.log(random.random() or 1e-12) >= computed_at + ttl_seconds
+
+
+async def _produce_and_store(client, key: str, ttl_seconds: int, stale_ttl_seconds: int, producer) -> CachedBody:
+    started = time.perf_counter()
+    result = await producer()
+    body = CachedBody.from_value(result)
+    if result:
+        _l1_put(key, body, time.time(), ttl_seconds)
+        try:
+            await client.set(key, _envelope(body, time.perf_counter() - started), ex=ttl_seconds + stale_ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+    return body
+
+
+async def _take_refresh_lock(client, key: str) -> bool:
+    """Claim the right to recompute `key`, in this process and across workers."""
+    if key in _refreshing:
+        return False
+    try:
+        if not await client.set(f"cache-refresh:{key}", "1", nx=True, px=REFRESH_LOCK_TTL_MS):
+            return False
+    except Exception as e:
+        logger.warning(f"Cache refresh lock failed for {key}: {e}")
+        return False
+    _refreshing.add(key)
+    return True
+
+
+async def _release_refresh_lock(client, key: str) -> None:
+    _refreshing.discard(key)
+    try:
+        await client.delete(f"cache-refresh:{key}")
+    except Exception as e:
+        logger.warning(f"Failed to release cache refresh lock for {key}: {e}")
+
+
+async def cached_body(
     key: str,
     ttl_seconds: int,
     producer: Callable[[], Awaitable[Any]],
-) -> Any:
-    """Return cached JSON for `key`, or run `producer()` and cache its result.
+    stale_ttl_seconds: int | None = None,
+) -> CachedBody:
+    """Return the cached, encoded JSON body for `key`, or run `producer()` and cache its result.
 
-    - Caching disabled (no REDIS_URL) -> just awaits and returns producer().
-    - Cache hit -> returns the decoded cached value, producer not called.
-    - Cache miss -> runs producer(); caches the result under `key` for
-      `ttl_seconds` only when it is non-empty (avoids caching a transient
-      empty list during a cold start / IGDB hiccup).
+    - Caching disabled (no REDIS_URL) -> encodes and returns producer()'s result.
+    - Cache hit -> returns the cached body, producer not called: from L1 as
+      is, from Redis without decoding it.
+    - Cache miss -> runs producer() once for all concurrent callers (single-
+      flight, across workers too); caches the result for `ttl_seconds` only
+      when it is non-empty (avoids caching a transient empty list during a
+      cold start / IGDB hiccup).
+    - Near or past expiry -> one caller recomputes the value (XFetch early
+      expiration, then a refresh lock) while every other caller keeps getting
+      the cached one. Entries are kept `stale_ttl_seconds` (default
+      settings.DISCOVERY_CACHE_STALE_TTL) past their TTL for this, and the
+      last good value is kept if the refresh fails or comes back empty.
     - Any Redis error -> logs and falls back to producer().
     """
     client = _get_client()
     if client is None:
-        return await producer()
+        return CachedBody.from_value(await producer())
+    if stale_ttl_seconds is None:
+        stale_ttl_seconds = settings.DISCOVERY_CACHE_STALE_TTL
+
+    body = _l1_get(key)
+    if body is not None:
+        _stats["l1_hits"] += 1
+        return body
 
     try:
         cached = await client.get(key)
-        if cached is not None:
-            return json.loads(cached)
     except Exception as e:
         logger.warning(f"Cache read failed for {key}, falling back to source: {e}")
-        return await producer()
+        return CachedBody.from_value(await producer())
 
-    result = await producer()
+    if cached is not None:
+        _stats["l2_hits"] += 1
+        body, computed_at, delta = _open_envelope(cached)
+        if not _should_refresh(computed_at, delta, ttl_seconds):
+            _l1_put(key, body, computed_at, ttl_seconds)
+            return body
+        if not await _take_refresh_lock(client, key):
+            return body
+        try:
+            fresh = await _produce_and_store(client, key, ttl_seconds, stale_ttl_seconds, producer)
+            return fresh if fresh.value else body
+        except Exception:
+            logger.exception(f"Cache refresh failed for {key}, serving the previous value")
+            return body
+        finally:
+            await _release_refresh_lock(client, key)
 
-    if result:
+    _stats["misses"] += 1
+    from . import singleflight
+
+    async def fill():
+        # A worker that waited out another's fill finds its result here
         try:
-            await client.set(key, json.dumps(result), ex=ttl_seconds)
-        except Exception as e:
-            logger.warning(f"Cache write failed for {key}: {e}")
+            cached = await client.get(key)
+        except Exception:
+            cached = None
+        if cached is not None:
+            body, computed_at, _ = _open_envelope(cached)
+            _l1_put(key, body, computed_at, ttl_seconds)
+            return body
+        return await _produce_and_store(client, key, ttl_seconds, stale_ttl_seconds, producer)
+
+    return await singleflight.do(f"cache:{key}", fill)
+
 
-    return result
+async def cached_json(
+    key: str,
+    ttl_seconds: int,
+    producer: Callable[[], Awaitable[Any]],
+    stale_ttl_seconds: int | None = None,
+) -> Any:
+    """Like cached_body, but returns the decoded value (shared with other
+    callers: do not mutate it). With caching disabled, producer()'s result as is."""
+    if _get_client() is None:
+        return await producer()
+    return (await cached_body(key, ttl_seconds, producer, stale_ttl_seconds)).value
+
+
+async def get_json(key: str) -> Any:
+    """Decoded value cached under `key`, or None on a miss, when disabled, or on error."""
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        cached = await client.get(key)
+        return json.loads(cached) if cached is not None else None
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+
+async def set_json(key: str, value: Any, ttl_seconds: int) -> None:
+    """Cache `value` under `key` for `ttl_seconds`. No-op when disabled or on error."""
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        await client.set(key, json.dumps(value), ex=ttl_seconds)
+    except Exception as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
 
 
 async def invalidate(*keys: str) -> None:
-    """Delete one or more cache keys. No-op when caching is disabled or on error."""
+    """Delete one or more cache keys from both tiers, on every worker.
+
+    No-op when caching is disabled; Redis errors are logged.
+    """
     client = _get_client()
     if client is None or not keys:
         return
+    _l1_drop(*keys)
     try:
         await client.delete(*keys)
     except Exception as e:
         logger.warning(f"Cache invalidation failed for {keys}: {e}")
+    try:
+        await client.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+    except Exception as e:
+        logger.warning(f"Failed to publish cache invalidation for {keys}: {e}")
+
+
+def _on_invalidation(data: str) -> None:
+    _l1_drop(*json.loads(data))
+    _stats["invalidations_received"] += 1
+
+
+async def listen_for_invalidations() -> None:
+    """Drop the L1 copies of keys any worker invalidates.
+
+    Runs for the app's lifetime when REDIS_URL is set, on its own connection
+    (the shared client's socket timeout would cut off an idle subscription),
+    and resubscribes after errors.
+    """
+    if _get_client() is None:
+        return
+    while True:
+        subscriber = aioredis.from_url(
+            settings.REDIS_URL, decode_responses=True, socket_connect_timeout=2, health_check_interval=30
+        )
+        pubsub = subscriber.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Invalidations published while we weren't subscribed are lost
+            _l1_drop(*list(_l1))
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    _on_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation subscription failed, resubscribing: {e}")
+        finally:
+            await pubsub.aclose()
+            await subscriber.aclose()
+        await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+
+
+def stats() -> dict:
+    """cached_json lookups by tier since startup, with each tier's hit ratio
+    (L2's among the lookups L1 missed), and L1's current size."""
+    lookups = _stats["l1_hits"] + _stats["l2_hits"] + _stats["misses"]
+    l1_misses = lookups - _stats["l1_hits"]
+    return {
+        **_stats,
+        "l1_hit_ratio": round(_stats["l1_hits"] / lookups, 3) if lookups else None,
+        "l2_hit_ratio": round(_stats["l2_hits"] / l1_misses, 3) if l1_misses else None,
+        "l1_entries": len(_l1),
+        "l1_bytes": _l1_bytes,
+    }
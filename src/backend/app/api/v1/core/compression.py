@@ -0,0 +1,185 @@
+# core/compression.py
+"""
+Response compression: gzip, or brotli when the optional `brotli` package is
+installed (it is preferred on equal q-values, being ~15-20% smaller on JSON).
+
+CompressionMiddleware negotiates Accept-Encoding for every response with a
+compressible content type and a body of at least `minimum_size` bytes.
+Streaming responses are compressed chunk by chunk, flushed after each one, so
+clients still see data as it is produced. Responses that already carry a
+Content-Encoding (the discovery lists, sent pre-compressed from the cache) pass
+through untouched.
+
+Compressing changes the bytes, so strong ETags are weakened (W/"..."), as
+nginx does; http_cache compares If-None-Match weakly, so revalidation keeps
+working.
+"""
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+GZIP_LEVEL = 6
+# Brotli's higher qualities are too slow for per-request compression
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml")
+# No body, or a byte range of the uncompressed representation
+UNCOMPRESSED_STATUSES = (204, 206, 304)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Supported content codings, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The coding to use for an Accept-Encoding header, or None for identity."""
+    qualities = {}
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Incremental compressor: compress() each chunk (flushed), then finish()."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits 16 + MAX_WBITS: gzip container
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """`data` compressed with `encoding` ("gzip" or "br") in one go."""
+    return _Compressor(encoding).finish(data)
+
+
+def _is_compressible(headers: Headers) -> bool:
+    media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
+
+
+def _vary_on_encoding(message: Message) -> None:
+    """Mark a compressible response as varying on Accept-Encoding, compressed or not.
+
+    Shared caches must not hand a stored identity body to a client that asked
+    for gzip (or the reverse), so passthroughs get the header too.
+    """
+    headers = MutableHeaders(raw=message["headers"])
+    if _is_compressible(headers) and "accept-encoding" not in headers.get("vary", "").lower():
+        headers.add_vary_header("Accept-Encoding")
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with the client's preferred coding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            async def send_identity(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    _vary_on_encoding(message)
+                await send(message)
+
+            await self.app(scope, receive, send_identity)
+            return
+
+        start: Message | None = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    message["status"] in UNCOMPRESSED_STATUSES
+                    or "content-encoding" in headers
+                    or not _is_compressible(headers)
+                )
+                if passthrough:
+                    _vary_on_encoding(message)
+                    await send(message)
+                else:
+                    # Held until the first body chunk shows whether it's worth compressing
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                response_start, start = start, None
+                headers = MutableHeaders(raw=response_start["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    _vary_on_encoding(response_start)
+                    await send(response_start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                _vary_on_encoding(response_start)
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    del headers["Content-Length"]
+                    body = compressor.compress(body)
+                else:
+                    body = compressor.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                await send(response_start)
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            body = compressor.compress(body) if more_body else compressor.finish(body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
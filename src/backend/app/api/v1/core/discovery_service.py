@@ -1,22 +1,32 @@
 # discovery_service.py
-"""Game discovery functions - trending, anticipated, highly rated, latest."""
+"""Game discovery functions - trending, anticipated, highly rated, latest.
+
+The four homepage lists are ranked over the whole games table by
+refresh_discovery_rankings (run by the scheduler after each featured-games
+sync) and stored in discovery_rankings; the getters read the stored order.
+A list the scheduler hasn't ranked yet (no discovery_lists row) is ranked on
+its first read.
+"""
 
 from datetime import datetime, timedelta, UTC
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 
 from ..models import game
+from ..models.discovery_ranking import DiscoveryRanking, DiscoveryList
+from . import facets, pagination
+from .game_service import card_columns, _dialect_insert
 
+# Games kept per discovery list
+DISCOVERY_LIST_SIZE = 100
 
-def get_trending_games(db: Session, limit: int = 100) -> list[game.Game]:
-    """Get trending games from the database"""
-    current_time = datetime.now(UTC)
-    six_months_ago = current_time - timedelta(days=180)
-    
-    return list(db.scalars(
-        select(game.Game)
+
+def _rank_trending(now: datetime):
+    six_months_ago = now - timedelta(days=180)
+    return (
+        select(game.Game.id)
         .where(
-            game.Game.first_release_date.between(six_months_ago, current_time),
+            game.Game.first_release_date.between(six_months_ago, now),
             game.Game.cover_image.is_not(None),
             game.Game.hypes > 0
         )
@@ -25,30 +35,24 @@ def get_trending_games(db: Session, limit: int = 100) -> list[game.Game]:
             game.Game.total_rating.desc().nulls_last(),
             game.Game.first_release_date.desc()
         )
-        .limit(limit)
-    ))
+    )
 
 
-def get_anticipated_games(db: Session, limit: int = 100) -> list[game.Game]:
-    """Get anticipated games from the database"""
-    current_time = datetime.now(UTC)
-    one_year_future = current_time + timedelta(days=365)
-    
-    return list(db.scalars(
-        select(game.Game)
+def _rank_anticipated(now: datetime):
+    one_year_future = now + timedelta(days=365)
+    return (
+        select(game.Game.id)
         .where(
-            game.Game.first_release_date.between(current_time, one_year_future),
+            game.Game.first_release_date.between(now, one_year_future),
             game.Game.cover_image.is_not(None)
         )
         .order_by(game.Game.hypes.desc().nulls_last(), game.Game.first_release_date.asc())
-        .limit(limit)
-    ))
+    )
 
 
-def get_highly_rated_games(db: Session, limit: int = 100) -> list[game.Game]:
-    """Get highly rated games from the database"""
-    return list(db.scalars(
-        select(game.Game)
+def _rank_highly_rated(now: datetime):
+    return (
+        select(game.Game.id)
         .where(
             game.Game.total_rating.is_not(None),
             game.Game.total_rating > 85,
@@ -56,88 +60,147 @@ def get_highly_rated_games(db: Session, limit: int = 100) -> list[game.Game]:
             game.Game.cover_image.is_not(None)
         )
         .order_by(game.Game.total_rating.desc())
-        .limit(limit)
-    ))
+    )
 
 
-def get_latest_games(db: Session, limit: int = 100) -> list[game.Game]:
-    """Get latest released games from the database"""
-    current_time = datetime.now(UTC)
-    one_month_ago = current_time - timedelta(days=30)
-    
-    return list(db.scalars(
-        select(game.Game)
+def _rank_latest(now: datetime):
+    one_month_ago = now - timedelta(days=30)
+    return (
+        select(game.Game.id)
         .where(
-            game.Game.first_release_date.between(one_month_ago, current_time),
+            game.Game.first_release_date.between(one_month_ago, now),
             game.Game.first_release_date.is_not(None),
             game.Game.cover_image.is_not(None)
         )
         .order_by(game.Game.first_release_date.desc())
+    )
+
+
+# discovery_rankings.list_name -> ranking query (ordered game ids)
+DISCOVERY_RANKINGS = {
+    "trending": _rank_trending,
+    "anticipated": _rank_anticipated,
+    "highly_rated": _rank_highly_rated,
+    "latest": _rank_latest,
+}
+
+
+def refresh_discovery_rankings(db: Session, list_names: list[str] | None = None) -> dict[str, int]:
+    """Re-rank discovery lists (default: all) into discovery_rankings; returns games per list.
+
+    Rows are upserted by (list_name, position) and the tail past the new size
+    deleted, so two workers ranking the same list at once (two first reads)
+    both succeed instead of one failing on the primary key.
+    """
+    now = datetime.now(UTC)
+    upsert = _dialect_insert(db)
+    sizes = {}
+    for list_name in list_names or DISCOVERY_RANKINGS:
+        game_ids = list(db.scalars(DISCOVERY_RANKINGS[list_name](now).limit(DISCOVERY_LIST_SIZE)))
+        rows = [
+            {"list_name": list_name, "position": position, "game_id": game_id}
+            for position, game_id in enumerate(game_ids)
+        ]
+        marker = {"list_name": list_name, "size": len(game_ids), "ranked_at": now}
+        if upsert is None:
+            # No native upsert on this backend: replace the list outright
+            db.execute(delete(DiscoveryRanking).where(DiscoveryRanking.list_name == list_name))
+            db.execute(delete(DiscoveryList).where(DiscoveryList.list_name == list_name))
+            if rows:
+                db.execute(insert(DiscoveryRanking), rows)
+            db.execute(insert(DiscoveryList), [marker])
+        else:
+            if rows:
+                stmt = upsert(DiscoveryRanking).values(rows)
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=[DiscoveryRanking.list_name, DiscoveryRanking.position],
+                    set_={"game_id": stmt.excluded.game_id},
+                ))
+            db.execute(delete(DiscoveryRanking).where(
+                DiscoveryRanking.list_name == list_name,
+                DiscoveryRanking.position >= len(game_ids),
+            ))
+            stmt = upsert(DiscoveryList).values(marker)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[DiscoveryList.list_name],
+                set_={"size": stmt.excluded.size, "ranked_at": stmt.excluded.ranked_at},
+            ))
+        sizes[list_name] = len(game_ids)
+    db.commit()
+    return sizes
+
+
+def _get_ranked_games(db: Session, list_name: str, limit: int) -> list[game.Game]:
+    stmt = (
+        select(game.Game)
+        .options(card_columns())
+        .join(DiscoveryRanking, DiscoveryRanking.game_id == game.Game.id)
+        .where(DiscoveryRanking.list_name == list_name)
+        .order_by(DiscoveryRanking.position)
         .limit(limit)
-    ))
+    )
+    games = list(db.scalars(stmt))
+    if not games and db.get(DiscoveryList, list_name) is None:
+        # Not ranked yet (fresh database, or the scheduler hasn't run since deploy)
+        refresh_discovery_rankings(db, [list_name])
+        games = list(db.scalars(stmt))
+    return games
 
 
-def get_games_by_genre(db: Session, genre_slug: str, limit: int = 50, offset: int = 0):
-    """Get games that match a specific genre slug with pagination"""
+def get_trending_games(db: Session, limit: int = 100) -> list[game.Game]:
+    """Get trending games from the database"""
+    return _get_ranked_games(db, "trending", limit)
+
+
+def get_anticipated_games(db: Session, limit: int = 100) -> list[game.Game]:
+    """Get anticipated games from the database"""
+    return _get_ranked_games(db, "anticipated", limit)
+
+
+def get_highly_rated_games(db: Session, limit: int = 100) -> list[game.Game]:
+    """Get highly rated games from the database"""
+    return _get_ranked_games(db, "highly_rated", limit)
+
+
+def get_latest_games(db: Session, limit: int = 100) -> list[game.Game]:
+    """Get latest released games from the database"""
+    return _get_ranked_games(db, "latest", limit)
+
+
+def get_games_by_facet(db: Session, kind: str, slug: str, limit: int = 50, offset: int = 0, cursor: str | None = None):
+    """Get games tagged with a genre/theme/platform slug, best rated first (offset or keyset cursor)"""
     from ..models.game import Game
     
-    search_pattern = f"%{genre_slug}%"
-    genre_name = " ".join(word.capitalize() for word in genre_slug.replace("-", " ").split())
-    name_pattern = f"%{genre_name}%"
-    
-    query = db.query(Game).filter(
-        (Game.genres.ilike(search_pattern) | Game.genres.ilike(name_pattern))
-    ).order_by(Game.total_rating.desc().nulls_last())
-    
-    if offset:
-        query = query.offset(offset)
-    if limit:
-        query = query.limit(limit)
-        
-    return query.all()
+    stmt = select(Game).options(card_columns()).where(Game.id.in_(facets.game_ids_with(kind, slug)))
+    keys = [pagination.SortKey(Game.total_rating, descending=True)]
+    return pagination.paginate(db, stmt, keys, Game.id, limit, offset, cursor)
+
+
+def get_games_by_genre(db: Session, genre_slug: str, limit: int = 50, offset: int = 0, cursor: str | None = None):
+    """Get games that match a specific genre slug with pagination"""
+    return get_games_by_facet(db, "genre", genre_slug, limit, offset, cursor)
 
 
 def count_games_by_genre(db: Session, genre_slug: str) -> int:
     """Count total games matching a genre slug"""
-    from ..models.game import Game
-    
-    search_pattern = f"%{genre_slug}%"
-    genre_name = " ".join(word.capitalize() for word in genre_slug.replace("-", " ").split())
-    name_pattern = f"%{genre_name}%"
-    
-    return db.query(Game).filter(
-        (Game.genres.ilike(search_pattern) | Game.genres.ilike(name_pattern))
-    ).count()
+    return facets.count_games_with(db, "genre", genre_slug)
 
 
-def get_games_by_theme(db: Session, theme_slug: str, limit: int = 50, offset: int = 0):
+def get_games_by_theme(db: Session, theme_slug: str, limit: int = 50, offset: int = 0, cursor: str | None = None):
     """Get games that match a specific theme slug with pagination"""
-    from ..models.game import Game
-    
-    search_pattern = f"%{theme_slug}%"
-    theme_name = " ".join(word.capitalize() for word in theme_slug.replace("-", " ").split())
-    name_pattern = f"%{theme_name}%"
-    
-    query = db.query(Game).filter(
-        (Game.themes.ilike(search_pattern) | Game.themes.ilike(name_pattern))
-    ).order_by(Game.total_rating.desc().nulls_last())
-    
-    if offset:
-        query = query.offset(offset)
-    if limit:
-        query = query.limit(limit)
-        
-    return query.all()
+    return get_games_by_facet(db, "theme", theme_slug, limit, offset, cursor)
 
 
 def count_games_by_theme(db: Session, theme_slug: str) -> int:
     """Count total games matching a theme slug"""
-    from ..models.game import Game
-    
-    search_pattern = f"%{theme_slug}%"
-    theme_name = " ".join(word.capitalize() for word in theme_slug.replace("-", " ").split())
-    name_pattern = f"%{theme_name}%"
-    
-    return db.query(Game).filter(
-        (Game.themes.ilike(search_pattern) | Game.themes.ilike(name_pattern))
-    ).count()
+    return facets.count_games_with(db, "theme", theme_slug)
+
+
+def get_games_by_platform(db: Session, platform_slug: str, limit: int = 50, offset: int = 0, cursor: str | None = None):
+    """Get games released on a specific platform slug with pagination"""
+    return get_games_by_facet(db, "platform", platform_slug, limit, offset, cursor)
+
+
+def count_games_by_platform(db: Session, platform_slug: str) -> int:
+    """Count total games released on a platform slug"""
+    return facets.count_games_with(db, "platform", platform_slug)
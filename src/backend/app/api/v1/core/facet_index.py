@@ -0,0 +1,486 @@
+# core/facet_index.py
+"""
+In-process facet index behind /games/browse.
+
+Every stored game gets a dense position. Each facet value (genre "shooter",
+platform "pc-microsoft-windows", ...) is a bitset over those positions, held as
+a Python int, so combining filters is a handful of big-int ANDs/ORs and a count
+is int.bit_count(). Release year and rating (floored total_rating) are bucketed
+the same way: a year range or minimum rating ORs the matching bucket bitsets.
+
+Within a kind the selected values are OR-ed, across kinds AND-ed. Facet counts
+for a kind are taken with every other filter applied but not its own, so they
+show what each extra choice would return.
+
+Results are ordered by per-sort position lists computed at build time. Games
+written since then are "dirty": they are skipped in the precomputed order and
+merged back in by their current sort key. Once more than MAX_DIRTY accumulate,
+keep_fresh re-sorts a snapshot of the sort keys in a thread and swaps the new
+lists in; writes never pay for a re-sort. Small result sets skip the order
+lists and are ranked directly.
+
+Like suggest_index, the index loads at startup (keep_fresh), is rebuilt hourly
+so every API worker converges, and is updated in place by the game write paths
+on the worker that ran them. Writers include threadpool threads (sync
+endpoints such as the PSN import), so the module-level functions serialize
+access with _lock. /games/browse answers 503 until the first load finishes.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import re
+import threading
+import time
+from array import array
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import game
+from ..models.game_facet import GameFacet
+from .facets import FACET_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+FACET_KINDS = tuple(FACET_COLUMNS.values())
+SORTS = ("rating", "release_new", "release_old", "name")
+# Re-sort the position lists once this many games changed since the last sort
+MAX_DIRTY = 2000
+# How often keep_fresh checks for that, between full rebuilds
+RESORT_CHECK_SECONDS = 10
+REBUILD_INTERVAL_SECONDS = 3600
+
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def _set_positions(bits: int, size: int):
+    """Positions of the set bits, ascending."""
+    raw = bits.to_bytes((size + 7) // 8 or 1, "little")
+    for match in _NONZERO_BYTE.finditer(raw):
+        base = match.start() * 8
+        for bit in _BYTE_BITS[raw[match.start()]]:
+            yield base + bit
+
+
+def _order_key(sort: str, score, released, names):
+    """Sort key over positions, given the per-position sort key arrays."""
+    if sort == "name":
+        return lambda pos: (names[pos], pos)
+    if sort == "release_new":
+        return lambda pos: (-released[pos] if released[pos] != math.inf else math.inf, pos)
+    if sort == "release_old":
+        return lambda pos: (released[pos], pos)
+    return lambda pos: (score[pos], pos)
+
+
+class FacetIndex:
+    """Bitsets over dense game positions; not thread-safe (the module functions lock it)."""
+
+    def __init__(self):
+        self._positions: dict[int, int] = {}
+        self._igdb_ids = array("i")
+        self._alive = 0
+        self._bits: dict[tuple[str, str], int] = {}
+        self._rating_buckets: dict[int, int] = {}
+        self._year_buckets: dict[int, int] = {}
+        # Per position: facet keys and buckets (to clear them again), sort keys
+        self._facets: list[tuple[tuple[str, str], ...]] = []
+        self._rating_bucket = array("h")
+        self._year = array("h")
+        self._score = array("d")
+        self._released = array("d")
+        self._names: list[str] = []
+        self._orders: dict[str, array] = {}
+        self._dirty: set[int] = set()
+        # Positions dirty when the running re-sort took its snapshot
+        self._sorting: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @classmethod
+    def build(cls, games, facet_rows) -> "FacetIndex":
+        """Build from (igdb_id, name, total_rating, total_rating_count, rating, first_release_date)
+        game rows and (igdb_id, kind, slug) facet rows."""
+        index = cls()
+        facets_by_game: dict[int, list[tuple[str, str]]] = {}
+        for igdb_id, kind, slug in facet_rows:
+            facets_by_game.setdefault(igdb_id, []).append((kind, slug))
+
+        members: dict[tuple[str, str], list[int]] = {}
+        rating_members: dict[int, list[int]] = {}
+        year_members: dict[int, list[int]] = {}
+        for igdb_id, name, total_rating, rating_count, rating, released in games:
+            pos = index._append(igdb_id)
+            keys = tuple(facets_by_game.get(igdb_id, ()))
+            index._set_fields(pos, name, keys, total_rating, rating_count, rating, released)
+            for key in keys:
+                members.setdefault(key, []).append(pos)
+            if index._rating_bucket[pos] >= 0:
+                rating_members.setdefault(index._rating_bucket[pos], []).append(pos)
+            if index._year[pos]:
+                year_members.setdefault(index._year[pos], []).append(pos)
+
+        # One big-int build per bitset instead of a copy per set bit
+        index._bits = {key: index._from_positions(p) for key, p in members.items()}
+        index._rating_buckets = {b: index._from_positions(p) for b, p in rating_members.items()}
+        index._year_buckets = {y: index._from_positions(p) for y, p in year_members.items()}
+        index._alive = index._from_positions(range(len(index._igdb_ids)))
+        index._sort_all()
+        return index
+
+    def _from_positions(self, positions) -> int:
+        raw = bytearray((len(self._igdb_ids) + 7) // 8)
+        for pos in positions:
+            raw[pos >> 3] |= 1 << (pos & 7)
+        return int.from_bytes(raw, "little")
+
+    def _append(self, igdb_id: int) -> int:
+        pos = len(self._igdb_ids)
+        self._positions[igdb_id] = pos
+        self._igdb_ids.append(igdb_id)
+        self._facets.append(())
+        self._rating_bucket.append(-1)
+        self._year.append(0)
+        self._score.append(math.inf)
+        self._released.append(math.inf)
+        self._names.append("")
+        return pos
+
+    def _set_fields(self, pos, name, keys, total_rating, rating_count, rating, released) -> None:
+        # Same score as games.weighted_score, which orders /all-games by rating
+        score = game.weighted_score(rating, rating_count)
+        timestamp = released.timestamp() if isinstance(released, datetime) else None
+        self._facets[pos] = keys
+        self._rating_bucket[pos] = int(total_rating) if total_rating is not None else -1
+        self._year[pos] = released.year if isinstance(released, datetime) else 0
+        # Sort keys ascend; games without a score/date sort last in every order
+        self._score[pos] = -score if score is not None else math.inf
+        self._released[pos] = timestamp if timestamp is not None else math.inf
+        self._names[pos] = (name or "").lower()
+
+    def _sort_key(self, sort: str):
+        return _order_key(sort, self._score, self._released, self._names)
+
+    def needs_sort(self) -> bool:
+        return len(self._dirty) > MAX_DIRTY and not self._sorting
+
+    def sort_snapshot(self) -> tuple:
+        """Copy what a re-sort needs, for sorted_orders() to work on outside the lock.
+
+        Positions dirty now stay dirty until install_orders(); ones written
+        after the snapshot stay dirty past it.
+        """
+        self._sorting, self._dirty = self._dirty, set()
+        return (
+            self._alive, len(self._igdb_ids),
+            array("d", self._score), array("d", self._released), list(self._names),
+        )
+
+    @staticmethod
+    def sorted_orders(snapshot: tuple) -> dict[str, array]:
+        alive, size, score, released, names = snapshot
+        positions = list(_set_positions(alive, size))
+        return {
+            sort: array("i", sorted(positions, key=_order_key(sort, score, released, names)))
+            for sort in SORTS
+        }
+
+    def install_orders(self, orders: dict[str, array]) -> None:
+        self._orders = orders
+        self._sorting = set()
+
+    def _sort_all(self) -> None:
+        self.install_orders(self.sorted_orders(self.sort_snapshot()))
+
+    def _clear(self, pos: int) -> None:
+        mask = ~(1 << pos)
+        for key in self._facets[pos]:
+            self._bits[key] &= mask
+        if self._rating_bucket[pos] >= 0:
+            self._rating_buckets[self._rating_bucket[pos]] &= mask
+        if self._year[pos]:
+            self._year_buckets[self._year[pos]] &= mask
+
+    def upsert(self, igdb_id: int, name: str | None, facets: dict[str, list[str]] | None,
+               total_rating: float | None, rating_count: int | None, rating: float | None,
+               released: datetime | None) -> None:
+        """Add or update a game. facets=None keeps the game's current facets."""
+        pos = self._positions.get(igdb_id)
+        if pos is None:
+            pos = self._append(igdb_id)
+            self._alive |= 1 << pos
+            keys = ()
+        else:
+            keys = self._facets[pos]
+            self._clear(pos)
+        if facets is not None:
+            keys = tuple((kind, slug) for kind, slugs in facets.items() for slug in slugs)
+        self._set_fields(pos, name, keys, total_rating, rating_count, rating, released)
+
+        bit = 1 << pos
+        for key in keys:
+            self._bits[key] = self._bits.get(key, 0) | bit
+        if self._rating_bucket[pos] >= 0:
+            bucket = self._rating_bucket[pos]
+            self._rating_buckets[bucket] = self._rating_buckets.get(bucket, 0) | bit
+        if self._year[pos]:
+            self._year_buckets[self._year[pos]] = self._year_buckets.get(self._year[pos], 0) | bit
+
+        self._dirty.add(pos)
+
+    def remove(self, igdb_id: int) -> None:
+        pos = self._positions.pop(igdb_id, None)
+        if pos is None:
+            return
+        self._clear(pos)
+        self._alive &= ~(1 << pos)
+        self._dirty.discard(pos)
+        self._sorting.discard(pos)
+
+    def _range_mask(self, buckets: dict[int, int], low: int | None, high: int | None) -> int:
+        mask = 0
+        for bucket, bits in buckets.items():
+            if (low is None or bucket >= low) and (high is None or bucket <= high):
+                mask |= bits
+        return mask
+
+    def browse(
+        self,
+        filters: dict[str, list[str]],
+        year_from: int | None = None,
+        year_to: int | None = None,
+        min_rating: int | None = None,
+        sort: str = "rating",
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[int], int, dict[str, dict[str, int]]]:
+        """IGDB ids of one page of matching games, the match count, and facet counts by kind."""
+        base = self._alive
+        if year_from is not None or year_to is not None:
+            base &= self._range_mask(self._year_buckets, year_from, year_to)
+        if min_rating is not None:
+            base &= self._range_mask(self._rating_buckets, min_rating, None)
+
+        kind_masks = {}
+        for kind, slugs in filters.items():
+            if slugs:
+                mask = 0
+                for slug in slugs:
+                    mask |= self._bits.get((kind, slug), 0)
+                kind_masks[kind] = mask
+
+        matches = base
+        for mask in kind_masks.values():
+            matches &= mask
+
+        counts: dict[str, dict[str, int]] = {kind: {} for kind in FACET_KINDS}
+        others = {}
+        for kind in FACET_KINDS:
+            if kind not in kind_masks:
+                others[kind] = matches
+                continue
+            # Every filter but this kind's own
+            others[kind] = base
+            for other, mask in kind_masks.items():
+                if other != kind:
+                    others[kind] &= mask
+        for (kind, slug), bits in self._bits.items():
+            count = (others[kind] & bits).bit_count()
+            if count:
+                counts[kind][slug] = count
+
+        total = matches.bit_count()
+        positions = self._page(matches, total, sort if sort in SORTS else "rating", offset + limit)
+        return [self._igdb_ids[pos] for pos in positions[offset:]], total, counts
+
+    def _page(self, matches: int, total: int, sort: str, want: int) -> list[int]:
+        """The first `want` matching positions in `sort` order."""
+        if not total or want <= 0:
+            return []
+        key = self._sort_key(sort)
+        size = len(self._igdb_ids)
+        order = self._orders.get(sort, array("i"))
+        # Walking the order checks about want * size / total positions; ranking
+        # the matches directly costs a scan of the bitset plus `total`.
+        if want * size / total > total:
+            return heapq.nsmallest(want, _set_positions(matches, size), key=key)
+
+        raw = matches.to_bytes((size + 7) // 8 or 1, "little")
+
+        def matched(pos):
+            return raw[pos >> 3] >> (pos & 7) & 1
+
+        unsorted = self._dirty | self._sorting if self._sorting else self._dirty
+        dirty = sorted((pos for pos in unsorted if matched(pos)), key=key)
+        clean = (pos for pos in order if matched(pos) and pos not in unsorted)
+        return list(islice(heapq.merge(clean, dirty, key=key), want))
+
+
+_index = FacetIndex()
+_loaded_at: float | None = None
+# Guards _index, _loaded_at and _pending: writers include threadpool threads
+_lock = threading.Lock()
+# Writes that land while a background rebuild is reading the tables; replayed
+# onto the new index before it replaces the old one.
+_pending: list[tuple] | None = None
+
+
+def _load(db: Session) -> FacetIndex:
+    games = db.execute(
+        select(
+            game.Game.igdb_id,
+            game.Game.name,
+            game.Game.total_rating,
+            game.Game.total_rating_count,
+            game.Game.rating,
+            game.Game.first_release_date,
+        ).where(game.Game.is_deleted.is_(False))
+    ).all()
+    facet_rows = db.execute(
+        select(game.Game.igdb_id, GameFacet.kind, GameFacet.slug)
+        .join(game.Game, game.Game.id == GameFacet.game_id)
+        .where(game.Game.is_deleted.is_(False))
+    ).all()
+    return FacetIndex.build(games, facet_rows)
+
+
+def _install(index: FacetIndex, started: float) -> int:
+    """Swap in a built index; call with _lock held."""
+    global _index, _loaded_at
+    _index = index
+    _loaded_at = time.monotonic()
+    logger.info(f"[Facets] Indexed {len(index)} games in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return len(index)
+
+
+def load_from_db(db: Session) -> int:
+    """(Re)build the index from the games and game_facets tables; returns the number of games."""
+    started = time.perf_counter()
+    index = _load(db)
+    with _lock:
+        return _install(index, started)
+
+
+def is_loaded() -> bool:
+    """Whether a full load has finished; keep_fresh retries a failed one."""
+    return _loaded_at is not None
+
+
+def _build_from_new_session() -> FacetIndex:
+    from ...db_setup import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return _load(db)
+    finally:
+        db.close()
+
+
+async def resort_if_needed() -> None:
+    """Re-sort the order lists in a thread once more than MAX_DIRTY games changed."""
+    with _lock:
+        index = _index
+        if not index.needs_sort():
+            return
+        snapshot = index.sort_snapshot()
+    started = time.perf_counter()
+    try:
+        orders = await asyncio.to_thread(FacetIndex.sorted_orders, snapshot)
+    except BaseException:
+        with _lock:
+            # Back to dirty: merged by sort key until the next attempt
+            index._dirty |= index._sorting
+            index._sorting = set()
+        raise
+    with _lock:
+        index.install_orders(orders)
+    logger.info(f"[Facets] Re-sorted {snapshot[1]} positions in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+async def keep_fresh() -> None:
+    """Load the index, then rebuild it every REBUILD_INTERVAL_SECONDS.
+
+    Runs for the app's lifetime. Rebuilding picks up writes made by other API
+    workers and compacts positions freed by deletes. In between, the order
+    lists are re-sorted whenever enough games changed.
+    """
+    global _pending
+    while True:
+        started = time.perf_counter()
+        with _lock:
+            _pending = []
+        try:
+            index = await asyncio.to_thread(_build_from_new_session)
+            with _lock:
+                for op, args in _pending:
+                    getattr(index, op)(*args)
+                _install(index, started)
+        except Exception as e:
+            logger.error(f"[Facets] Failed to build the facet index: {e}")
+        finally:
+            with _lock:
+                _pending = None
+
+        rebuild_at = time.monotonic() + REBUILD_INTERVAL_SECONDS
+        while time.monotonic() < rebuild_at:
+            await asyncio.sleep(RESORT_CHECK_SECONDS)
+            try:
+                await resort_if_needed()
+            except Exception as e:
+                logger.error(f"[Facets] Failed to re-sort the facet index: {e}")
+
+
+def _apply(op: str, *args) -> None:
+    with _lock:
+        if _pending is not None:
+            _pending.append((op, args))
+        if _loaded_at is None:
+            return
+        try:
+            getattr(_index, op)(*args)
+        except Exception as e:
+            # The next rebuild repairs anything missed here; never fail a write for it
+            logger.warning(f"[Facets] Failed to {op} game {args[0]}: {e}")
+
+
+def browse(filters: dict[str, list[str]], **options) -> tuple[list[int], int, dict[str, dict[str, int]]]:
+    """Filter, count and page the loaded index (see FacetIndex.browse)."""
+    with _lock:
+        return _index.browse(filters, **options)
+
+
+def index_game(db_game: game.Game, facets: dict[str, list[str]] | None = None) -> None:
+    """Add, update or (if deleted) drop one stored game. facets=None keeps its current facets."""
+    if db_game.is_deleted:
+        _apply("remove", db_game.igdb_id)
+    else:
+        _apply(
+            "upsert", db_game.igdb_id, db_game.name, facets, db_game.total_rating,
+            db_game.total_rating_count, db_game.rating, db_game.first_release_date,
+        )
+
+
+def index_rows(rows: list[dict], facets_by_igdb_id: dict[int, dict[str, list[str]]]) -> None:
+    """Add or update games from bulk-upsert rows (dicts with igdb_id, name, ...)."""
+    for row in rows:
+        _apply(
+            "upsert", row["igdb_id"], row.get("name"), facets_by_igdb_id.get(row["igdb_id"]),
+            row.get("total_rating"), row.get("total_rating_count"), row.get("rating"),
+            row.get("first_release_date"),
+        )
+
+
+def stats() -> dict:
+    """Games and facet values indexed, games waiting for a re-sort, seconds since the last full load."""
+    with _lock:
+        return {
+            "games": len(_index),
+            "facet_values": len(_index._bits),
+            "unsorted": len(_index._dirty) + len(_index._sorting),
+            "age_seconds": None if _loaded_at is None else round(time.monotonic() - _loaded_at),
+        }
@@ -0,0 +1,87 @@
+# core/facets.py
+"""
+Exact genre, theme and platform filtering through the game_facets table.
+
+process_igdb_data records each game's facet slugs (GameCreate.facets, kind ->
+slugs) from IGDB's name lists, and the game_service write paths replace the
+game's game_facets rows with them. Filters and counts then select game ids by
+(kind, slug) on ix_game_facets_kind_slug instead of scanning the comma-joined
+display strings with ILIKE.
+
+Slugs follow IGDB's scheme ("Role-playing (RPG)" -> "role-playing-rpg").
+FACET_ALIASES keeps the short slugs the frontend links to ("rpg", "card").
+"""
+import re
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..models.game_facet import GameFacet
+from .matching_utils import normalize_unicode
+
+# games column holding the display string -> facet kind
+FACET_COLUMNS = {
+    "genres": "genre",
+    "themes": "theme",
+    "platforms": "platform",
+    "game_modes": "game_mode",
+    "player_perspectives": "player_perspective",
+}
+
+FACET_ALIASES = {
+    "genre": {"rpg": "role-playing-rpg", "card": "card-and-board-game"},
+}
+
+# Commas inside parentheses belong to the name: "4X (explore, expand, exploit, and exterminate)"
+_NAME_SEPARATOR = re.compile(r",\s*(?![^()]*\))")
+
+
+def facet_slug(name: str) -> str:
+    """IGDB-style slug for a genre/theme/platform name."""
+    slug = normalize_unicode(name).lower().replace("&", " and ").replace("'", "")
+    return re.sub(r"[^a-z0-9]+", "-", slug).strip("-")
+
+
+def split_names(value: str | None) -> list[str]:
+    """Names from a comma-joined display string (e.g. games.genres)."""
+    return [name.strip() for name in _NAME_SEPARATOR.split(value or "") if name.strip()]
+
+
+def facets_from_names(names_by_column: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Facet slugs by kind, from display names by games column."""
+    facets = {}
+    for column, kind in FACET_COLUMNS.items():
+        slugs = list(dict.fromkeys(facet_slug(name) for name in names_by_column.get(column) or []))
+        facets[kind] = [slug for slug in slugs if slug]
+    return facets
+
+
+def canonical_slug(kind: str, slug: str) -> str:
+    slug = slug.strip().lower()
+    return FACET_ALIASES.get(kind, {}).get(slug, slug)
+
+
+def game_ids_with(kind: str, slug: str):
+    """Subquery of the ids of games tagged with a facet, for Game.id.in_(...)."""
+    return select(GameFacet.game_id).where(GameFacet.kind == kind, GameFacet.slug == canonical_slug(kind, slug))
+
+
+def count_games_with(db: Session, kind: str, slug: str) -> int:
+    return db.scalar(
+        select(func.count()).where(GameFacet.kind == kind, GameFacet.slug == canonical_slug(kind, slug))
+    )
+
+
+def replace_facets(db: Session, facets_by_game_id: dict[int, dict[str, list[str]]]) -> None:
+    """Replace the facet rows of each game. Does not commit."""
+    if not facets_by_game_id:
+        return
+    db.execute(delete(GameFacet).where(GameFacet.game_id.in_(list(facets_by_game_id))))
+    rows = [
+        {"game_id": game_id, "kind": kind, "slug": slug}
+        for game_id, facets in facets_by_game_id.items()
+        for kind, slugs in facets.items()
+        for slug in slugs
+    ]
+    if rows:
+        db.execute(insert(GameFacet), rows)
@@ -2,18 +2,35 @@
 """Game CRUD operations and database queries."""
 
 from datetime import datetime, UTC
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, load_only
+import gzip
+import hashlib
+import json
 import logging
 
 from ..models import game
-from . import schemas
+from ..models.game_raw_data import GameRawData
+from . import facet_index, facets, pagination, schemas, suggest_index
 from .igdb_service import (
     fetch_from_igdb_async, process_igdb_data, meets_quality_requirements, IGDB_GAME_FIELDS
 )
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT statement. ~55 columns x 500 rows stays under
+# both Postgres' 65535 and SQLite's 32766 bound-parameter limits.
+UPSERT_CHUNK_SIZE = 500
+
+# Refreshes that changed the stored game vs. ones where IGDB returned identical data
+_refresh_stats = {"changed": 0, "unchanged": 0}
+
+
+def card_columns():
+    """Query option that loads only the columns schemas.GameCard needs"""
+    return load_only(*(getattr(game.Game, name) for name in schemas.GameCard.model_fields))
+
 
 def get_game_by_id(db: Session, game_id: int) -> game.Game | None:
     """Fetch a game from the database by ID"""
@@ -30,27 +47,122 @@ def get_game_by_slug(db: Session, slug: str) -> game.Game | None:
     return db.scalar(select(game.Game).where(game.Game.slug == slug))
 
 
+def _compress_raw_data(payload: dict) -> bytes:
+    return gzip.compress(json.dumps(payload, separators=(",", ":")).encode(), compresslevel=6)
+
+
+def store_raw_data(db: Session, game_id: int, payload: dict | None) -> None:
+    """Save a game's full IGDB response to game_raw_data, gzip-compressed.
+
+    Does not commit; the caller's commit covers it alongside the game row.
+    """
+    if payload is None:
+        return
+    blob = _compress_raw_data(payload)
+    row = db.get(GameRawData, game_id)
+    if row:
+        row.data = blob
+        row.encoding = "gzip"
+    else:
+        db.add(GameRawData(game_id=game_id, data=blob, encoding="gzip"))
+
+
+def get_game_raw_data(db: Session, game_id: int) -> dict | None:
+    """Load and decompress a game's stored IGDB response, or None if there isn't one"""
+    row = db.get(GameRawData, game_id)
+    if not row:
+        return None
+    return json.loads(gzip.decompress(row.data))
+
+
+def content_hash(game_data: schemas.GameUpdate) -> str:
+    """Stable SHA-256 of a processed IGDB record, including its raw payload.
+
+    Only fields that were set are hashed, matching what update_game writes.
+    Facets are left out: they are derived from the hashed genre/theme/... names.
+    """
+    payload = game_data.model_dump(mode="json", exclude_unset=True, exclude={"facets"})
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _touch_checked_at(db: Session, *criteria) -> None:
+    """Record an IGDB check without rewriting the row or bumping updated_at."""
+    db.execute(
+        update(game.Game)
+        .where(*criteria)
+        .values(checked_at=datetime.now(UTC), updated_at=game.Game.updated_at)
+    )
+
+
+def _store_rating_scores(db: Session, *criteria) -> None:
+    """Recompute the derived rating columns in SQL, for rows written outside the ORM."""
+    db.execute(
+        update(game.Game)
+        .where(*criteria)
+        .values(**game.rating_score_expressions(), updated_at=game.Game.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_stats() -> dict:
+    """How many refreshes of existing games changed them vs. were no-ops, since process start."""
+    total = _refresh_stats["changed"] + _refresh_stats["unchanged"]
+    return {
+        **_refresh_stats,
+        "no_op_ratio": _refresh_stats["unchanged"] / total if total else 0.0,
+    }
+
+
 def create_game(db: Session, game_data: schemas.GameCreate) -> game.Game:
     """Create a new game in the database"""
-    db_game = game.Game(**game_data.model_dump())
+    data = game_data.model_dump()
+    raw_data = data.pop("raw_data", None)
+    game_facets = data.pop("facets", None)
+    db_game = game.Game(**data, content_hash=content_hash(game_data), checked_at=datetime.now(UTC))
     db.add(db_game)
+    db.flush()
+    store_raw_data(db, db_game.id, raw_data)
+    if game_facets is not None:
+        facets.replace_facets(db, {db_game.id: game_facets})
     db.commit()
     db.refresh(db_game)
+    suggest_index.index_game(db_game)
+    facet_index.index_game(db_game, game_facets)
     return db_game
 
 
 def update_game(db: Session, game_id: int, game_update: schemas.GameUpdate) -> game.Game | None:
-    """Update an existing game in the database"""
+    """Update an existing game in the database.
+
+    If the data hashes the same as what's stored, only checked_at is touched.
+    """
     db_game = get_game_by_id(db, game_id)
     if not db_game:
         return None
+
+    new_hash = content_hash(game_update)
+    if db_game.content_hash == new_hash:
+        _touch_checked_at(db, game.Game.id == db_game.id)
+        _refresh_stats["unchanged"] += 1
+        db.commit()
+        return db_game
     
     game_data = game_update.model_dump(exclude_unset=True)
+    store_raw_data(db, db_game.id, game_data.pop("raw_data", None))
+    game_facets = game_data.pop("facets", None)
+    if game_facets is not None:
+        facets.replace_facets(db, {db_game.id: game_facets})
     for key, value in game_data.items():
         setattr(db_game, key, value)
+    db_game.content_hash = new_hash
+    db_game.checked_at = datetime.now(UTC)
+    _refresh_stats["changed"] += 1
     
     db.commit()
     db.refresh(db_game)
+    suggest_index.index_game(db_game)
+    facet_index.index_game(db_game, game_facets)
     return db_game
 
 
@@ -63,6 +175,8 @@ def mark_game_as_deleted(db: Session, igdb_id: int) -> game.Game | None:
     db_game.is_deleted = True
     db.commit()
     db.refresh(db_game)
+    suggest_index.index_game(db_game)
+    facet_index.index_game(db_game)
     return db_game
 
 
@@ -72,11 +186,22 @@ def get_games_by_ids(db: Session, game_ids: list):
     return db.query(Game).filter(Game.id.in_(game_ids)).all()
 
 
+def get_game_cards_by_igdb_ids(db: Session, igdb_ids: list[int]) -> list[game.Game]:
+    """Card columns of the given games, in the order of igdb_ids"""
+    if not igdb_ids:
+        return []
+    games_by_id = {
+        g.igdb_id: g
+        for g in db.scalars(select(game.Game).options(card_columns()).where(game.Game.igdb_id.in_(igdb_ids)))
+    }
+    return [games_by_id[igdb_id] for igdb_id in igdb_ids if igdb_id in games_by_id]
+
+
 def get_recent_games(db: Session, limit: int = None):
     """Get recent games ordered by release date"""
     from ..models.game import Game
     
-    query = db.query(Game).order_by(Game.first_release_date.desc())
+    query = db.query(Game).options(card_columns()).order_by(Game.first_release_date.desc())
     
     if limit:
         query = query.limit(limit)
@@ -84,58 +209,34 @@ def get_recent_games(db: Session, limit: int = None):
     return query.all()
 
 
-def get_all_games(db: Session, limit: int = 50, offset: int = 0, sort: str = "rating"):
-    """Get all games with pagination and sorting"""
+def get_all_games(db: Session, limit: int = 50, offset: int = 0, sort: str = "rating", cursor: str | None = None):
+    """Get all games with pagination and sorting.
+    
+    Returns a pagination.Page; pass its next_cursor back as `cursor` to page by
+    keyset instead of offset.
+    """
     from ..models.game import Game
-    from sqlalchemy import func, case
     
-    query = db.query(Game)
+    stmt = select(Game).options(card_columns())
     
     # Apply sorting
-    if sort == "rating":
-        # Weighted rating formula (Bayesian average / IMDB-style formula):
-        # WR = (v / (v + m)) * R + (m / (v + m)) * C
-        # Where:
-        # - R = average rating for the game
-        # - v = number of ratings for the game  
-        # - m = minimum ratings required (we use 50)
-        # - C = mean rating across all games (we use 7.0 as baseline)
-        
-        m = 50  # Minimum ratings threshold
-        C = 7.0  # Average rating baseline
-        
-        # Calculate weighted score: higher rating count = more weight to actual rating
-        weighted_rating = (
-            (Game.total_rating_count / (Game.total_rating_count + m)) * Game.rating +
-            (m / (Game.total_rating_count + m)) * C
-        )
-        
-        query = query.filter(
-            Game.rating.isnot(None),
-            Game.total_rating_count.isnot(None),
-            Game.total_rating_count > 0
-        ).order_by(weighted_rating.desc())
-    elif sort == "name":
-        query = query.order_by(Game.name.asc())
+    if sort == "name":
+        keys = [pagination.SortKey(Game.name)]
     elif sort == "release_new":
-        query = query.order_by(Game.first_release_date.desc().nullslast())
+        keys = [pagination.SortKey(Game.first_release_date, descending=True)]
     elif sort == "release_old":
-        query = query.order_by(Game.first_release_date.asc().nullslast())
+        keys = [pagination.SortKey(Game.first_release_date)]
+    elif sort == "overall_rating":
+        # Blended IGDB + GameGloom rating, persisted and indexed on games
+        keys = [pagination.SortKey(Game.overall_rating, descending=True)]
     else:
-        # Default to weighted rating
-        m = 50
-        C = 7.0
-        weighted_rating = (
-            (Game.total_rating_count / (Game.total_rating_count + m)) * Game.rating +
-            (m / (Game.total_rating_count + m)) * C
-        )
-        query = query.filter(
-            Game.rating.isnot(None),
-            Game.total_rating_count.isnot(None),
-            Game.total_rating_count > 0
-        ).order_by(weighted_rating.desc())
+        # "rating" and the default: the Bayesian weighted score (see
+        # models/game.weighted_score), persisted and indexed on games.
+        # Games without votes have none and are left out.
+        stmt = stmt.where(Game.weighted_score.isnot(None))
+        keys = [pagination.SortKey(Game.weighted_score, descending=True)]
     
-    return query.offset(offset).limit(limit).all()
+    return pagination.paginate(db, stmt, keys, Game.id, limit, offset, cursor)
 
 
 def get_all_games_count(db: Session):
@@ -144,45 +245,173 @@ def get_all_games_count(db: Session):
     return db.query(Game).count()
 
 
+def _dialect_insert(db: Session):
+    """The dialect's insert() with ON CONFLICT support, or None if it has none."""
+    return {
+        "postgresql": postgresql.insert,
+        "sqlite": sqlite.insert,
+    }.get(db.get_bind().dialect.name)
+
+
+def _chunks(items: list, size: int = UPSERT_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def upsert_games(
+    db: Session,
+    games_data: list[schemas.GameCreate],
+    filter_existing: bool = False,
+    log_warnings: bool = True,
+) -> tuple[int, int, int]:
+    """Insert or update a batch of processed games in bulk.
+
+    Writes one INSERT ... ON CONFLICT (igdb_id) DO UPDATE per chunk and commits
+    once, instead of a SELECT and a commit per game. Quality rules match the
+    per-game path: new games must pass meets_quality_requirements, existing ones
+    are always refreshed unless filter_existing is set. As in update_game, only
+    fields set on the schema overwrite stored values, and existing games whose
+    content_hash is unchanged only get checked_at touched.
+
+    Returns (new_count, updated_count, skipped_count); updated_count counts
+    only games that actually changed.
+    """
+    # Postgres rejects an upsert that touches the same row twice; last record wins.
+    by_igdb_id = {g.igdb_id: g for g in games_data}
+    if not by_igdb_id:
+        return 0, 0, 0
+
+    existing_hashes = {}
+    for chunk in _chunks(list(by_igdb_id)):
+        existing_hashes.update(db.execute(
+            select(game.Game.igdb_id, game.Game.content_hash).where(game.Game.igdb_id.in_(chunk))
+        ).all())
+
+    accepted = []
+    hashes = {}
+    unchanged_ids = []
+    new_count = updated_count = skipped_count = 0
+    for igdb_id, game_data in by_igdb_id.items():
+        is_new = igdb_id not in existing_hashes
+        if (is_new or filter_existing) and not meets_quality_requirements(game_data, log_warnings=log_warnings):
+            skipped_count += 1
+            continue
+        hashes[igdb_id] = content_hash(game_data)
+        if is_new:
+            new_count += 1
+        elif existing_hashes[igdb_id] == hashes[igdb_id]:
+            unchanged_ids.append(igdb_id)
+            continue
+        else:
+            updated_count += 1
+        accepted.append(game_data)
+
+    for chunk in _chunks(unchanged_ids):
+        _touch_checked_at(db, game.Game.igdb_id.in_(chunk))
+    _refresh_stats["unchanged"] += len(unchanged_ids)
+
+    insert = _dialect_insert(db)
+    if insert is None:
+        # No native upsert on this backend: fall back to the per-game path
+        db.commit()
+        for game_data in accepted:
+            existing = get_game_by_igdb_id(db, game_data.igdb_id)
+            if existing:
+                update_game(db, existing.id, game_data)
+            else:
+                create_game(db, game_data)
+        return new_count, updated_count, skipped_count
+
+    _refresh_stats["changed"] += updated_count
+    now = datetime.now(UTC)
+    raw_payloads = {}
+    facets_by_igdb_id = {}
+    # Rows with the same set of fields share a statement (and its SET clause)
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for game_data in accepted:
+        row = game_data.model_dump(exclude_unset=True)
+        raw_data = row.pop("raw_data", None)
+        if raw_data is not None:
+            raw_payloads[game_data.igdb_id] = raw_data
+        game_facets = row.pop("facets", None)
+        if game_facets is not None:
+            facets_by_igdb_id[game_data.igdb_id] = game_facets
+        row.update(content_hash=hashes[game_data.igdb_id], checked_at=now, updated_at=now)
+        groups.setdefault(tuple(row), []).append(row)
+
+    for columns, rows in groups.items():
+        for chunk in _chunks(rows):
+            stmt = insert(game.Game).values([{**row, "created_at": now} for row in chunk])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[game.Game.igdb_id],
+                set_={col: stmt.excluded[col] for col in columns if col != "igdb_id"},
+            )
+            db.execute(stmt)
+
+    game_ids = {}
+    for chunk in _chunks(list(raw_payloads.keys() | facets_by_igdb_id.keys())):
+        game_ids.update(db.execute(
+            select(game.Game.igdb_id, game.Game.id).where(game.Game.igdb_id.in_(chunk))
+        ).all())
+
+    for chunk in _chunks(list(facets_by_igdb_id.items())):
+        facets.replace_facets(db, {game_ids[igdb_id]: game_facets for igdb_id, game_facets in chunk})
+
+    if raw_payloads:
+        raw_rows = [
+            {"game_id": game_ids[igdb_id], "encoding": "gzip", "data": _compress_raw_data(payload), "updated_at": now}
+            for igdb_id, payload in raw_payloads.items()
+        ]
+        for chunk in _chunks(raw_rows):
+            stmt = insert(GameRawData).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[GameRawData.game_id],
+                set_={col: stmt.excluded[col] for col in ("encoding", "data", "updated_at")},
+            )
+            db.execute(stmt)
+
+    written_ids = [row["igdb_id"] for rows in groups.values() for row in rows]
+    for chunk in _chunks(written_ids):
+        _store_rating_scores(db, game.Game.igdb_id.in_(chunk))
+
+    db.commit()
+    # Rows already in the session were written behind the ORM's back
+    db.expire_all()
+    written = [row for rows in groups.values() for row in rows]
+    suggest_index.index_rows(written)
+    facet_index.index_rows(written, facets_by_igdb_id)
+    return new_count, updated_count, skipped_count
+
+
+def store_igdb_games(db: Session, igdb_data: list[dict]) -> tuple[int, int]:
+    """Process raw IGDB game records and upsert the ones that meet quality requirements"""
+    processed = []
+    for game_data in igdb_data:
+        try:
+            if not game_data.get('name'):
+                continue
+            processed.append(process_igdb_data(game_data))
+        except Exception as e:
+            logger.error(f"Error processing game {game_data.get('name', 'Unknown')}: {str(e)}")
+            continue
+
+    new_count, update_count, skipped_count = upsert_games(db, processed)
+
+    if skipped_count > 0:
+        logger.info(f"[Quality] Skipped {skipped_count} games that didn't meet quality requirements")
+
+    return new_count, update_count
+
+
 async def sync_games_from_igdb(db: Session, query: str) -> tuple[int, int]:
     """Sync games from IGDB to database"""
     try:
         igdb_data = await fetch_from_igdb_async(query=query)
-        new_count = 0
-        update_count = 0
-        skipped_count = 0
-        
-        for game_data in igdb_data:
-            try:
-                if not game_data.get('name'):
-                    continue
-                    
-                processed_data = process_igdb_data(game_data)
-                
-                existing_game = get_game_by_igdb_id(db, game_data['id'])
-                
-                if existing_game:
-                    update_game(db, existing_game.id, processed_data)
-                    update_count += 1
-                else:
-                    if meets_quality_requirements(processed_data):
-                        create_game(db, processed_data)
-                        new_count += 1
-                    else:
-                        skipped_count += 1
-                    
-            except Exception as e:
-                logger.error(f"Error processing game {game_data.get('name', 'Unknown')}: {str(e)}")
-                continue
-        
-        if skipped_count > 0:
-            logger.info(f"[Quality] Skipped {skipped_count} games that didn't meet quality requirements")
-                
-        return new_count, update_count
+        return store_igdb_games(db, igdb_data)
 
-        
     except Exception as e:
         logger.error(f"Error syncing games from IGDB: {str(e)}")
+        db.rollback()
         return 0, 0
 
 
@@ -0,0 +1,89 @@
+# core/http_cache.py
+"""
+HTTP conditional requests for read endpoints: ETag / Last-Modified validators,
+304 Not Modified, and Cache-Control.
+
+Validators come from what the response is built from (a row's updated_at, a
+list's aggregate state, or a cached body's hash), so checking them costs far
+less than building the body. If-None-Match takes precedence over
+If-Modified-Since, as in RFC 9110.
+
+Responses that are the same for every visitor are marked public so a CDN can
+absorb anonymous traffic; per-user responses are private and revalidated on
+every use, which still turns unchanged responses into empty 304s.
+"""
+import hashlib
+from datetime import datetime, UTC
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+# Browsers keep a minute, shared caches five, and may serve stale for ten more
+# while they revalidate
+PUBLIC_CACHE_CONTROL = "public, max-age=60, s-maxage=300, stale-while-revalidate=600"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def etag_for(*parts) -> str:
+    """Strong ETag over the values a response is built from."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Columns store naive UTC; HTTP dates have whole-second precision
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).replace(microsecond=0)
+
+
+def is_not_modified(request: Request, etag: str | None, last_modified: datetime | None = None) -> bool:
+    """True if the client's cached copy (If-None-Match / If-Modified-Since) is current."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        # GET uses weak comparison: a W/ prefix on the client's tag doesn't matter
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return _as_utc(last_modified) <= since
+    return False
+
+
+def validator_headers(etag: str | None, last_modified: datetime | None = None,
+                      cache_control: str = PUBLIC_CACHE_CONTROL) -> dict[str, str]:
+    headers = {"Cache-Control": cache_control}
+    if etag is not None:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def conditional(request: Request, response: Response, etag: str | None,
+                last_modified: datetime | None = None,
+                cache_control: str = PUBLIC_CACHE_CONTROL,
+                vary: str | None = None) -> Response | None:
+    """Set validators and Cache-Control on `response`; a 304 to return instead if the client is current.
+
+    Usage in an endpoint:
+        not_modified = http_cache.conditional(request, response, etag, updated_at)
+        if not_modified:
+            return not_modified
+    """
+    headers = validator_headers(etag, last_modified, cache_control)
+    if vary:
+        headers["Vary"] = vary
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
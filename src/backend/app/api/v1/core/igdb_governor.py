@@ -0,0 +1,220 @@
+# core/igdb_governor.py
+"""
+Shared throttle for every outbound IGDB request.
+
+IGDB allows 4 requests/second and 8 open requests per client id. Both
+fetch_from_igdb and fetch_from_igdb_async reserve a slot here before sending:
+
+- Rate: a token bucket implemented as a GCRA reservation. When REDIS_URL is
+  set the bucket lives in Redis, so the web workers, the APScheduler job, SWR
+  background tasks and the data scripts all spend one shared budget. Without
+  Redis (or if it errors) an in-process bucket is used instead.
+- Concurrency: at most IGDB_MAX_IN_FLIGHT requests open at once per process.
+
+A 429 pushes the bucket back by a cooldown so every caller slows down, not
+just the one that was throttled. stats() reports queue wait and 429 counts.
+"""
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+import redis
+
+from ...settings import settings
+from .cache import _get_client as _get_async_redis
+
+logger = logging.getLogger(__name__)
+
+_BUCKET_KEY = "igdb:governor:tat"
+_SLOT_POLL_SECONDS = 0.01
+
+# GCRA reservation. KEYS[1] holds the theoretical arrival time (ms) of the next
+# perfectly-spaced request. Returns how many ms the caller must wait before
+# sending. A non-zero ARGV[3] is a 429 penalty: push the bucket back, reserve nothing.
+_RESERVE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local penalty = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+if penalty > 0 then
+    redis.call('SET', KEYS[1], tat + tolerance + penalty, 'PX', 60000)
+    return 0
+end
+local start = tat - tolerance
+if start < now then start = now end
+redis.call('SET', KEYS[1], tat + interval, 'PX', 60000)
+return start - now
+"""
+
+
+class _LocalBucket:
+    """In-process GCRA bucket, shared by threads and the event loop."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tat = 0.0
+
+    def reserve(self, interval: float, tolerance: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            start = max(now, tat - tolerance)
+            self._tat = tat + interval
+            return start - now
+
+    def penalize(self, seconds: float, tolerance: float) -> None:
+        # Skip past the burst allowance too, so the very next caller waits the full cooldown.
+        with self._lock:
+            self._tat = max(self._tat, time.monotonic()) + tolerance + seconds
+
+
+_local_bucket = _LocalBucket()
+_in_flight = threading.BoundedSemaphore(settings.IGDB_MAX_IN_FLIGHT)
+
+_sync_redis: redis.Redis | None = None
+_sync_redis_initialized = False
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "queued": 0,
+    "wait_seconds_total": 0.0,
+    "wait_seconds_max": 0.0,
+    "rate_limited_429": 0,
+    "redis_errors": 0,
+}
+
+
+def _bucket_params() -> tuple[float, float]:
+    """(interval, burst tolerance) in seconds for the configured rate."""
+    interval = 1.0 / settings.IGDB_RATE_LIMIT
+    tolerance = (max(settings.IGDB_RATE_BURST, 1) - 1) * interval
+    return interval, tolerance
+
+
+def _get_sync_redis() -> redis.Redis | None:
+    """Build (once) and return the sync Redis client, or None if disabled."""
+    global _sync_redis, _sync_redis_initialized
+    if _sync_redis_initialized:
+        return _sync_redis
+    _sync_redis_initialized = True
+    if settings.REDIS_URL:
+        try:
+            _sync_redis = redis.Redis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+        except Exception as e:
+            logger.warning(f"[IGDB governor] Failed to init Redis client, using in-process bucket: {e}")
+            _sync_redis = None
+    return _sync_redis
+
+
+def _count_redis_error(e: Exception) -> None:
+    logger.warning(f"[IGDB governor] Redis bucket failed, using in-process bucket: {e}")
+    with _stats_lock:
+        _stats["redis_errors"] += 1
+
+
+def _reserve_sync(penalty: float = 0.0) -> float:
+    interval, tolerance = _bucket_params()
+    client = _get_sync_redis()
+    if client is not None:
+        try:
+            args = [int(interval * 1000), int(tolerance * 1000), int(penalty * 1000)]
+            return int(client.eval(_RESERVE_SCRIPT, 1, _BUCKET_KEY, *args)) / 1000
+        except Exception as e:
+            _count_redis_error(e)
+    if penalty:
+        _local_bucket.penalize(penalty, tolerance)
+        return 0.0
+    return _local_bucket.reserve(interval, tolerance)
+
+
+async def _reserve_async(penalty: float = 0.0) -> float:
+    interval, tolerance = _bucket_params()
+    client = _get_async_redis()
+    if client is not None:
+        try:
+            args = [int(interval * 1000), int(tolerance * 1000), int(penalty * 1000)]
+            return int(await client.eval(_RESERVE_SCRIPT, 1, _BUCKET_KEY, *args)) / 1000
+        except Exception as e:
+            _count_redis_error(e)
+    if penalty:
+        _local_bucket.penalize(penalty, tolerance)
+        return 0.0
+    return _local_bucket.reserve(interval, tolerance)
+
+
+def _record_wait(waited: float) -> None:
+    with _stats_lock:
+        _stats["requests"] += 1
+        if waited > 0.001:
+            _stats["queued"] += 1
+        _stats["wait_seconds_total"] += waited
+        _stats["wait_seconds_max"] = max(_stats["wait_seconds_max"], waited)
+
+
+@contextmanager
+def throttle():
+    """Hold an IGDB request slot for the duration of a blocking call."""
+    start = time.perf_counter()
+    delay = _reserve_sync()
+    if delay > 0:
+        time.sleep(delay)
+    _in_flight.acquire()
+    _record_wait(time.perf_counter() - start)
+    try:
+        yield
+    finally:
+        _in_flight.release()
+
+
+@asynccontextmanager
+async def athrottle():
+    """Hold an IGDB request slot for the duration of an awaited call."""
+    start = time.perf_counter()
+    delay = await _reserve_async()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    # The cap is a threading semaphore so sync and async callers share it;
+    # poll it rather than block the event loop.
+    while not _in_flight.acquire(blocking=False):
+        await asyncio.sleep(_SLOT_POLL_SECONDS)
+    _record_wait(time.perf_counter() - start)
+    try:
+        yield
+    finally:
+        _in_flight.release()
+
+
+def record_429(cooldown: float) -> None:
+    """Count a 429 and push the shared bucket back by `cooldown` seconds."""
+    with _stats_lock:
+        _stats["rate_limited_429"] += 1
+    _reserve_sync(penalty=cooldown)
+
+
+async def record_429_async(cooldown: float) -> None:
+    """Async variant of record_429."""
+    with _stats_lock:
+        _stats["rate_limited_429"] += 1
+    await _reserve_async(penalty=cooldown)
+
+
+def stats() -> dict:
+    """Snapshot of governor metrics since process start."""
+    with _stats_lock:
+        snapshot = dict(_stats)
+    requests = snapshot["requests"]
+    snapshot["wait_seconds_avg"] = snapshot["wait_seconds_total"] / requests if requests else 0.0
+    snapshot["backend"] = "redis" if settings.REDIS_URL else "local"
+    snapshot["rate_per_second"] = settings.IGDB_RATE_LIMIT
+    snapshot["max_in_flight"] = settings.IGDB_MAX_IN_FLIGHT
+    return snapshot
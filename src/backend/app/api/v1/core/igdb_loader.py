@@ -0,0 +1,95 @@
+# core/igdb_loader.py
+"""
+DataLoader-style coalescing of single-game IGDB lookups.
+
+Refresh bursts (SWR, webhooks, game-page misses) each want one game. Instead
+of one IGDB call per game, load_game() parks the caller on a future and
+collects every id requested within COALESCE_WINDOW_SECONDS; the batch then
+goes out as one `where id = (a,b,c,...)` query (up to 500 ids) and each caller
+receives its own record. Duplicate ids in a window share a single slot.
+"""
+import asyncio
+import logging
+import weakref
+
+from .igdb_service import IGDB_MAX_IDS_PER_QUERY, fetch_games_by_ids_async
+
+logger = logging.getLogger(__name__)
+
+COALESCE_WINDOW_SECONDS = 0.02
+
+
+class _GameLoader:
+    """Batches load() calls made on one event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._pending: dict[int, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._dispatches: set[asyncio.Task] = set()
+        self.batches = 0
+        self.requested = 0
+
+    def load(self, igdb_id: int) -> asyncio.Future:
+        future = self._loop.create_future()
+        self._pending.setdefault(igdb_id, []).append(future)
+        self.requested += 1
+        if len(self._pending) >= IGDB_MAX_IDS_PER_QUERY:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(COALESCE_WINDOW_SECONDS, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            self.batches += 1
+            task = self._loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: dict[int, list[asyncio.Future]]) -> None:
+        try:
+            records = await fetch_games_by_ids_async(list(batch))
+        except Exception as e:
+            logger.error(f"[IGDB loader] Batch of {len(batch)} ids failed: {e}")
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        logger.debug(f"[IGDB loader] Resolved {len(records)}/{len(batch)} ids in one call")
+        for igdb_id, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(records.get(igdb_id))
+
+
+_loaders: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _GameLoader]" = weakref.WeakKeyDictionary()
+
+
+def _get_loader() -> _GameLoader:
+    loop = asyncio.get_running_loop()
+    loader = _loaders.get(loop)
+    if loader is None:
+        loader = _loaders[loop] = _GameLoader(loop)
+    return loader
+
+
+async def load_game(igdb_id: int) -> dict | None:
+    """Fetch one game's full IGDB record, coalesced with concurrent lookups.
+
+    Returns None when IGDB has no game with that id.
+    """
+    return await _get_loader().load(igdb_id)
+
+
+def stats() -> dict:
+    """Lookups requested vs IGDB calls made on the current event loop."""
+    loader = _loaders.get(asyncio.get_running_loop())
+    if loader is None:
+        return {"requested": 0, "batches": 0}
+    return {"requested": loader.requested, "batches": loader.batches}
@@ -8,7 +8,8 @@ import time
 import asyncio
 import httpx
 
-from . import schemas
+from . import schemas, igdb_governor
+from .facets import FACET_COLUMNS, facets_from_names
 from .matching_utils import extract_ps_concept_id, build_alt_names_search
 from ...settings import settings
 
@@ -87,34 +88,103 @@ GAME_TYPE_MAPPING = {
 }
 
 
+# Shared HTTP clients. Every SWR refresh, discovery sync and webhook talks to the
+# same host, so pooled keep-alive connections save a TCP+TLS handshake per call.
+_async_client: httpx.AsyncClient | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+_sync_session: requests.Session | None = None
+
+
+def _igdb_headers() -> dict:
+    return {
+        "Client-ID": settings.IGDB_CLIENT_ID,
+        "Authorization": f"Bearer {settings.IGDB_ACCESS_TOKEN}",
+        "Accept": "application/json",
+    }
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_igdb_client() -> httpx.AsyncClient:
+    """Return the process-wide async IGDB client, building it on first use.
+
+    An httpx client is bound to the event loop it was first used on, so a new
+    one is built when the running loop changes (e.g. scripts that call
+    asyncio.run() more than once). Must be called from inside a coroutine.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_client_loop is not loop:
+        http2 = settings.IGDB_HTTP2 and _http2_available()
+        if settings.IGDB_HTTP2 and not http2:
+            logger.warning("[IGDB] IGDB_HTTP2 is set but the h2 package is missing, using HTTP/1.1")
+        _async_client = httpx.AsyncClient(
+            timeout=10,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.IGDB_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.IGDB_MAX_CONNECTIONS,
+                keepalive_expiry=30,
+            ),
+        )
+        _async_client_loop = loop
+    return _async_client
+
+
+async def close_igdb_client() -> None:
+    """Close the shared async client. Called from the app lifespan on shutdown."""
+    global _async_client, _async_client_loop
+    client = _async_client
+    _async_client = None
+    _async_client_loop = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _get_sync_session() -> requests.Session:
+    """Return the process-wide requests session used by the sync fetch path."""
+    global _sync_session
+    if _sync_session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=settings.IGDB_MAX_CONNECTIONS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _sync_session = session
+    return _sync_session
+
+
 def fetch_from_igdb(game_id: int | None = None, query: str | None = None, endpoint: str = "games", max_retries: int = 3) -> dict | list:
     """Fetch data from IGDB API with retry logic.
     
     Retries with exponential backoff on transient failures (5xx, timeouts, rate limits).
     """
-    headers = {
-        "Client-ID": settings.IGDB_CLIENT_ID,
-        "Authorization": f"Bearer {settings.IGDB_ACCESS_TOKEN}",
-        "Accept": "application/json",
-    }
+    headers = _igdb_headers()
 
     if game_id:
         body = f"{IGDB_GAME_FIELDS} where id = {game_id};"
     else:
         body = query
 
-    url = f"https://api.igdb.com/v4/{endpoint}"
+    url = f"{settings.IGDB_API_BASE}/{endpoint}"
+    session = _get_sync_session()
     
     last_exception = None
     for attempt in range(max_retries):
         try:
-            response = requests.post(url, headers=headers, data=body, timeout=10)
+            with igdb_governor.throttle():
+                response = session.post(url, headers=headers, data=body, timeout=10)
             
-            # Rate limit hit - wait and retry
+            # Rate limit hit - push the shared bucket back so every caller waits, then retry
             if response.status_code == 429:
                 wait_time = min(2 ** attempt, 8)  # 1s, 2s, 4s, max 8s
-                logger.warning(f"[IGDB] Rate limited, waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                time.sleep(wait_time)
+                logger.warning(f"[IGDB] Rate limited, backing off {wait_time}s before retry {attempt + 1}/{max_retries}")
+                igdb_governor.record_429(wait_time)
                 continue
                 
             response.raise_for_status()
@@ -150,32 +220,69 @@ def fetch_from_igdb(game_id: int | None = None, query: str | None = None, endpoi
     raise requests.exceptions.RequestException("IGDB request failed after retries")
 
 
+# IGDB caps a single query at 500 results, so multi-id lookups are chunked to match.
+IGDB_MAX_IDS_PER_QUERY = 500
+
+
+def _games_by_ids_query(ids: list[int]) -> str:
+    return f"{IGDB_GAME_FIELDS} where id = ({','.join(str(i) for i in ids)}); limit {len(ids)};"
+
+
+def fetch_games_by_ids(igdb_ids: list[int]) -> dict[int, dict]:
+    """Fetch many games in as few IGDB calls as possible, keyed by IGDB id.
+
+    Ids IGDB doesn't know are simply absent from the result.
+    """
+    ids = list(dict.fromkeys(igdb_ids))
+    games = {}
+    for i in range(0, len(ids), IGDB_MAX_IDS_PER_QUERY):
+        chunk = ids[i:i + IGDB_MAX_IDS_PER_QUERY]
+        for record in fetch_from_igdb(query=_games_by_ids_query(chunk)) or []:
+            games[record["id"]] = record
+    return games
+
+
+async def fetch_games_by_ids_async(igdb_ids: list[int]) -> dict[int, dict]:
+    """Async variant of fetch_games_by_ids."""
+    ids = list(dict.fromkeys(igdb_ids))
+    games = {}
+    for i in range(0, len(ids), IGDB_MAX_IDS_PER_QUERY):
+        chunk = ids[i:i + IGDB_MAX_IDS_PER_QUERY]
+        for record in await fetch_from_igdb_async(query=_games_by_ids_query(chunk)) or []:
+            games[record["id"]] = record
+    return games
+
+
+TIME_TO_BEAT_FIELDS = "fields completely,count,game_id,hastily,normally;"
+
+
+def _format_time_to_beat(time_data: dict) -> dict:
+    """Shape one game_time_to_beats record as stored on games.time_to_beat."""
+    time_to_beat = {}
+    for key in ["hastily", "normally", "completely"]:
+        if key in time_data and time_data[key]:
+            seconds = time_data[key]
+            hours = seconds // 3600
+            minutes = (seconds % 3600) // 60
+            time_to_beat[key] = {
+                "seconds": seconds,
+                "hours": hours,
+                "minutes": minutes,
+                "formatted": f"{hours}h"
+            }
+    if "count" in time_data:
+        time_to_beat["count"] = time_data["count"]
+    return time_to_beat
+
+
 def fetch_time_to_beat(game_id: int) -> dict | None:
     """Fetch time to beat data from IGDB for a specific game ID."""
     try:
-        query = f"fields completely,count,game_id,hastily,normally; where game_id = {game_id};"
+        query = f"{TIME_TO_BEAT_FIELDS} where game_id = {game_id};"
         data = fetch_from_igdb(query=query, endpoint="game_time_to_beats")
         
         if data and len(data) > 0:
-            time_data = data[0]
-            time_to_beat = {}
-            
-            for key in ["hastily", "normally", "completely"]:
-                if key in time_data and time_data[key]:
-                    seconds = time_data[key]
-                    hours = seconds // 3600
-                    minutes = (seconds % 3600) // 60
-                    time_to_beat[key] = {
-                        "seconds": seconds,
-                        "hours": hours,
-                        "minutes": minutes,
-                        "formatted": f"{hours}h"
-                    }
-            
-            if "count" in time_data:
-                time_to_beat["count"] = time_data["count"]
-                
-            return time_to_beat
+            return _format_time_to_beat(data[0])
         return None
     except Exception as e:
         logger.error(f"Error fetching time to beat data: {str(e)}")
@@ -183,51 +290,52 @@ def fetch_time_to_beat(game_id: int) -> dict | None:
 
 
 async def fetch_from_igdb_async(game_id: int | None = None, query: str | None = None, endpoint: str = "games", max_retries: int = 3) -> dict | list:
-    """Fetch data from IGDB API with retry logic and exponential backoff."""
-    headers = {
-        "Client-ID": settings.IGDB_CLIENT_ID,
-        "Authorization": f"Bearer {settings.IGDB_ACCESS_TOKEN}",
-        "Accept": "application/json",
-    }
+    """Fetch data from IGDB API with retry logic and exponential backoff.
+
+    Goes through the shared pooled client (see get_igdb_client), so repeated
+    calls reuse open connections instead of handshaking each time.
+    """
+    headers = _igdb_headers()
     body = f"{IGDB_GAME_FIELDS} where id = {game_id};" if game_id else query
-    url = f"https://api.igdb.com/v4/{endpoint}"
+    url = f"{settings.IGDB_API_BASE}/{endpoint}"
+    client = get_igdb_client()
 
     last_exception = None
-    async with httpx.AsyncClient(timeout=10) as client:
-        for attempt in range(max_retries):
-            try:
+    for attempt in range(max_retries):
+        try:
+            async with igdb_governor.athrottle():
                 response = await client.post(url, headers=headers, content=body)
 
-                if response.status_code == 429:
-                    wait_time = min(2 ** attempt, 8)
-                    logger.warning(f"[IGDB] Rate limited, waiting {wait_time}s before retry {attempt + 1}/{max_retries}")
-                    await asyncio.sleep(wait_time)
-                    continue
-
-                response.raise_for_status()
-                data = response.json()
-                return data[0] if game_id else data
-
-            except httpx.TimeoutException as e:
-                last_exception = e
+            if response.status_code == 429:
                 wait_time = min(2 ** attempt, 8)
-                logger.warning(f"[IGDB] Timeout, retrying in {wait_time}s ({attempt + 1}/{max_retries})")
-                await asyncio.sleep(wait_time)
+                logger.warning(f"[IGDB] Rate limited, backing off {wait_time}s before retry {attempt + 1}/{max_retries}")
+                await igdb_governor.record_429_async(wait_time)
+                continue
 
-            except httpx.HTTPStatusError as e:
-                if 500 <= e.response.status_code < 600:
-                    last_exception = e
-                    wait_time = min(2 ** attempt, 8)
-                    logger.warning(f"[IGDB] Server error {e.response.status_code}, retrying in {wait_time}s ({attempt + 1}/{max_retries})")
-                    await asyncio.sleep(wait_time)
-                else:
-                    raise
+            response.raise_for_status()
+            data = response.json()
+            return data[0] if game_id else data
+
+        except httpx.TimeoutException as e:
+            last_exception = e
+            wait_time = min(2 ** attempt, 8)
+            logger.warning(f"[IGDB] Timeout, retrying in {wait_time}s ({attempt + 1}/{max_retries})")
+            await asyncio.sleep(wait_time)
 
-            except httpx.RequestError as e:
+        except httpx.HTTPStatusError as e:
+            if 500 <= e.response.status_code < 600:
                 last_exception = e
                 wait_time = min(2 ** attempt, 8)
-                logger.warning(f"[IGDB] Request failed, retrying in {wait_time}s ({attempt + 1}/{max_retries}): {e}")
+                logger.warning(f"[IGDB] Server error {e.response.status_code}, retrying in {wait_time}s ({attempt + 1}/{max_retries})")
                 await asyncio.sleep(wait_time)
+            else:
+                raise
+
+        except httpx.RequestError as e:
+            last_exception = e
+            wait_time = min(2 ** attempt, 8)
+            logger.warning(f"[IGDB] Request failed, retrying in {wait_time}s ({attempt + 1}/{max_retries}): {e}")
+            await asyncio.sleep(wait_time)
 
     logger.error(f"[IGDB] All {max_retries} retries failed")
     if last_exception:
@@ -238,32 +346,32 @@ async def fetch_from_igdb_async(game_id: int | None = None, query: str | None =
 async def fetch_time_to_beat_async(game_id: int) -> dict | None:
     """Fetch time to beat data from IGDB for a specific game ID."""
     try:
-        query = f"fields completely,count,game_id,hastily,normally; where game_id = {game_id};"
+        query = f"{TIME_TO_BEAT_FIELDS} where game_id = {game_id};"
         data = await fetch_from_igdb_async(query=query, endpoint="game_time_to_beats")
 
         if data and len(data) > 0:
-            time_data = data[0]
-            time_to_beat = {}
-            for key in ["hastily", "normally", "completely"]:
-                if key in time_data and time_data[key]:
-                    seconds = time_data[key]
-                    hours = seconds // 3600
-                    minutes = (seconds % 3600) // 60
-                    time_to_beat[key] = {
-                        "seconds": seconds,
-                        "hours": hours,
-                        "minutes": minutes,
-                        "formatted": f"{hours}h"
-                    }
-            if "count" in time_data:
-                time_to_beat["count"] = time_data["count"]
-            return time_to_beat
+            return _format_time_to_beat(data[0])
         return None
     except Exception as e:
         logger.error(f"Error fetching time to beat data: {str(e)}")
         return None
 
 
+async def fetch_time_to_beat_by_ids_async(igdb_ids: list[int]) -> dict[int, dict]:
+    """Fetch time to beat for many games, up to 500 per IGDB call, keyed by IGDB id.
+
+    Games IGDB has no time to beat for are absent from the result.
+    """
+    ids = list(dict.fromkeys(igdb_ids))
+    results = {}
+    for i in range(0, len(ids), IGDB_MAX_IDS_PER_QUERY):
+        chunk = ids[i:i + IGDB_MAX_IDS_PER_QUERY]
+        query = f"{TIME_TO_BEAT_FIELDS} where game_id = ({','.join(str(g) for g in chunk)}); limit {len(chunk)};"
+        for record in await fetch_from_igdb_async(query=query, endpoint="game_time_to_beats") or []:
+            results[record["game_id"]] = _format_time_to_beat(record)
+    return results
+
+
 def meets_quality_requirements(game_data: schemas.GameCreate, log_warnings: bool = True) -> bool:
     """Check if a game meets minimum quality requirements for storage.
     
@@ -504,5 +612,9 @@ def process_igdb_data(igdb_data: dict) -> schemas.GameCreate:
         collections=collections,
         alternative_names=alternative_names,
         keywords=keywords,
-        raw_data=igdb_data
+        raw_data=igdb_data,
+        facets=facets_from_names({
+            column: [item['name'] for item in igdb_data.get(column, []) if item.get('name')]
+            for column in FACET_COLUMNS
+        }),
     )
@@ -0,0 +1,79 @@
+# core/negative_cache.py
+"""
+Negative cache for IGDB lookups that came back empty.
+
+Unknown slugs and ids (bots crawling made-up game URLs included) and search
+terms IGDB had no storable games for are remembered for NEGATIVE_CACHE_TTL
+seconds, so repeating them costs a cache lookup instead of an IGDB round trip.
+
+- In-process: a bounded map of key -> expiry, checked first.
+- Across workers (REDIS_URL set): entries are also written to Redis with the
+  same TTL, so a miss recorded by one worker is seen by all of them.
+
+Only definite misses are recorded (nothing found, or nothing that passed
+meets_quality_requirements); IGDB errors never are. Callers consult this
+cache only after the database misses, so a game stored in the meantime (e.g.
+by a webhook) is served normally.
+"""
+import logging
+import time
+from collections import OrderedDict
+
+from ...settings import settings
+from .cache import _get_client
+
+logger = logging.getLogger(__name__)
+
+MAX_LOCAL_ENTRIES = 10_000
+
+_local: OrderedDict[str, float] = OrderedDict()
+_stats = {"hits": 0, "recorded": 0}
+
+
+def _key(kind: str, value: str) -> str:
+    return f"negative:{kind}:{value}"
+
+
+async def contains(kind: str, value: str) -> bool:
+    """True if `value` (a slug, id or normalized search term) is a recent IGDB miss."""
+    key = _key(kind, value)
+    expires = _local.get(key)
+    if expires is not None:
+        if expires > time.monotonic():
+            _stats["hits"] += 1
+            return True
+        del _local[key]
+
+    client = _get_client()
+    if client is None:
+        return False
+    try:
+        if await client.exists(key):
+            _stats["hits"] += 1
+            return True
+    except Exception as e:
+        logger.warning(f"Negative cache read failed for {key}: {e}")
+    return False
+
+
+async def remember(kind: str, value: str) -> None:
+    """Record that IGDB had nothing usable for `value`."""
+    key = _key(kind, value)
+    _stats["recorded"] += 1
+    _local[key] = time.monotonic() + settings.NEGATIVE_CACHE_TTL
+    _local.move_to_end(key)
+    while len(_local) > MAX_LOCAL_ENTRIES:
+        _local.popitem(last=False)
+
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        await client.set(key, "1", ex=settings.NEGATIVE_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Negative cache write failed for {key}: {e}")
+
+
+def stats() -> dict:
+    """IGDB lookups skipped (hits) and misses recorded since startup."""
+    return {**_stats, "local_entries": len(_local)}
@@ -0,0 +1,129 @@
+# core/pagination.py
+"""
+Opaque cursors for paginated list endpoints.
+
+A cursor is URL-safe base64 of a small JSON object describing where the next
+page starts. Clients must treat it as opaque and send it back unchanged; a
+cursor that doesn't decode is rejected with a 400.
+
+Lists ordered by SortKeys page by keyset: the cursor holds the sort values and
+id of the last row served ({"after": [...]}), and the next page starts with a
+WHERE on those values instead of an OFFSET, so deep pages cost the same as the
+first. {"offset": n} cursors are accepted too, for lists that can't keyset.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+class SortKey(NamedTuple):
+    """One ORDER BY term of a paginated list. NULLs always sort last."""
+    expr: Any
+    descending: bool = False
+
+
+class Page(list):
+    """A page of results. next_cursor is None on the last page."""
+    next_cursor: str | None = None
+
+
+def encode_cursor(position: dict) -> str:
+    raw = json.dumps(position, separators=(",", ":"), sort_keys=True, default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position = json.loads(raw)
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(position, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+def order_by(keys: list[SortKey], id_column) -> list:
+    """ORDER BY terms for `keys`, with the id as the final tie-breaker."""
+    terms = [(key.expr.desc() if key.descending else key.expr.asc()).nulls_last() for key in keys]
+    return [*terms, id_column.asc()]
+
+
+def _after(keys: list[SortKey], id_column, values: list):
+    """Rows that sort after `values` (the sort values then id of the last row served)."""
+    *key_values, last_id = values
+    branches, ties = [], []
+    for key, value in zip(keys, key_values):
+        if value is None:
+            # NULLs sort last, so only more NULLs can follow
+            ties.append(key.expr.is_(None))
+            continue
+        beyond = key.expr < value if key.descending else key.expr > value
+        branches.append(and_(*ties, or_(beyond, key.expr.is_(None))))
+        ties.append(key.expr == value)
+    branches.append(and_(*ties, id_column > last_id))
+    return or_(*branches)
+
+
+def _load(expr, raw):
+    if raw is None:
+        return None
+    try:
+        python_type = expr.type.python_type
+    except NotImplementedError:
+        return raw
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    return python_type(raw)
+
+
+def keyset(stmt, keys: list[SortKey], id_column, limit: int | None, offset: int = 0, cursor: str | None = None):
+    """
+    Order and window a select() for one page.
+    
+    Returned rows are (entity, *sort values, id, *columns added afterwards),
+    with one row beyond `limit` to tell whether another page follows; pass
+    them to to_page(). `cursor`, when given, takes precedence over `offset`.
+    """
+    if cursor:
+        position = decode_cursor(cursor)
+        if "after" in position:
+            after = position["after"]
+            if not isinstance(after, list) or len(after) != len(keys) + 1:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            try:
+                values = [_load(key.expr, value) for key, value in zip(keys, after)] + [int(after[-1])]
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            stmt = stmt.where(_after(keys, id_column, values))
+            offset = 0
+        else:
+            offset = position.get("offset")
+            if not isinstance(offset, int) or offset < 0:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    stmt = stmt.add_columns(*(key.expr for key in keys), id_column).order_by(*order_by(keys, id_column))
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def to_page(rows, keys: list[SortKey], limit: int | None) -> Page:
+    """Page of entities from keyset() rows, with the cursor for the page after it."""
+    page = Page(row[0] for row in (rows[:limit] if limit else rows))
+    if limit and len(rows) > limit:
+        last = rows[limit - 1]
+        page.next_cursor = encode_cursor({"after": list(last[1:len(keys) + 2])})
+    return page
+
+
+def paginate(db, stmt, keys: list[SortKey], id_column, limit: int | None, offset: int = 0, cursor: str | None = None) -> Page:
+    """Run a select() of one entity as a keyset-paginated page."""
+    return to_page(db.execute(keyset(stmt, keys, id_column, limit, offset, cursor)).all(), keys, limit)
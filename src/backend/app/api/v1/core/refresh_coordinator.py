@@ -0,0 +1,350 @@
+# core/refresh_coordinator.py
+"""
+Background refresh coordinator for stale games (SWR).
+
+Viewing a stale game used to start a refresh task per request, so a popular
+game viewed 500 times in a minute triggered 500 IGDB refreshes, and the
+related-data fetches ran on the request's DB session after it was closed.
+schedule_refresh() instead queues the game once:
+
+- Duplicate triggers collapse: a game that is already queued or refreshing
+  only gets its view counted, which raises its priority.
+- REFRESH_MAX_CONCURRENCY workers drain a priority queue ordered by views in
+  the last VIEW_WINDOW_SECONDS, so the most-viewed stale games go first.
+- Before refreshing, a worker takes a per-game lease (Redis SET NX PX when
+  REDIS_URL is set) so other API workers don't refresh the same game, then
+  re-checks staleness in case another worker just finished it.
+- Every step (refresh, similar games, episodes/seasons/packs, editions and
+  bundles) runs on a session the coordinator opens and closes itself.
+- Time to beat is collected from refreshed games for TIME_TO_BEAT_BATCH_SECONDS
+  and fetched in one IGDB game_time_to_beats query per batch (up to 500 games),
+  so the detail endpoint never waits on it.
+
+Without Redis (or on any Redis error) the lease is skipped and only the
+in-process dedupe applies.
+
+The queue and view counts live in process memory and are deliberately not
+persisted: a restart drops pending refreshes, and any game still stale is
+queued again on its next view.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import secrets
+import time
+import weakref
+from collections import deque
+
+from sqlalchemy import select, update
+
+from ...settings import settings
+from .cache import _get_client
+from .igdb_service import IGDB_MAX_IDS_PER_QUERY, fetch_time_to_beat_by_ids_async
+
+logger = logging.getLogger(__name__)
+
+VIEW_WINDOW_SECONDS = 300
+LEASE_TTL_MS = 5 * 60 * 1000
+TIME_TO_BEAT_BATCH_SECONDS = 2.0
+
+# Only delete the lease if we still own it (it may have expired and been re-taken).
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_stats = {
+    "scheduled": 0,
+    "collapsed": 0,
+    "refreshed": 0,
+    "failed": 0,
+    "lease_conflicts": 0,
+    "already_fresh": 0,
+    "time_to_beat_batches": 0,
+    "time_to_beat_updated": 0,
+}
+
+
+async def _acquire_lease(igdb_id: int) -> str | None:
+    """Take the cross-worker refresh lease for a game.
+
+    Returns the lease token, "" when Redis is disabled or errored (refresh
+    anyway), or None when another worker holds the lease.
+    """
+    client = _get_client()
+    if client is None:
+        return ""
+    token = secrets.token_hex(8)
+    try:
+        if await client.set(f"refresh:lease:{igdb_id}", token, nx=True, px=LEASE_TTL_MS):
+            return token
+        return None
+    except Exception as e:
+        logger.warning(f"[Refresh] Redis lease failed for game {igdb_id}, continuing locally: {e}")
+        return ""
+
+
+async def _release_lease(igdb_id: int, token: str) -> None:
+    client = _get_client()
+    if client is None or not token:
+        return
+    try:
+        await client.eval(_RELEASE_SCRIPT, 1, f"refresh:lease:{igdb_id}", token)
+    except Exception as e:
+        logger.warning(f"[Refresh] Failed to release lease for game {igdb_id}: {e}")
+
+
+async def _with_session(fn, game_id: int):
+    """Run a `fn(db, game_id)` service coroutine on a session of its own."""
+    from ...db_setup import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return await fn(db, game_id)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[Refresh] {fn.__name__} failed for game {game_id}: {e}")
+    finally:
+        db.close()
+
+
+def _still_stale(igdb_id: int) -> bool:
+    from ...db_setup import SessionLocal
+    from .game_service import get_game_by_igdb_id
+    from .swr_service import is_stale
+
+    db = SessionLocal()
+    try:
+        return is_stale(get_game_by_igdb_id(db, igdb_id), max_age_hours=24)
+    finally:
+        db.close()
+
+
+async def _store_time_to_beat(batch: dict[int, int]) -> None:
+    """Fetch time to beat for a batch of {igdb_id: game_id} and write what changed."""
+    from ...db_setup import SessionLocal
+    from ..models.game import Game
+
+    try:
+        fetched = await fetch_time_to_beat_by_ids_async(list(batch))
+    except Exception as e:
+        logger.error(f"[Refresh] Time to beat batch of {len(batch)} games failed: {e}")
+        return
+    _stats["time_to_beat_batches"] += 1
+    if not fetched:
+        return
+
+    db = SessionLocal()
+    try:
+        game_ids = [batch[igdb_id] for igdb_id in fetched]
+        current = dict(db.execute(select(Game.id, Game.time_to_beat).where(Game.id.in_(game_ids))).all())
+        changes = [
+            {"id": batch[igdb_id], "time_to_beat": time_to_beat}
+            for igdb_id, time_to_beat in fetched.items()
+            if batch[igdb_id] in current and current[batch[igdb_id]] != time_to_beat
+        ]
+        if changes:
+            db.execute(update(Game), changes)
+            db.commit()
+        _stats["time_to_beat_updated"] += len(changes)
+        logger.info(f"[Refresh] Time to beat: {len(fetched)}/{len(batch)} found, {len(changes)} updated")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[Refresh] Failed to store time to beat batch: {e}")
+    finally:
+        db.close()
+
+
+async def _refresh(igdb_id: int, game_id: int) -> None:
+    from .swr_service import refresh_game_async
+    from .game_service import (
+        sync_similar_games,
+        fetch_related_game_types,
+        fetch_game_editions_and_bundles,
+    )
+
+    token = await _acquire_lease(igdb_id)
+    if token is None:
+        _stats["lease_conflicts"] += 1
+        logger.debug(f"[Refresh] Game {igdb_id} is being refreshed by another worker")
+        return
+    try:
+        if not await asyncio.to_thread(_still_stale, igdb_id):
+            _stats["already_fresh"] += 1
+            return
+        if not await refresh_game_async(igdb_id):
+            _stats["failed"] += 1
+            return
+        await asyncio.gather(
+            _with_session(sync_similar_games, game_id),
+            _with_session(fetch_related_game_types, game_id),
+            _with_session(fetch_game_editions_and_bundles, game_id),
+        )
+        _get_coordinator().queue_time_to_beat(igdb_id, game_id)
+        _stats["refreshed"] += 1
+    finally:
+        await _release_lease(igdb_id, token)
+
+
+class _Coordinator:
+    """Priority queue plus a fixed pool of workers on one event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, concurrency: int):
+        self._loop = loop
+        self._concurrency = max(1, concurrency)
+        # Heap entries are (-views, seq, igdb_id). A game is re-pushed whenever
+        # its view count rises; entries whose count no longer matches are skipped.
+        self._heap: list[tuple[int, int, int]] = []
+        self._seq = itertools.count()
+        self._queued: dict[int, tuple[int, int]] = {}  # igdb_id -> (game_id, priority)
+        self._running: set[int] = set()
+        self._views: dict[int, deque[float]] = {}
+        self._wakeup = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        self._time_to_beat: dict[int, int] = {}  # igdb_id -> game_id awaiting a batch
+        self._time_to_beat_timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [self._loop.create_task(self._work()) for _ in range(self._concurrency)]
+
+    async def stop(self) -> None:
+        if self._time_to_beat_timer is not None:
+            self._time_to_beat_timer.cancel()
+            self._time_to_beat_timer = None
+        tasks = self._workers + list(self._flushes)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+
+    def _record_view(self, igdb_id: int) -> int:
+        now = time.monotonic()
+        views = self._views.setdefault(igdb_id, deque())
+        views.append(now)
+        while views and views[0] < now - VIEW_WINDOW_SECONDS:
+            views.popleft()
+        return len(views)
+
+    def schedule(self, igdb_id: int, game_id: int) -> bool:
+        priority = self._record_view(igdb_id)
+        if igdb_id in self._running:
+            _stats["collapsed"] += 1
+            return False
+        collapsed = igdb_id in self._queued
+        self._queued[igdb_id] = (game_id, priority)
+        heapq.heappush(self._heap, (-priority, next(self._seq), igdb_id))
+        self._wakeup.set()
+        self.start()
+        if collapsed:
+            _stats["collapsed"] += 1
+            return False
+        _stats["scheduled"] += 1
+        return True
+
+    def _pop(self) -> tuple[int, int] | None:
+        while self._heap:
+            neg_priority, _, igdb_id = heapq.heappop(self._heap)
+            queued = self._queued.get(igdb_id)
+            if queued is None or queued[1] != -neg_priority:
+                continue
+            del self._queued[igdb_id]
+            return igdb_id, queued[0]
+        return None
+
+    def queue_time_to_beat(self, igdb_id: int, game_id: int) -> None:
+        self._time_to_beat[igdb_id] = game_id
+        if len(self._time_to_beat) >= IGDB_MAX_IDS_PER_QUERY:
+            self._flush_time_to_beat()
+        elif self._time_to_beat_timer is None:
+            self._time_to_beat_timer = self._loop.call_later(TIME_TO_BEAT_BATCH_SECONDS, self._flush_time_to_beat)
+
+    def _flush_time_to_beat(self) -> None:
+        if self._time_to_beat_timer is not None:
+            self._time_to_beat_timer.cancel()
+            self._time_to_beat_timer = None
+        batch, self._time_to_beat = self._time_to_beat, {}
+        if batch:
+            task = self._loop.create_task(_store_time_to_beat(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _work(self) -> None:
+        while True:
+            item = self._pop()
+            if item is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            igdb_id, game_id = item
+            self._running.add(igdb_id)
+            try:
+                await _refresh(igdb_id, game_id)
+            except Exception as e:
+                _stats["failed"] += 1
+                logger.error(f"[Refresh] Unexpected error refreshing game {igdb_id}: {e}")
+            finally:
+                self._running.discard(igdb_id)
+                self._views.pop(igdb_id, None)
+
+    def snapshot(self) -> dict:
+        return {
+            "queued": len(self._queued),
+            "running": len(self._running),
+            "workers": len(self._workers),
+            "time_to_beat_pending": len(self._time_to_beat),
+        }
+
+
+_coordinators: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Coordinator]" = weakref.WeakKeyDictionary()
+
+
+def _get_coordinator() -> _Coordinator:
+    loop = asyncio.get_running_loop()
+    coordinator = _coordinators.get(loop)
+    if coordinator is None:
+        coordinator = _coordinators[loop] = _Coordinator(loop, settings.REFRESH_MAX_CONCURRENCY)
+    return coordinator
+
+
+def schedule_refresh(igdb_id: int, game_id: int) -> bool:
+    """Queue a background refresh of a stale game; never blocks the caller.
+
+    Returns True if the game was newly queued, False if the trigger collapsed
+    into a refresh that is already queued or running.
+    """
+    return _get_coordinator().schedule(igdb_id, game_id)
+
+
+def schedule_time_to_beat(igdb_id: int, game_id: int) -> None:
+    """Queue a game for the next batched time-to-beat fetch; never blocks the caller."""
+    _get_coordinator().queue_time_to_beat(igdb_id, game_id)
+
+
+def start() -> None:
+    """Start the worker pool on the running loop (otherwise started on first use)."""
+    _get_coordinator().start()
+
+
+async def shutdown() -> None:
+    """Cancel the workers; queued refreshes are dropped and retried on the next view."""
+    coordinator = _coordinators.pop(asyncio.get_running_loop(), None)
+    if coordinator is not None:
+        await coordinator.stop()
+
+
+def stats() -> dict:
+    """Triggers queued vs collapsed, refresh outcomes, and the current queue depth."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    coordinator = _coordinators.get(loop) if loop else None
+    queue = coordinator.snapshot() if coordinator else {
+        "queued": 0, "running": 0, "workers": 0, "time_to_beat_pending": 0,
+    }
+    return {**_stats, **queue}
@@ -3,7 +3,7 @@ import re
 from datetime import datetime
 from typing import Optional, List, Dict
 from enum import Enum
-from pydantic import BaseModel, Field, EmailStr, ConfigDict, field_validator, computed_field
+from pydantic import BaseModel, Field, EmailStr, ConfigDict, field_validator
 from ..models.user_game import GameStatus
 
 # A short blocklist of the worst-offender passwords. Lowercase + stripped at compare time.
@@ -114,26 +114,6 @@ class SimilarGame(BaseModel):
     rating: Optional[float] = None
     genres: Optional[str] = None
 
-def blend_overall_rating(total_rating, total_count, community_rating, community_count) -> Optional[float]:
-    """Vote-weighted blend (0-100) of every available rating source.
-
-    Each source contributes its rating weighted by its vote count, so a game with
-    thousands of IGDB votes barely shifts from a few GameGloom reviews, while a
-    niche game leans more on its community ratings. More sources (e.g. Steam) drop
-    in as extra (rating, count) terms. Returns None when nothing has any votes.
-    """
-    sources = [
-        (total_rating, total_count or 0),
-        (community_rating, community_count or 0),
-    ]
-    weighted = [(r, c) for r, c in sources if r is not None and c > 0]
-    if not weighted:
-        return next((r for r, _ in sources if r is not None), None)
-    total = sum(r * c for r, c in weighted)
-    count = sum(c for _, c in weighted)
-    return total / count
-
-
 class GameBase(BaseModel):
     """Base schema for game models."""
     igdb_id: int
@@ -208,12 +188,23 @@ class GameBase(BaseModel):
 class GameCreate(GameBase):
     """Schema for creating a new game entry."""
     raw_data: Optional[Dict] = None
+    # Facet slugs by kind ("genre": ["shooter", ...]), stored in game_facets
+    facets: Optional[Dict[str, List[str]]] = None
 
 class GameUpdate(GameBase):
     """Schema for updating an existing game entry."""
     pass
 
-class Game(GameBase):
+class OverallRatingMixin(BaseModel):
+    """Adds the blended overall_rating / overall_rating_count to a game schema.
+
+    Both are columns on games, kept current whenever IGDB's or GameGloom's
+    ratings change; see blend_overall_rating in models/game.py for the formula.
+    """
+    overall_rating: Optional[float] = None
+    overall_rating_count: Optional[int] = 0
+
+class Game(GameBase, OverallRatingMixin):
     """Schema for reading game data, including timestamps."""
     id: int
     created_at: datetime
@@ -225,24 +216,78 @@ class Game(GameBase):
     community_rating: Optional[float] = None
     community_rating_count: Optional[int] = None
 
-    @computed_field
-    @property
-    def overall_rating(self) -> Optional[float]:
-        """Vote-weighted blend (0-100) of IGDB's total_rating + GameGloom's
-        community_rating. See blend_overall_rating for the formula."""
-        return blend_overall_rating(
-            self.total_rating, self.total_rating_count,
-            self.community_rating, self.community_rating_count,
-        )
-
-    @computed_field
-    @property
-    def overall_rating_count(self) -> int:
-        """Total number of votes behind overall_rating, across all sources."""
-        return (self.total_rating_count or 0) + (self.community_rating_count or 0)
+    model_config = ConfigDict(from_attributes=True)
+
+class GameCard(OverallRatingMixin):
+    """Lean game schema for list endpoints (discovery, genre/theme, all-games, search).
+
+    Holds only what the list UIs render. Every field is a games column, so
+    queries can load exactly these with game_service.card_columns(). Only the
+    first artwork/screenshot/video is kept, since cards show just that one.
+    """
+    id: int
+    igdb_id: int
+    name: str
+    slug: Optional[str] = None
+    cover_image: Optional[str] = None
+    summary: Optional[str] = None
+
+    rating: Optional[float] = None
+    total_rating: Optional[float] = None
+    total_rating_count: Optional[int] = None
+    community_rating: Optional[float] = None
+    community_rating_count: Optional[int] = None
+    hypes: Optional[int] = None
+    first_release_date: Optional[datetime] = None
+
+    genres: Optional[str] = None
+    themes: Optional[str] = None
+    platforms: Optional[str] = None
+    developers: Optional[str] = None
+    game_modes: Optional[str] = None
+    player_perspectives: Optional[str] = None
+    game_type_name: Optional[str] = None
+    keywords: Optional[List[str]] = None
+
+    artworks: Optional[List[str]] = None
+    screenshots: Optional[List[str]] = None
+    videos: Optional[List[str]] = None
+
+    @field_validator("artworks", "screenshots", "videos")
+    @classmethod
+    def first_only(cls, value):
+        return value[:1] if value else value
 
     model_config = ConfigDict(from_attributes=True)
 
+class SearchResults(BaseModel):
+    """One page of search results with the total match count and the next page's cursor.
+
+    total stops at the search count cap; total_capped says there are more.
+    next_cursor is None on the last page.
+    """
+    results: List[GameCard]
+    total: int
+    total_capped: bool = False
+    next_cursor: Optional[str] = None
+
+class BrowseResults(BaseModel):
+    """One page of /games/browse, the number of matches, and facet counts.
+
+    facets maps kind ("genre", "platform", ...) to slug -> games matching the
+    other active filters plus that value.
+    """
+    results: List[GameCard]
+    total: int
+    facets: Dict[str, Dict[str, int]]
+
+class GameSuggestion(BaseModel):
+    """One search-box typeahead entry, served from the in-memory suggest index."""
+    igdb_id: int
+    name: str
+    slug: Optional[str] = None
+    cover_image: Optional[str] = None
+
 class UserGameBase(BaseModel):
     """Base schema for user-game relationships."""
     game_id: int
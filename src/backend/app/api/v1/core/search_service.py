@@ -1,11 +1,38 @@
 # search_service.py
-"""Game search functionality."""
+"""Game search functionality.
+
+On PostgreSQL, "all" and "games" searches run against games.search_vector (a
+weighted tsvector with a GIN index, see models/game.py) and are ranked with
+ts_rank. Other categories, and SQLite, use ILIKE.
+
+Result lists page by offset or by keyset cursor (see core/pagination.py).
+search_games_page() returns a page together with the total match count (capped
+at SEARCH_COUNT_CAP) from a single query, for the combined search response.
+
+fuzzy_search_games() tolerates typos in game names ("elden rign") using pg_trgm
+similarity over the trigram indexes on name and alt_names_search, or difflib
+on SQLite.
+"""
 
 from difflib import SequenceMatcher
-from sqlalchemy import or_, case, String
+from sqlalchemy import or_, and_, case, cast, func, literal, literal_column, select, Double, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Session
 
 from ..models import game
+from . import pagination
+from .game_service import card_columns
+
+SEARCH_VECTOR = literal_column("games.search_vector", TSVECTOR)
+
+# Lowest difflib ratio the SQLite fallback accepts as a fuzzy match. Postgres uses
+# pg_trgm's own threshold (pg_trgm.similarity_threshold, 0.3 by default).
+FUZZY_MIN_RATIO = 0.6
+# Totals above this are reported as "SEARCH_COUNT_CAP+" instead of counted exactly.
+SEARCH_COUNT_CAP = 1000
+
+# Fuzzy matches past this many are noise; also caps the fuzzy result count.
+FUZZY_MAX_RESULTS = 100
 
 
 def string_similarity(a, b):
@@ -15,20 +42,8 @@ def string_similarity(a, b):
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
-def search_games_in_db(db: Session, query: str, limit: int = 50, offset: int = 0, category: str = "all") -> list[game.Game]:
-    """
-    Search for games in database matching the query.
-    
-    Parameters:
-    - query: The search term
-    - limit: Maximum number of results to return
-    - offset: Number of results to skip (for pagination)
-    - category: Category to search in. Options: "all", "games", "developers", "platforms", "keywords"
-    """
+def _ilike_filter(query: str, category: str):
     search_pattern = f"%{query}%"
-    category = category.lower()
-    
-    # Build where clause based on category
     if category == "games":
         where_clause = or_(
             game.Game.name.ilike(search_pattern),
@@ -51,53 +66,150 @@ def search_games_in_db(db: Session, query: str, limit: int = 50, offset: int = 0
             game.Game.developers.ilike(search_pattern),
             game.Game.keywords.cast(String).ilike(search_pattern)
         )
+    sort_keys = [
+        pagination.SortKey(case((game.Game.name.ilike(search_pattern), 0), else_=1)),
+        pagination.SortKey(game.Game.total_rating, descending=True),
+    ]
+    return where_clause, sort_keys
+
+
+def _fulltext_filter(query: str, category: str):
+    # Names and keywords are indexed unstemmed ('simple'), summaries stemmed
+    # ('english'); OR-ing both parses of the query matches either form.
+    tsquery = func.websearch_to_tsquery("simple", query).op("||")(func.websearch_to_tsquery("english", query))
+    where_clause = SEARCH_VECTOR.bool_op("@@")(tsquery)
+    if category == "games":
+        # The index finds candidates; the recheck keeps name/alt-name (A, B) hits only.
+        name_vector = func.ts_filter(SEARCH_VECTOR, literal_column("'{a,b}'"))
+        where_clause = and_(where_clause, name_vector.bool_op("@@")(tsquery))
+    # ts_rank is a real; widened to double precision, the value a cursor stores
+    # is the one the next page compares against (a real read back as text isn't).
+    sort_keys = [
+        pagination.SortKey(case((func.lower(game.Game.name) == query.strip().lower(), 0), else_=1)),
+        pagination.SortKey(cast(func.ts_rank(SEARCH_VECTOR, tsquery), Double), descending=True),
+        pagination.SortKey(game.Game.total_rating, descending=True),
+    ]
+    return where_clause, sort_keys
+
+
+def _search_filter(db: Session, query: str, category: str):
+    """WHERE clause and sort keys for a search query in a category."""
+    category = category.lower()
+    if category in ("all", "games") and db.get_bind().dialect.name == "postgresql":
+        return _fulltext_filter(query, category)
+    return _ilike_filter(query, category)
+
+
+def search_games_in_db(
+    db: Session, query: str, limit: int = 50, offset: int = 0, category: str = "all", cursor: str | None = None
+) -> pagination.Page:
+    """
+    Search for games in database matching the query.
     
-    from sqlalchemy import select
+    Parameters:
+    - query: The search term
+    - limit: Maximum number of results to return
+    - offset: Number of results to skip (for pagination)
+    - category: Category to search in. Options: "all", "games", "developers", "platforms", "keywords"
+    - cursor: next_cursor of the previous page; pages by keyset instead of offset
+    """
+    where_clause, sort_keys = _search_filter(db, query, category)
+    stmt = select(game.Game).options(card_columns()).where(where_clause)
+    return pagination.paginate(db, stmt, sort_keys, game.Game.id, limit, offset, cursor)
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search term, for cache keys."""
+    return " ".join(query.lower().split())
+
+
+def _capped_count(where_clause):
+    matches = select(literal(1)).select_from(game.Game).where(where_clause).limit(SEARCH_COUNT_CAP + 1).subquery()
+    return select(func.count()).select_from(matches).scalar_subquery()
+
+
+def search_games_page(
+    db: Session,
+    query: str,
+    limit: int = 50,
+    offset: int = 0,
+    category: str = "all",
+    known_total: int | None = None,
+    cursor: str | None = None,
+) -> tuple[pagination.Page, int]:
+    """
+    A page of search results plus the total number of matches, in one query.
     
-    # Exact matching with offset support
-    exact_matches = list(db.scalars(
+    The total rides along as a capped-count subquery, so it stops counting at
+    SEARCH_COUNT_CAP + 1 (a total above SEARCH_COUNT_CAP means "more than").
+    Pass known_total (e.g. a cached count) to skip counting entirely.
+    """
+    where_clause, sort_keys = _search_filter(db, query, category)
+    stmt = pagination.keyset(
+        select(game.Game).options(card_columns()).where(where_clause),
+        sort_keys, game.Game.id, limit, offset, cursor,
+    )
+    if known_total is not None:
+        return pagination.to_page(db.execute(stmt).all(), sort_keys, limit), known_total
+
+    rows = db.execute(stmt.add_columns(_capped_count(where_clause).label("total"))).all()
+    if rows:
+        return pagination.to_page(rows, sort_keys, limit), rows[0].total
+    # An empty page past the first carries no count; ask for it separately
+    first_page = offset == 0 and not cursor
+    return pagination.Page(), 0 if first_page else db.scalar(select(_capped_count(where_clause)))
+
+
+def count_search_results(db: Session, query: str, category: str = "all") -> int:
+    """Count total search results for a query."""
+    where_clause, _ = _search_filter(db, query, category)
+    return db.query(game.Game).filter(where_clause).count()
+
+
+def _fuzzy_search_postgres(db: Session, query: str, limit: int, offset: int) -> list[game.Game]:
+    alt_names = func.coalesce(game.Game.alt_names_search, "")
+    score = func.greatest(func.similarity(game.Game.name, query), func.word_similarity(query, alt_names))
+    return list(db.scalars(
         select(game.Game)
-        .where(where_clause)
-        .order_by(
-            case(
-                (game.Game.name.ilike(search_pattern), 0),
-                else_=1
-            ),
-            game.Game.total_rating.desc().nulls_last()
-        )
+        .options(card_columns())
+        .where(or_(
+            game.Game.name.bool_op("%")(query),
+            literal(query).bool_op("<%")(game.Game.alt_names_search),
+        ))
+        .order_by(score.desc(), game.Game.total_rating_count.desc().nulls_last())
         .offset(offset)
         .limit(limit)
     ))
-    
-    return exact_matches
 
 
-def count_search_results(db: Session, query: str, category: str = "all") -> int:
-    """Count total search results for a query."""
-    search_pattern = f"%{query}%"
-    category = category.lower()
-    
-    if category == "games":
-        where_clause = or_(
-            game.Game.name.ilike(search_pattern),
-            game.Game.alternative_names.cast(String).ilike(search_pattern)
-        )
-    elif category == "developers":
-        where_clause = game.Game.developers.ilike(search_pattern)
-    elif category == "platforms":
-        where_clause = game.Game.platforms.ilike(search_pattern)
-    elif category == "keywords":
-        where_clause = game.Game.keywords.cast(String).ilike(search_pattern)
-    else:
-        where_clause = or_(
-            game.Game.name.ilike(search_pattern),
-            game.Game.alternative_names.cast(String).ilike(search_pattern),
-            game.Game.summary.ilike(search_pattern),
-            game.Game.storyline.ilike(search_pattern),
-            game.Game.genres.ilike(search_pattern),
-            game.Game.themes.ilike(search_pattern),
-            game.Game.developers.ilike(search_pattern),
-            game.Game.keywords.cast(String).ilike(search_pattern)
-        )
+def _fuzzy_search_fallback(db: Session, query: str, limit: int, offset: int) -> list[game.Game]:
+    scored = []
+    for game_id, name, alt_names_search, rating_count in db.execute(
+        select(game.Game.id, game.Game.name, game.Game.alt_names_search, game.Game.total_rating_count)
+    ):
+        alt_names = (alt_names_search or "").strip("|").split("|")
+        score = max(string_similarity(query, candidate) for candidate in [name, *alt_names])
+        if score >= FUZZY_MIN_RATIO:
+            scored.append((-score, -(rating_count or 0), game_id))
+    ids = [game_id for _, _, game_id in sorted(scored)[offset:offset + limit]]
+    if not ids:
+        return []
+    games_by_id = {g.id: g for g in db.scalars(select(game.Game).options(card_columns()).where(game.Game.id.in_(ids)))}
+    return [games_by_id[game_id] for game_id in ids if game_id in games_by_id]
+
+
+def fuzzy_search_games(db: Session, query: str, limit: int = 50, offset: int = 0) -> list[game.Game]:
+    """
+    Typo-tolerant search over game names and alternative names.
     
-    return db.query(game.Game).filter(where_clause).count()
+    Results are ordered by how closely the name matches, then by popularity
+    (total_rating_count). Meant for name searches that found nothing exact, so
+    misspellings resolve locally instead of going to IGDB.
+    """
+    query = query.strip()
+    limit = min(limit, FUZZY_MAX_RESULTS - offset)
+    if not query or limit <= 0:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _fuzzy_search_postgres(db, query, limit, offset)
+    return _fuzzy_search_fallback(db, query, limit, offset)
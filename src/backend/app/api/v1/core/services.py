@@ -7,10 +7,13 @@ Import from here or directly from the specific service module.
 
 Modules:
 - igdb_service: IGDB API integration and data processing
+- igdb_loader: Coalesced single-game IGDB lookups
 - game_service: Game CRUD operations and database queries
 - discovery_service: Trending, anticipated, highly rated, latest games
 - swr_service: Stale-While-Revalidate pattern for data freshness
+- refresh_coordinator: Deduplicated, prioritised background refreshes
 - search_service: Game search functionality
+- suggest_index: In-memory prefix index for search typeahead
 """
 
 # IGDB Service - API integration and data processing
@@ -21,25 +24,39 @@ from .igdb_service import (
     GAME_TYPE_MAPPING,
     fetch_from_igdb,
     fetch_from_igdb_async,
+    fetch_games_by_ids,
+    fetch_games_by_ids_async,
     fetch_time_to_beat,
     fetch_time_to_beat_async,
+    fetch_time_to_beat_by_ids_async,
     meets_quality_requirements,
     process_similar_games,
     process_igdb_data,
 )
 
+# IGDB Loader - Coalesced single-game lookups
+from .igdb_loader import load_game
+
 # Game Service - CRUD and sync operations
 from .game_service import (
+    card_columns,
     get_game_by_id,
     get_game_by_igdb_id,
     get_game_by_slug,
     create_game,
     update_game,
+    content_hash,
+    refresh_stats,
+    store_raw_data,
+    get_game_raw_data,
     mark_game_as_deleted,
     get_games_by_ids,
+    get_game_cards_by_igdb_ids,
     get_recent_games,
     get_all_games,
     get_all_games_count,
+    upsert_games,
+    store_igdb_games,
     sync_games_from_igdb,
     sync_similar_games,
     fetch_related_game_types,
@@ -52,10 +69,13 @@ from .discovery_service import (
     get_anticipated_games,
     get_highly_rated_games,
     get_latest_games,
+    refresh_discovery_rankings,
     get_games_by_genre,
     count_games_by_genre,
     get_games_by_theme,
     count_games_by_theme,
+    get_games_by_platform,
+    count_games_by_platform,
 )
 
 # SWR Service - Data freshness
@@ -64,13 +84,24 @@ from .swr_service import (
     refresh_game_async,
 )
 
+# Refresh Coordinator - Background refresh queue
+from .refresh_coordinator import schedule_refresh, schedule_time_to_beat
+
 # Search Service - Game search
 from .search_service import (
     string_similarity,
     search_games_in_db,
     count_search_results,
+    normalize_query,
+    search_games_page,
+    fuzzy_search_games,
+    FUZZY_MAX_RESULTS,
+    SEARCH_COUNT_CAP,
 )
 
+# Suggest Index - Search typeahead
+from .suggest_index import suggest as suggest_games
+
 # Re-export all for backward compatibility
 __all__ = [
     # IGDB Service
@@ -80,22 +111,35 @@ __all__ = [
     "GAME_TYPE_MAPPING",
     "fetch_from_igdb",
     "fetch_from_igdb_async",
+    "fetch_games_by_ids",
+    "fetch_games_by_ids_async",
     "fetch_time_to_beat",
     "fetch_time_to_beat_async",
+    "fetch_time_to_beat_by_ids_async",
     "meets_quality_requirements",
     "process_similar_games",
     "process_igdb_data",
+    # IGDB Loader
+    "load_game",
     # Game Service
+    "card_columns",
     "get_game_by_id",
     "get_game_by_igdb_id",
     "get_game_by_slug",
     "create_game",
     "update_game",
+    "content_hash",
+    "refresh_stats",
+    "store_raw_data",
+    "get_game_raw_data",
     "mark_game_as_deleted",
     "get_games_by_ids",
+    "get_game_cards_by_igdb_ids",
     "get_recent_games",
     "get_all_games",
     "get_all_games_count",
+    "upsert_games",
+    "store_igdb_games",
     "sync_games_from_igdb",
     "sync_similar_games",
     "fetch_related_game_types",
@@ -105,15 +149,28 @@ __all__ = [
     "get_anticipated_games",
     "get_highly_rated_games",
     "get_latest_games",
+    "refresh_discovery_rankings",
     "get_games_by_genre",
     "count_games_by_genre",
     "get_games_by_theme",
     "count_games_by_theme",
+    "get_games_by_platform",
+    "count_games_by_platform",
     # SWR Service
     "is_stale",
     "refresh_game_async",
+    # Refresh Coordinator
+    "schedule_refresh",
+    "schedule_time_to_beat",
     # Search Service
     "string_similarity",
     "search_games_in_db",
     "count_search_results",
+    "normalize_query",
+    "search_games_page",
+    "fuzzy_search_games",
+    "FUZZY_MAX_RESULTS",
+    "SEARCH_COUNT_CAP",
+    # Suggest Index
+    "suggest_games",
 ]
@@ -0,0 +1,103 @@
+# core/singleflight.py
+"""
+Single-flight deduplication for expensive fetch-and-store work.
+
+When many requests miss on the same key at once (e.g. N users opening a game
+page that isn't in the DB yet), only one of them should call IGDB and insert
+the row; the rest wait for it and reuse the result.
+
+- In-process: concurrent callers with the same key await one shared task.
+- Across workers (REDIS_URL set): the task first takes a short Redis lock
+  (SET NX PX). A worker that loses the lock polls until it is released, then
+  runs its own work function, which is expected to re-check the DB first and
+  find the row the winner just stored.
+
+Without Redis (or on any Redis error) only the in-process layer applies.
+"""
+import asyncio
+import logging
+import secrets
+import time
+from typing import Any, Awaitable, Callable
+
+from .cache import _get_client
+
+logger = logging.getLogger(__name__)
+
+LOCK_TTL_MS = 15000
+LOCK_POLL_SECONDS = 0.05
+
+# Only delete the lock if we still own it (it may have expired and been re-taken).
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_inflight: dict[str, asyncio.Task] = {}
+_stats = {"leaders": 0, "shared": 0, "remote_waits": 0}
+
+
+async def _acquire_remote(key: str) -> str | None:
+    """Take the cross-worker lock for `key`, waiting out any current holder.
+
+    Returns the lock token if we own the lock, or None if Redis is disabled,
+    errored, or another worker held the lock until it was released/expired.
+    """
+    client = _get_client()
+    if client is None:
+        return None
+    lock_key = f"singleflight:{key}"
+    token = secrets.token_hex(8)
+    try:
+        if await client.set(lock_key, token, nx=True, px=LOCK_TTL_MS):
+            return token
+        _stats["remote_waits"] += 1
+        deadline = time.monotonic() + LOCK_TTL_MS / 1000
+        while time.monotonic() < deadline and await client.exists(lock_key):
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+    except Exception as e:
+        logger.warning(f"[singleflight] Redis lock failed for {key}, continuing locally: {e}")
+    return None
+
+
+async def _release_remote(key: str, token: str) -> None:
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        await client.eval(_RELEASE_SCRIPT, 1, f"singleflight:{key}", token)
+    except Exception as e:
+        logger.warning(f"[singleflight] Failed to release lock for {key}: {e}")
+
+
+async def _run(key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    token = await _acquire_remote(key)
+    try:
+        return await fn()
+    finally:
+        if token:
+            await _release_remote(key, token)
+
+
+async def do(key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    """Run `fn()` once for all concurrent callers with the same `key`.
+
+    Every caller gets the same return value, or the same exception. The work
+    is shielded, so a caller that disconnects doesn't cancel it for the rest.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        _stats["leaders"] += 1
+        task = asyncio.ensure_future(_run(key, fn))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        _stats["shared"] += 1
+    return await asyncio.shield(task)
+
+
+def stats() -> dict:
+    """Counts of leading calls, calls that shared a task, and cross-worker waits."""
+    return dict(_stats)
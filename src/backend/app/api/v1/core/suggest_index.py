@@ -0,0 +1,381 @@
+# core/suggest_index.py
+"""
+In-process prefix index for search-box typeahead (/search/suggest).
+
+Every game contributes a few keys, all normalized with normalize_for_match
+(lowercase alphanumerics, so "The Witcher 3" -> "thewitcher3"): its name, its
+name without a leading "The", and each alternative name from alt_names_search.
+Keys live in one sorted list, with the owning IGDB id and its rank score
+(-total_rating_count) in parallel arrays, so a prefix lookup is two bisects
+and a top-k pick over the matching range.
+
+Short prefixes match thousands of keys, so the best TOP_K games for every
+prefix up to PRECOMPUTED_PREFIX_LEN characters are kept precomputed; longer
+prefixes rank at most MAX_SCAN keys of their range.
+
+The index loads from the games table at startup (keep_fresh), is rebuilt
+hourly so every API worker converges, and is updated in place by the game
+write paths (create/update/upsert/delete) on the worker that ran them. Those
+run on the event loop and in threadpool threads (sync endpoints such as the
+PSN/Steam imports), so the module-level functions serialize access with _lock.
+Until the first load finishes, suggest() answers nothing.
+"""
+import asyncio
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+from array import array
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models import game
+from .matching_utils import normalize_for_match
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 10
+PRECOMPUTED_PREFIX_LEN = 4
+MAX_SCAN = 5000
+# Up to this many key edits are applied in place (each shifts the tail, a
+# memmove); more rebuild the arrays in one pass of slice copies
+SPLICE_IN_PLACE_MAX = 32
+REBUILD_INTERVAL_SECONDS = 3600
+
+_LEADING_ARTICLE = re.compile(r"^the\s", re.IGNORECASE)
+# Sorts after every normalized key character (a-z, 0-9): prefix + _END bounds a range
+_END = "{"
+
+
+class Suggestion(NamedTuple):
+    igdb_id: int
+    name: str
+    slug: str | None
+    cover_image: str | None
+    total_rating_count: int
+
+
+def _short_prefixes(keys: set[str]) -> set[str]:
+    return {key[:n] for key in keys for n in range(1, min(len(key), PRECOMPUTED_PREFIX_LEN) + 1)}
+
+
+def game_keys(name: str, alt_names_search: str | None = None) -> set[str]:
+    """Normalized index keys for a game's name and alternative names."""
+    full = normalize_for_match(name)
+    keys = {full}
+    if _LEADING_ARTICLE.match(name) and full.startswith("the"):
+        keys.add(full[3:])
+    keys.update((alt_names_search or "").strip("|").split("|"))
+    keys.discard("")
+    return keys
+
+
+class SuggestIndex:
+    """Sorted keys plus per-game details; not thread-safe (the module functions lock it)."""
+
+    def __init__(self):
+        self._keys: list[str] = []
+        self._ids = array("i")
+        self._scores = array("i")
+        self._games: dict[int, Suggestion] = {}
+        self._game_keys: dict[int, set[str]] = {}
+        self._top: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    @classmethod
+    def build(cls, rows) -> "SuggestIndex":
+        """Build from (igdb_id, name, slug, cover_image, total_rating_count, alt_names_search) rows."""
+        index = cls()
+        pairs = []
+        for igdb_id, name, slug, cover_image, rating_count, alt_names_search in rows:
+            keys = game_keys(name, alt_names_search)
+            index._games[igdb_id] = Suggestion(igdb_id, name, slug, cover_image, rating_count or 0)
+            index._game_keys[igdb_id] = keys
+            pairs.extend((key, igdb_id) for key in keys)
+        pairs.sort()
+        index._keys = [key for key, _ in pairs]
+        index._ids = array("i", (igdb_id for _, igdb_id in pairs))
+        index._scores = array("i", (-index._games[igdb_id].total_rating_count for _, igdb_id in pairs))
+
+        # Precompute the top games per short prefix, most-rated first
+        candidates: dict[str, set[int]] = {}
+        for key, igdb_id in pairs:
+            for n in range(1, min(len(key), PRECOMPUTED_PREFIX_LEN) + 1):
+                candidates.setdefault(key[:n], set()).add(igdb_id)
+        index._top = {
+            prefix: heapq.nsmallest(TOP_K, ids, key=index._rank_key) for prefix, ids in candidates.items()
+        }
+        return index
+
+    def _rank_key(self, igdb_id: int) -> tuple[int, str]:
+        suggestion = self._games[igdb_id]
+        return -suggestion.total_rating_count, suggestion.name
+
+    def _rank(self, igdb_ids) -> list[int]:
+        return sorted(igdb_ids, key=self._rank_key)
+
+    def _scan(self, prefix: str, k: int = TOP_K) -> list[int]:
+        """Best `k` distinct games among the first MAX_SCAN keys starting with `prefix`."""
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = min(bisect.bisect_left(self._keys, prefix + _END, lo), lo + MAX_SCAN)
+        # A game can own several keys in the range, so over-fetch before deduping
+        positions = heapq.nsmallest(k * 4, range(lo, hi), key=self._scores.__getitem__)
+        ids = list(dict.fromkeys(self._ids[i] for i in positions))
+        return self._rank(ids)[:k]
+
+    def suggest(self, query: str, limit: int = 8) -> list[Suggestion]:
+        prefix = normalize_for_match(query)
+        if not prefix:
+            return []
+        if len(prefix) <= PRECOMPUTED_PREFIX_LEN:
+            ids = self._top.get(prefix, [])
+        else:
+            ids = self._scan(prefix, limit)
+        return [self._games[i] for i in ids[:limit]]
+
+    def _update_top(self, igdb_id: int, old_keys: set[str], new_keys: set[str], demoted: bool) -> None:
+        """Fix the precomputed lists after one game's keys or rating changed."""
+        new_prefixes = _short_prefixes(new_keys)
+        for prefix in _short_prefixes(old_keys) | new_prefixes:
+            current = self._top.get(prefix, [])
+            top = [i for i in current if i != igdb_id]
+            was_listed = len(top) != len(current)
+            if prefix in new_prefixes:
+                top.append(igdb_id)
+            if was_listed and (demoted or prefix not in new_prefixes):
+                # The freed slot may belong to a game outside the list: rescan
+                top = self._scan(prefix)
+            ranked = heapq.nsmallest(TOP_K, top, key=self._rank_key)
+            if ranked:
+                self._top[prefix] = ranked
+            else:
+                self._top.pop(prefix, None)
+
+    def _positions(self, igdb_id: int, keys: set[str]) -> list[int]:
+        """Where `igdb_id`'s entries for `keys` sit in the key arrays."""
+        positions = []
+        for key in keys:
+            i = bisect.bisect_left(self._keys, key)
+            while i < len(self._keys) and self._keys[i] == key:
+                if self._ids[i] == igdb_id:
+                    positions.append(i)
+                    break
+                i += 1
+        return positions
+
+    def _splice(self, removed: list[int], added: list[tuple[str, int, int]]) -> None:
+        """Drop the entries at `removed` and merge in `added` (key, igdb_id, score).
+
+        Batches are merged in one pass of slice copies over the arrays, rather
+        than a list.insert or del (each shifting the whole tail) per key.
+        """
+        edits = [(i, 1, None) for i in removed]
+        edits += [(bisect.bisect_left(self._keys, entry[0]), 0, entry) for entry in sorted(added)]
+        # At one position, insertions (0) go before a removal (1) and keep key order
+        edits.sort(key=lambda edit: edit[:2])
+        if len(edits) <= SPLICE_IN_PLACE_MAX:
+            # Back to front, so positions still ahead stay valid
+            for i, is_removal, entry in reversed(edits):
+                if is_removal:
+                    del self._keys[i]
+                    del self._ids[i]
+                    del self._scores[i]
+                else:
+                    self._keys.insert(i, entry[0])
+                    self._ids.insert(i, entry[1])
+                    self._scores.insert(i, entry[2])
+            return
+
+        keys, ids, scores = [], array("i"), array("i")
+        start = 0
+        for i, is_removal, entry in edits:
+            keys += self._keys[start:i]
+            ids += self._ids[start:i]
+            scores += self._scores[start:i]
+            if is_removal:
+                start = i + 1
+            else:
+                start = i
+                keys.append(entry[0])
+                ids.append(entry[1])
+                scores.append(entry[2])
+        keys += self._keys[start:]
+        ids += self._ids[start:]
+        scores += self._scores[start:]
+        self._keys, self._ids, self._scores = keys, ids, scores
+
+    def remove(self, igdb_id: int) -> None:
+        keys = self._game_keys.pop(igdb_id, None)
+        if keys is None:
+            return
+        self._splice(self._positions(igdb_id, keys), [])
+        del self._games[igdb_id]
+        self._update_top(igdb_id, keys, set(), demoted=True)
+
+    def upsert(self, igdb_id: int, name: str, slug: str | None, cover_image: str | None,
+               total_rating_count: int | None, alt_names_search: str | None) -> None:
+        self.upsert_many([(igdb_id, name, slug, cover_image, total_rating_count, alt_names_search)])
+
+    def upsert_many(self, games) -> None:
+        """Add or update (igdb_id, name, slug, cover_image, total_rating_count, alt_names_search)
+        games, merging all their keys into the arrays at once."""
+        changed = []
+        for igdb_id, name, slug, cover_image, total_rating_count, alt_names_search in games:
+            if not name:
+                continue
+            old = self._games.get(igdb_id)
+            old_keys = self._game_keys.get(igdb_id, set())
+            keys = game_keys(name, alt_names_search)
+            suggestion = Suggestion(igdb_id, name, slug, cover_image, total_rating_count or 0)
+            if keys == old_keys and old == suggestion:
+                continue
+            removed = self._positions(igdb_id, old_keys)
+            changed.append((igdb_id, old, old_keys, keys, suggestion, removed))
+            self._games[igdb_id] = suggestion
+            self._game_keys[igdb_id] = keys
+        if not changed:
+            return
+
+        # A game repeated in the batch: only its last version's keys go in
+        latest = {igdb_id: suggestion for igdb_id, *_, suggestion, _ in changed}
+        removed = sorted({i for *_, positions in changed for i in positions})
+        added = {
+            (key, igdb_id, -suggestion.total_rating_count)
+            for igdb_id, suggestion in latest.items()
+            for key in self._game_keys[igdb_id]
+        }
+        self._splice(removed, list(added))
+        for igdb_id, old, old_keys, keys, suggestion, _ in changed:
+            demoted = old is not None and suggestion.total_rating_count < old.total_rating_count
+            self._update_top(igdb_id, old_keys, keys, demoted)
+
+
+_index = SuggestIndex()
+_loaded_at: float | None = None
+# Guards _index, _loaded_at and _pending: writers include threadpool threads
+_lock = threading.Lock()
+# Writes that land while a background rebuild is reading the table; replayed
+# onto the new index before it replaces the old one.
+_pending: list[tuple] | None = None
+
+
+def _load_rows(db: Session):
+    return db.execute(
+        select(
+            game.Game.igdb_id,
+            game.Game.name,
+            game.Game.slug,
+            game.Game.cover_image,
+            game.Game.total_rating_count,
+            game.Game.alt_names_search,
+        ).where(game.Game.is_deleted.is_(False))
+    ).all()
+
+
+def _install(index: SuggestIndex, started: float) -> int:
+    """Swap in a built index; call with _lock held."""
+    global _index, _loaded_at
+    _index = index
+    _loaded_at = time.monotonic()
+    logger.info(f"[Suggest] Indexed {len(index)} games in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return len(index)
+
+
+def load_from_db(db: Session) -> int:
+    """(Re)build the index from the games table; returns the number of games."""
+    started = time.perf_counter()
+    index = SuggestIndex.build(_load_rows(db))
+    with _lock:
+        return _install(index, started)
+
+
+def _build_from_new_session() -> SuggestIndex:
+    from ...db_setup import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return SuggestIndex.build(_load_rows(db))
+    finally:
+        db.close()
+
+
+async def keep_fresh() -> None:
+    """Load the index, then rebuild it every REBUILD_INTERVAL_SECONDS.
+
+    Runs for the app's lifetime. Rebuilding picks up writes made by other API
+    workers; the table is read in a thread so requests keep being served.
+    """
+    global _pending
+    while True:
+        started = time.perf_counter()
+        with _lock:
+            _pending = []
+        try:
+            index = await asyncio.to_thread(_build_from_new_session)
+            with _lock:
+                for op, args in _pending:
+                    getattr(index, op)(*args)
+                _install(index, started)
+        except Exception as e:
+            logger.error(f"[Suggest] Failed to build the suggest index: {e}")
+        finally:
+            with _lock:
+                _pending = None
+        await asyncio.sleep(REBUILD_INTERVAL_SECONDS)
+
+
+def _apply(op: str, *args) -> None:
+    with _lock:
+        if _pending is not None:
+            _pending.append((op, args))
+        if _loaded_at is None:
+            return
+        try:
+            getattr(_index, op)(*args)
+        except Exception as e:
+            # The next rebuild repairs anything missed here; never fail a write for it
+            logger.warning(f"[Suggest] Failed to {op} game: {e}")
+
+
+def suggest(query: str, limit: int = 8) -> list[Suggestion]:
+    """Up to `limit` (at most TOP_K) games whose name or alternative name starts with `query`."""
+    with _lock:
+        return _index.suggest(query, min(limit, TOP_K))
+
+
+def index_game(db_game: game.Game) -> None:
+    """Add, update or (if deleted) drop one stored game."""
+    if db_game.is_deleted:
+        _apply("remove", db_game.igdb_id)
+    else:
+        _apply(
+            "upsert", db_game.igdb_id, db_game.name, db_game.slug, db_game.cover_image,
+            db_game.total_rating_count, db_game.alt_names_search,
+        )
+
+
+def index_rows(rows: list[dict]) -> None:
+    """Add or update games from bulk-upsert rows (dicts with igdb_id, name, ...)."""
+    _apply("upsert_many", [
+        (
+            row["igdb_id"], row.get("name"), row.get("slug"), row.get("cover_image"),
+            row.get("total_rating_count"), row.get("alt_names_search"),
+        )
+        for row in rows
+    ])
+
+
+def stats() -> dict:
+    """Games and keys indexed, and seconds since the last full load."""
+    with _lock:
+        return {
+            "games": len(_index),
+            "keys": len(_index._keys),
+            "age_seconds": None if _loaded_at is None else round(time.monotonic() - _loaded_at),
+        }
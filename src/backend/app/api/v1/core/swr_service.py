@@ -6,7 +6,8 @@ from sqlalchemy.orm import Session
 import logging
 
 from ..models import game
-from .igdb_service import fetch_from_igdb_async, process_igdb_data, meets_quality_requirements
+from .igdb_service import process_igdb_data, meets_quality_requirements
+from .igdb_loader import load_game
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +22,12 @@ def is_stale(db_game: game.Game, max_age_hours: int = 24) -> bool:
     Returns:
         True if the game data is stale and should be refreshed
     """
-    if not db_game or not db_game.updated_at:
+    # A refresh that found nothing new only bumps checked_at, so count that too
+    last_checked = db_game.last_checked_at if db_game else None
+    if not last_checked:
         return True
     
-    age = datetime.now(UTC) - db_game.updated_at.replace(tzinfo=UTC)
+    age = datetime.now(UTC) - last_checked.replace(tzinfo=UTC)
     return age.total_seconds() > (max_age_hours * 3600)
 
 
@@ -49,28 +52,20 @@ async def refresh_game_async(igdb_id: int) -> bool:
     try:
         logger.info(f"[SWR] Background refresh starting for IGDB ID: {igdb_id}")
         
-        # Fetch fresh data from IGDB
-        igdb_data = await fetch_from_igdb_async(game_id=igdb_id)
+        # Fetch fresh data from IGDB (coalesced with other refreshes in flight)
+        igdb_data = await load_game(igdb_id)
         if not igdb_data:
             logger.warning(f"[SWR] No data returned from IGDB for game {igdb_id}")
             return False
         
-        # Handle list response
-        if isinstance(igdb_data, list):
-            igdb_data = igdb_data[0] if igdb_data else None
-        
-        if not igdb_data:
-            return False
-        
         # Process the data
         processed_data = process_igdb_data(igdb_data)
         
         # Find and update the existing game
         existing_game = get_game_by_igdb_id(db, igdb_id)
         if existing_game:
+            # update_game skips the write (touching only checked_at) if nothing changed
             update_game(db, existing_game.id, processed_data)
-            existing_game.updated_at = datetime.now(UTC)
-            db.commit()
             logger.info(f"[SWR] Successfully refreshed: {processed_data.name} (IGDB: {igdb_id})")
         else:
             if meets_quality_requirements(processed_data):
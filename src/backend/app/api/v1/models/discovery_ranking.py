@@ -0,0 +1,41 @@
+# models/discovery_ranking.py
+"""
+Precomputed homepage discovery lists (trending, anticipated, highly rated,
+latest): one row per (list, position) pointing at a game.
+
+The lists are ranked over the whole games table by
+discovery_service.refresh_discovery_rankings, which the scheduler runs after
+each featured-games sync. Reading a list is then a primary-key range scan plus
+a join on games.id, however large the table grows.
+
+discovery_lists records when each list was last ranked, so a list that ranked
+to no games is told apart from one that has never been ranked.
+"""
+from datetime import datetime
+from sqlalchemy import Integer, String, ForeignKey, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from ...db_setup import Base
+
+
+class DiscoveryRanking(Base):
+    __tablename__ = "discovery_rankings"
+
+    list_name: Mapped[str] = mapped_column(String(20), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    game_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False
+    )
+
+    def __repr__(self):
+        return f"<DiscoveryRanking(list_name={self.list_name}, position={self.position}, game_id={self.game_id})>"
+
+
+class DiscoveryList(Base):
+    __tablename__ = "discovery_lists"
+
+    list_name: Mapped[str] = mapped_column(String(20), primary_key=True)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    ranked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<DiscoveryList(list_name={self.list_name}, size={self.size}, ranked_at={self.ranked_at})>"
@@ -1,10 +1,46 @@
 # models/game.py
 from datetime import datetime, UTC
-from sqlalchemy import Integer, String, Float, JSON, DateTime, Boolean
+from sqlalchemy import Integer, String, Float, JSON, DateTime, Boolean, DDL, event
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column
 from ...db_setup import Base
 import sqlalchemy as sa
 
+# Bayesian average behind the "rating" sort: minimum ratings and baseline
+WEIGHTED_MIN_RATINGS = 50
+WEIGHTED_BASELINE = 7.0
+
+
+def blend_overall_rating(total_rating, total_count, community_rating, community_count) -> float | None:
+    """Vote-weighted blend (0-100) of every available rating source.
+
+    Each source contributes its rating weighted by its vote count, so a game with
+    thousands of IGDB votes barely shifts from a few GameGloom reviews, while a
+    niche game leans more on its community ratings. More sources (e.g. Steam) drop
+    in as extra (rating, count) terms. Returns None when nothing has any votes.
+    """
+    sources = [
+        (total_rating, total_count or 0),
+        (community_rating, community_count or 0),
+    ]
+    weighted = [(r, c) for r, c in sources if r is not None and c > 0]
+    if not weighted:
+        return next((r for r, _ in sources if r is not None), None)
+    total = sum(r * c for r, c in weighted)
+    count = sum(c for _, c in weighted)
+    return total / count
+
+
+def weighted_score(rating: float | None, rating_count: int | None) -> float | None:
+    """IMDB-style weighted rating: WR = (v * R + m * C) / (v + m), where R is the
+    game's rating, v its vote count, m = WEIGHTED_MIN_RATINGS and C =
+    WEIGHTED_BASELINE. None for games without votes."""
+    if rating is None or not rating_count:
+        return None
+    m = WEIGHTED_MIN_RATINGS
+    return (rating_count * rating + m * WEIGHTED_BASELINE) / (rating_count + m)
+
+
 class Game(Base):
     __tablename__ = "games"
 
@@ -25,6 +61,15 @@ class Game(Base):
     # total_rating so IGDB re-syncs never wipe it. Derived from the reviews table.
     community_rating: Mapped[float | None] = mapped_column(Float, nullable=True)
     community_rating_count: Mapped[int | None] = mapped_column(Integer, nullable=True, default=0)
+    # Derived from the rating columns above on every write (refresh_rating_scores,
+    # rating_score_expressions), so reads and sorts don't recompute them per row.
+    # overall_rating: blend_overall_rating of IGDB + community; weighted_score:
+    # weighted_score of IGDB's rating, the "rating" sort of /all-games.
+    overall_rating: Mapped[float | None] = mapped_column(Float, nullable=True)
+    overall_rating_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0", index=True
+    )
+    weighted_score: Mapped[float | None] = mapped_column(Float, nullable=True)
     hypes: Mapped[int | None] = mapped_column(Integer, nullable=True)
     
     genres: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -128,11 +173,132 @@ class Game(Base):
     # Time to beat data
     time_to_beat: Mapped[dict | None] = mapped_column(JSON, nullable=True, comment="Time to beat data (hastily, normally, completely)")
     
-    raw_data: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # Store full IGDB response
-    
+    # The full IGDB response lives in game_raw_data (compressed, loaded on demand)
+
+    # SHA-256 of the last processed IGDB payload. A refresh with the same hash only
+    # bumps checked_at, so unchanged games don't rewrite the row or bump updated_at.
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    checked_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC))
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
     is_deleted: Mapped[bool] = mapped_column(sa.Boolean, default=False, nullable=False, server_default=sa.text('false'))
 
+    @hybrid_property
+    def last_checked_at(self) -> datetime | None:
+        """When IGDB was last consulted for this game, whether or not anything changed."""
+        return self.checked_at or self.updated_at
+
+    @last_checked_at.expression
+    def last_checked_at(cls):
+        return sa.func.coalesce(cls.checked_at, cls.updated_at)
+
+    def refresh_rating_scores(self) -> None:
+        """Recompute overall_rating(_count) and weighted_score from the rating columns."""
+        self.overall_rating = blend_overall_rating(
+            self.total_rating, self.total_rating_count,
+            self.community_rating, self.community_rating_count,
+        )
+        self.overall_rating_count = (self.total_rating_count or 0) + (self.community_rating_count or 0)
+        self.weighted_score = weighted_score(self.rating, self.total_rating_count)
+
     def __repr__(self):
         return f"<Game(id={self.id}, name={self.name}, rating={self.rating})>"
+
+
+def _refresh_rating_scores(mapper, connection, target: Game) -> None:
+    target.refresh_rating_scores()
+
+
+# ORM writes (create/update_game, review changes, scripts) keep the derived
+# columns current here; Core writes such as the bulk upsert use
+# rating_score_expressions instead.
+event.listen(Game, "before_insert", _refresh_rating_scores)
+event.listen(Game, "before_update", _refresh_rating_scores)
+
+
+def rating_score_expressions() -> dict:
+    """SQL for the derived rating columns, as UPDATE ... SET values: the same
+    formulas as Game.refresh_rating_scores, evaluated over each row."""
+    def votes(rating, count):
+        return sa.case((sa.and_(rating.is_not(None), count > 0), count), else_=0)
+
+    igdb_votes = votes(Game.total_rating, Game.total_rating_count)
+    community_votes = votes(Game.community_rating, Game.community_rating_count)
+    all_votes = igdb_votes + community_votes
+    blended = (
+        sa.func.coalesce(Game.total_rating * igdb_votes, 0)
+        + sa.func.coalesce(Game.community_rating * community_votes, 0)
+    ) / all_votes
+    m = WEIGHTED_MIN_RATINGS
+    return {
+        "overall_rating": sa.case(
+            (all_votes > 0, blended), else_=sa.func.coalesce(Game.total_rating, Game.community_rating)
+        ),
+        "overall_rating_count": (
+            sa.func.coalesce(Game.total_rating_count, 0) + sa.func.coalesce(Game.community_rating_count, 0)
+        ),
+        "weighted_score": sa.case(
+            (
+                sa.and_(Game.rating.is_not(None), Game.total_rating_count > 0),
+                (Game.total_rating_count * Game.rating + m * WEIGHTED_BASELINE) / (Game.total_rating_count + m),
+            ),
+            else_=None,
+        ),
+    }
+
+
+# Sort indexes for /all-games' rating orders. On Postgres they match the ORDER BY
+# pagination renders (score DESC NULLS LAST, id), so pages are read off the index
+# in order; SQLite can't declare NULLS LAST and gets plain ones.
+for _column in (Game.weighted_score, Game.overall_rating):
+    sa.Index(f"ix_games_{_column.key}", _column.desc().nulls_last(), Game.id).ddl_if(dialect="postgresql")
+    sa.Index(f"ix_games_{_column.key}", _column, Game.id).ddl_if(
+        callable_=lambda ddl, target, bind, **kw: bind.dialect.name != "postgresql"
+    )
+
+
+# Weighted full-text search vector: name (A) > alternative names (B) >
+# developers/keywords (C) > summary/storyline (D). Postgres keeps it current as a
+# generated column on every insert/update path (ORM, bulk upsert, raw SQL) and
+# search_service queries it through the GIN index. It is deliberately not mapped:
+# SQLite has no tsvector, so the tests and local dev use the ILIKE fallback.
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(replace(alt_names_search, '|', ' '), '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(developers, '') || ' ' || coalesce(keywords::text, '')), 'C') ||
+    setweight(to_tsvector('english', coalesce(summary, '') || ' ' || coalesce(storyline, '')), 'D')
+"""
+
+event.listen(
+    Game.__table__,
+    "after_create",
+    DDL(
+        f"ALTER TABLE games ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Game.__table__,
+    "after_create",
+    DDL("CREATE INDEX ix_games_search_vector ON games USING GIN (search_vector)").execute_if(dialect="postgresql"),
+)
+
+# Trigram indexes behind the typo-tolerant name search (search_service.fuzzy_search_games).
+event.listen(
+    Game.__table__,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Game.__table__,
+    "after_create",
+    DDL("CREATE INDEX ix_games_name_trgm ON games USING GIN (name gin_trgm_ops)").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Game.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_games_alt_names_search_trgm ON games USING GIN (alt_names_search gin_trgm_ops)"
+    ).execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,31 @@
+# models/game_facet.py
+"""
+A game's genres, themes, platforms, game modes and player perspectives, one
+row per (game, kind, slug).
+
+games keeps them as comma-joined display strings; this table is what filters
+and counts query, so "genre = shooter" is an exact, indexed lookup rather
+than an ILIKE scan over those strings. Rows are written alongside the game by
+the game_service write paths (see core/facets.py).
+"""
+from sqlalchemy import Index, Integer, String, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from ...db_setup import Base
+
+
+class GameFacet(Base):
+    __tablename__ = "game_facets"
+
+    game_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("games.id", ondelete="CASCADE"), primary_key=True
+    )
+    kind: Mapped[str] = mapped_column(String(20), primary_key=True)
+    slug: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    __table_args__ = (
+        # Lookups go kind + slug -> game ids; the primary key serves per-game writes
+        Index("ix_game_facets_kind_slug", "kind", "slug", "game_id"),
+    )
+
+    def __repr__(self):
+        return f"<GameFacet(game_id={self.game_id}, kind={self.kind}, slug={self.slug})>"
@@ -0,0 +1,25 @@
+# models/game_raw_data.py
+"""
+Full IGDB response for a game, stored out of line as gzip-compressed JSON.
+
+Kept off the games table so list and detail queries never read it. Only the
+raw-data accessor in game_service loads it.
+"""
+from datetime import datetime, UTC
+from sqlalchemy import Integer, String, DateTime, LargeBinary, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from ...db_setup import Base
+
+
+class GameRawData(Base):
+    __tablename__ = "game_raw_data"
+
+    game_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("games.id", ondelete="CASCADE"), primary_key=True
+    )
+    encoding: Mapped[str] = mapped_column(String(10), nullable=False, default="gzip")
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
+
+    def __repr__(self):
+        return f"<GameRawData(game_id={self.game_id}, bytes={len(self.data or b'')})>"
@@ -1,13 +1,18 @@
 # endpoints/games.py
 from datetime import datetime, timedelta
+from functools import partial
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-import asyncio
 import logging
+import secrets
 
 from ..models import game
-from ..core import services, schemas, cache
+from ..core import (
+    services, schemas, cache, singleflight, facet_index, facets, pagination, negative_cache,
+    http_cache, compression,
+)
 from ...db_setup import get_db
 from ...settings import settings
 
@@ -15,17 +20,67 @@ router = APIRouter(tags=["games"])
 
 logger = logging.getLogger(__name__)
 
+@router.get("/games/browse", response_model=schemas.BrowseResults)
+async def browse_games(
+    db: Session = Depends(get_db),
+    genre: str = None,
+    theme: str = None,
+    platform: str = None,
+    game_mode: str = None,
+    player_perspective: str = None,
+    year_from: int = None,
+    year_to: int = None,
+    min_rating: int = None,
+    sort: str = "rating",
+    limit: int = 50,
+    offset: int = 0
+):
+    """Browse games by any combination of facets, served from the in-memory facet index.
+    
+    Parameters:
+    - genre, theme, platform, game_mode, player_perspective: comma-separated slugs;
+      values of one kind are OR-ed, kinds are AND-ed
+    - year_from, year_to: release year range (inclusive)
+    - min_rating: minimum IGDB total rating (0-100)
+    - sort: "rating", "name", "release_new", "release_old" (default: rating)
+    
+    Also returns facet counts: for each value, how many games the other active
+    filters plus that value would match. 503 while the index loads at startup.
+    """
+    filters = {
+        kind: [facets.canonical_slug(kind, slug) for slug in value.split(",") if slug.strip()]
+        for kind, value in {
+            "genre": genre, "theme": theme, "platform": platform,
+            "game_mode": game_mode, "player_perspective": player_perspective,
+        }.items()
+        if value
+    }
+    if not facet_index.is_loaded():
+        # Building it here would block every request; keep_fresh is loading it
+        raise HTTPException(
+            status_code=503, detail="Browse is starting up, try again shortly", headers={"Retry-After": "5"}
+        )
+    igdb_ids, total, counts = facet_index.browse(
+        filters, year_from=year_from, year_to=year_to, min_rating=min_rating,
+        sort=sort, limit=limit, offset=offset,
+    )
+    return {"results": services.get_game_cards_by_igdb_ids(db, igdb_ids), "total": total, "facets": counts}
+
+
 @router.get("/games/count")
 async def get_games_count(
     db: Session = Depends(get_db),
     genre: str = None,
-    theme: str = None
+    theme: str = None,
+    platform: str = None
 ):
-    """Get total count of games for a genre or theme."""
+    """Get total count of games for a genre, theme or platform."""
     if genre:
         return {"total": services.count_games_by_genre(db, genre)}
     if theme:
         return {"total": services.count_games_by_theme(db, theme)}
+    if platform:
+        return {"total": services.count_games_by_platform(db, platform)}
     return {"total": 0}
 
 
@@ -35,61 +90,168 @@ async def get_all_games_count(db: Session = Depends(get_db)):
     return {"total": services.get_all_games_count(db)}
 
 
-@router.get("/all-games", response_model=List[schemas.Game])
+def _cached_body_response(request: Request, body: cache.CachedBody) -> Response:
+    """Send a cached body as is, precompressed if the client accepts it, with its
+    ETag, or an empty 304 if the client already has it."""
+    encoding = None
+    if len(body.content) >= settings.COMPRESSION_MINIMUM_SIZE:
+        encoding = compression.negotiate(request.headers.get("accept-encoding", ""))
+    # Compressed bytes differ from the plain ones: weak ETag, as CompressionMiddleware sends
+    etag = f"W/{body.etag}" if encoding else body.etag
+    headers = {**http_cache.validator_headers(etag), "Vary": "Accept-Encoding"}
+    if http_cache.is_not_modified(request, body.etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        return Response(body.encoded(encoding), media_type="application/json", headers=headers)
+    return Response(body.content, media_type="application/json", headers=headers)
+
+
+def _with_next_cursor(response: Response, page):
+    """Return a page's items, passing its next_cursor in the X-Next-Cursor header."""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page
+
+
+@router.get("/all-games", response_model=List[schemas.GameCard])
 async def get_all_games(
+    response: Response,
     db: Session = Depends(get_db),
     limit: int = 50,
     offset: int = 0,
-    sort: str = "rating"
+    sort: str = "rating",
+    cursor: str | None = None
 ):
     """Get all games with pagination and sorting.
     
     Parameters:
     - limit: Maximum number of games to return (default: 50)
     - offset: Number of games to skip for pagination (default: 0)
-    - sort: Sort order - "rating", "name", "release_new", "release_old" (default: rating)
+    - sort: Sort order - "rating", "overall_rating", "name", "release_new", "release_old" (default: rating)
+    - cursor: X-Next-Cursor header of the previous page (same sort); cheaper than offset on deep pages
     """
-    return services.get_all_games(db, limit, offset, sort)
+    return _with_next_cursor(response, services.get_all_games(db, limit, offset, sort, cursor))
 
 
 @router.get("/search/count")
 async def get_search_count(
     query: str,
     category: str = "all",
+    fuzzy: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get total count of search results."""
-    return {"total": services.count_search_results(db, query, category)}
+    """Get total count of search results (capped for fuzzy matches, which /search
+    falls back to when nothing matches exactly)."""
+    name_search = category.lower() in ("all", "games")
+    total = 0 if fuzzy and name_search else services.count_search_results(db, query, category)
+    if total == 0 and name_search:
+        total = len(services.fuzzy_search_games(db, query, limit=services.FUZZY_MAX_RESULTS))
+    return {"total": total}
+
+
+@router.get("/search/suggest", response_model=List[schemas.GameSuggestion])
+async def suggest_games(query: str, limit: int = 8):
+    """Typeahead suggestions: games whose name or alternative name starts with the query,
+    most-rated first. Answered from the in-memory prefix index, not the database
+    (empty until the index has loaded at startup)."""
+    return [suggestion._asdict() for suggestion in services.suggest_games(query, limit=limit)]
+
+
+async def _with_own_session(fn):
+    """Run a `fn(db)` coroutine on a session of its own.
+
+    For work shared through single-flight or the discovery cache: it runs
+    shielded and can outlive the request that started it, whose session
+    get_db closes once that request is gone.
+    """
+    from ...db_setup import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return await fn(db)
+    finally:
+        db.close()
+
+
+async def _fetch_and_store_game(db: Session, igdb_id: int | None = None, slug: str | None = None) -> int:
+    """Fetch a game that is missing from the DB, store it, and return its IGDB ID.
+
+    Runs under single-flight, so concurrent misses for the same game share one
+    IGDB call and one insert. Re-checks the DB first in case another worker
+    stored the game while we waited on its lock.
+    """
+    if igdb_id is not None:
+        existing = services.get_game_by_igdb_id(db, igdb_id)
+    else:
+        existing = services.get_game_by_slug(db, slug)
+    if existing:
+        return existing.igdb_id
+
+    # Misses are remembered so repeat requests (often crawlers) skip IGDB
+    identifier = str(igdb_id) if igdb_id is not None else slug
+    if igdb_id is not None:
+        igdb_data = await services.load_game(igdb_id)
+        if not igdb_data:
+            await negative_cache.remember("game", identifier)
+            raise HTTPException(status_code=404, detail=f"Game with ID {igdb_id} not found")
+    else:
+        search_query = f"{services.IGDB_GAME_FIELDS} where slug = \"{slug}\"; limit 1;"
+        search_results = await services.fetch_from_igdb_async(query=search_query)
+        if not search_results:
+            await negative_cache.remember("game", identifier)
+            raise HTTPException(status_code=404, detail=f"Game with slug '{slug}' not found")
+        igdb_data = search_results[0]
+
+    game_data = services.process_igdb_data(igdb_data)
+
+    # Only store games that meet quality requirements
+    if not services.meets_quality_requirements(game_data):
+        await negative_cache.remember("game", identifier)
+        raise HTTPException(
+            status_code=404,
+            detail=f"Game doesn't meet quality requirements (missing cover or description)"
+        )
+
+    try:
+        db_game = services.create_game(db, game_data)
+    except IntegrityError:
+        # Lost an insert race the lock didn't cover (e.g. an ID and a slug miss for the same game)
+        db.rollback()
+        db_game = services.get_game_by_igdb_id(db, game_data.igdb_id)
+        if not db_game:
+            raise
+    return db_game.igdb_id
 
 
 @router.get("/games/{identifier}", response_model=schemas.Game)
-async def get_game(identifier: str, db: Session = Depends(get_db)):
+async def get_game(identifier: str, request: Request, response: Response, db: Session = Depends(get_db)):
     """Get game details by IGDB ID or slug.
     
     Uses Stale-While-Revalidate (SWR) pattern:
     - Returns cached data immediately
     - If data is stale (>24h old), triggers background refresh
-    - If game not in DB, fetches from IGDB and stores
+    - If game not in DB, fetches from IGDB and stores (unless IGDB recently had nothing for it)
+    
+    Conditional: ETag and Last-Modified follow the game's updated_at, and a
+    matching If-None-Match / If-Modified-Since gets an empty 304.
     """
     db_game = None
+    fetched = False
     
     if identifier.isdigit():
         igdb_id = int(identifier)
         db_game = services.get_game_by_igdb_id(db, igdb_id)
         
         if not db_game:
+            if await negative_cache.contains("game", identifier):
+                raise HTTPException(status_code=404, detail=f"Game with ID {igdb_id} not found")
             try:
-                igdb_data = await services.fetch_from_igdb_async(game_id=igdb_id)
-                game_data = services.process_igdb_data(igdb_data)
-                
-                # Only store games that meet quality requirements
-                if services.meets_quality_requirements(game_data):
-                    db_game = services.create_game(db, game_data)
-                else:
-                    raise HTTPException(
-                        status_code=404, 
-                        detail=f"Game doesn't meet quality requirements (missing cover or description)"
-                    )
+                stored_id = await singleflight.do(
+                    f"game:igdb:{igdb_id}", lambda: _with_own_session(partial(_fetch_and_store_game, igdb_id=igdb_id))
+                )
+                db_game = services.get_game_by_igdb_id(db, stored_id)
+                fetched = True
             except HTTPException:
                 raise
             except Exception:
@@ -100,23 +262,14 @@ async def get_game(identifier: str, db: Session = Depends(get_db)):
         db_game = services.get_game_by_slug(db, slug)
         
         if not db_game:
+            if await negative_cache.contains("game", slug):
+                raise HTTPException(status_code=404, detail=f"Game with slug '{slug}' not found")
             try:
-                search_query = f"{services.IGDB_GAME_FIELDS} where slug = \"{slug}\"; limit 1;"
-                search_results = await services.fetch_from_igdb_async(query=search_query)
-                
-                if search_results and len(search_results) > 0:
-                    game_data = services.process_igdb_data(search_results[0])
-                    
-                    # Only store games that meet quality requirements
-                    if services.meets_quality_requirements(game_data):
-                        db_game = services.create_game(db, game_data)
-                    else:
-                        raise HTTPException(
-                            status_code=404, 
-                            detail=f"Game doesn't meet quality requirements (missing cover or description)"
-                        )
-                else:
-                    raise HTTPException(status_code=404, detail=f"Game with slug '{slug}' not found")
+                stored_id = await singleflight.do(
+                    f"game:slug:{slug}", lambda: _with_own_session(partial(_fetch_and_store_game, slug=slug))
+                )
+                db_game = services.get_game_by_igdb_id(db, stored_id)
+                fetched = True
             except HTTPException:
                 raise
             except Exception as e:
@@ -127,55 +280,48 @@ async def get_game(identifier: str, db: Session = Depends(get_db)):
     
     # SWR Pattern: Check if game data is stale and needs background refresh
     if db_game and services.is_stale(db_game, max_age_hours=24):
-        logger.info(f"[SWR] Game {db_game.name} is stale, triggering background refresh")
-        try:
-            # Trigger background refresh - doesn't block the response
-            # Note: refresh_game_async creates its own DB session
-            asyncio.create_task(services.refresh_game_async(db_game.igdb_id))
-        except Exception as e:
-            logger.error(f"[SWR] Error starting background refresh: {str(e)}")
+        # Queued on the refresh coordinator, which collapses repeat views into one
+        # refresh (plus similar games, related types, editions and time to beat)
+        # on its own sessions; the response never waits on IGDB
+        services.schedule_refresh(db_game.igdb_id, db_game.id)
+    elif db_game and fetched and db_game.time_to_beat is None:
+        # Just stored from IGDB: pick up time to beat in the next batch
+        services.schedule_time_to_beat(db_game.igdb_id, db_game.id)
+    
+    if db_game is not None:
+        etag = http_cache.etag_for("game", db_game.id, db_game.updated_at)
+        not_modified = http_cache.conditional(request, response, etag, db_game.updated_at)
+        if not_modified:
+            return not_modified
+    return db_game
 
 
+@router.get("/games/{igdb_id}/raw-data")
+async def get_game_raw_data(
+    igdb_id: int,
+    x_admin_key: str = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Admin-only: the full IGDB response stored for a game.
 
-    
-    # Also refresh related data if stale
-    if db_game and services.is_stale(db_game, max_age_hours=24):
-        # Sync similar games in background
-        if db_game.similar_games:
-            try:
-                asyncio.create_task(services.sync_similar_games(db, db_game.id))
-            except Exception as e:
-                logger.error(f"Error starting similar games sync: {str(e)}")
-        
-        # Fetch related game types in background
-        try:
-            asyncio.create_task(services.fetch_related_game_types(db, db_game.id))
-        except Exception as e:
-            logger.error(f"Error starting related game types fetch: {str(e)}")
-        
-        # Fetch editions and bundles in background
-        try:
-            asyncio.create_task(services.fetch_game_editions_and_bundles(db, db_game.id))
-        except Exception as e:
-            logger.error(f"Error starting editions and bundles fetch: {str(e)}")
-        
-        # Fetch time to beat (this one is quick, do it synchronously)
-        try:
-            time_to_beat = await services.fetch_time_to_beat_async(db_game.igdb_id)
-            if time_to_beat:
-                db_game.time_to_beat = time_to_beat
-                db.commit()
-                db.refresh(db_game)
-        except Exception as e:
-            logger.error(f"Error fetching time to beat data: {str(e)}")
-    
-    return db_game
+    Disabled (404) unless ADMIN_API_KEY is configured.
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=403, detail="Invalid admin key")
+
+    db_game = services.get_game_by_igdb_id(db, igdb_id)
+    raw_data = services.get_game_raw_data(db, db_game.id) if db_game else None
+    if raw_data is None:
+        raise HTTPException(status_code=404, detail=f"No raw data stored for game {igdb_id}")
+    return raw_data
 
 
-@router.get("/trending-games", response_model=List[schemas.Game])
-async def get_trending_games(db: Session = Depends(get_db)):
+@router.get("/trending-games", response_model=List[schemas.GameCard])
+async def get_trending_games(request: Request):
     """Get trending games based on popularity and ratings"""
-    async def producer():
+    async def producer(db: Session):
         # First try to get recent trending games from our database
         db_games = services.get_trending_games(db)
 
@@ -189,21 +335,25 @@ async def get_trending_games(db: Session = Depends(get_db)):
             # Fetch and sync the trending games
             await services.sync_games_from_igdb(db, popularity_query)
 
-            # Get the updated trending games from the database
+            # Re-rank with the synced games, then read the list back
+            services.refresh_discovery_rankings(db, ["trending"])
             db_games = services.get_trending_games(db)
 
-        return [schemas.Game.model_validate(g).model_dump(mode="json") for g in db_games]
+        return [schemas.GameCard.model_validate(g).model_dump(mode="json") for g in db_games]
 
     try:
-        return await cache.cached_json("discovery:trending", settings.DISCOVERY_CACHE_TTL, producer)
+        body = await cache.cached_body(
+            "discovery:trending", settings.DISCOVERY_CACHE_TTL, lambda: _with_own_session(producer)
+        )
     except Exception:
         logger.exception("Error fetching trending games")
         raise HTTPException(status_code=500, detail="Failed to load trending games")
+    return _cached_body_response(request, body)
 
-@router.get("/anticipated-games", response_model=List[schemas.Game])
-async def get_anticipated_games(db: Session = Depends(get_db)):
+@router.get("/anticipated-games", response_model=List[schemas.GameCard])
+async def get_anticipated_games(request: Request):
     """Get anticipated games"""
-    async def producer():
+    async def producer(db: Session):
         # First try to get recent anticipated games from the database
         db_games = services.get_anticipated_games(db)
 
@@ -217,21 +367,25 @@ async def get_anticipated_games(db: Session = Depends(get_db)):
             # Fetch and sync the anticipated games
             await services.sync_games_from_igdb(db, query)
 
-            # Get the updated anticipated games from our database
+            # Re-rank with the synced games, then read the list back
+            services.refresh_discovery_rankings(db, ["anticipated"])
             db_games = services.get_anticipated_games(db)
 
-        return [schemas.Game.model_validate(g).model_dump(mode="json") for g in db_games]
+        return [schemas.GameCard.model_validate(g).model_dump(mode="json") for g in db_games]
 
     try:
-        return await cache.cached_json("discovery:anticipated", settings.DISCOVERY_CACHE_TTL, producer)
+        body = await cache.cached_body(
+            "discovery:anticipated", settings.DISCOVERY_CACHE_TTL, lambda: _with_own_session(producer)
+        )
     except Exception:
         logger.exception("Error fetching anticipated games")
         raise HTTPException(status_code=500, detail="Failed to load anticipated games")
+    return _cached_body_response(request, body)
 
-@router.get("/highly-rated-games", response_model=List[schemas.Game])
-async def get_highly_rated_games(db: Session = Depends(get_db)):
+@router.get("/highly-rated-games", response_model=List[schemas.GameCard])
+async def get_highly_rated_games(request: Request):
     """Get highly rated games"""
-    async def producer():
+    async def producer(db: Session):
         # First try to get recent highly rated games from our database
         db_games = services.get_highly_rated_games(db)
 
@@ -242,21 +396,25 @@ async def get_highly_rated_games(db: Session = Depends(get_db)):
             # Fetch and sync the highly rated games
             await services.sync_games_from_igdb(db, query)
 
-            # Get the updated highly rated games from our database
+            # Re-rank with the synced games, then read the list back
+            services.refresh_discovery_rankings(db, ["highly_rated"])
             db_games = services.get_highly_rated_games(db)
 
-        return [schemas.Game.model_validate(g).model_dump(mode="json") for g in db_games]
+        return [schemas.GameCard.model_validate(g).model_dump(mode="json") for g in db_games]
 
     try:
-        return await cache.cached_json("discovery:highly_rated", settings.DISCOVERY_CACHE_TTL, producer)
+        body = await cache.cached_body(
+            "discovery:highly_rated", settings.DISCOVERY_CACHE_TTL, lambda: _with_own_session(producer)
+        )
     except Exception:
         logger.exception("Error fetching highly rated games")
         raise HTTPException(status_code=500, detail="Failed to load highly rated games")
+    return _cached_body_response(request, body)
 
-@router.get("/latest-games", response_model=List[schemas.Game])
-async def get_latest_games(db: Session = Depends(get_db)):
+@router.get("/latest-games", response_model=List[schemas.GameCard])
+async def get_latest_games(request: Request):
     """Get latest released games"""
-    async def producer():
+    async def producer(db: Session):
         # First try to get recent latest games from our database
         db_games = services.get_latest_games(db)
 
@@ -270,16 +428,20 @@ async def get_latest_games(db: Session = Depends(get_db)):
             # Fetch and sync the latest games
             await services.sync_games_from_igdb(db, query)
 
-            # Get the updated latest games from our database
+            # Re-rank with the synced games, then read the list back
+            services.refresh_discovery_rankings(db, ["latest"])
             db_games = services.get_latest_games(db)
 
-        return [schemas.Game.model_validate(g).model_dump(mode="json") for g in db_games]
+        return [schemas.GameCard.model_validate(g).model_dump(mode="json") for g in db_games]
 
     try:
-        return await cache.cached_json("discovery:latest", settings.DISCOVERY_CACHE_TTL, producer)
+        body = await cache.cached_body(
+            "discovery:latest", settings.DISCOVERY_CACHE_TTL, lambda: _with_own_session(producer)
+        )
     except Exception:
         logger.exception("Error fetching latest games")
         raise HTTPException(status_code=500, detail="Failed to load latest games")
+    return _cached_body_response(request, body)
 
 @router.get("/update-similar-games")
 async def update_similar_games(db: Session = Depends(get_db)):
@@ -321,12 +483,15 @@ async def update_similar_games(db: Session = Depends(get_db)):
         logger.exception("Error updating similar games")
         raise HTTPException(status_code=500, detail="Failed to update similar games")
 
-@router.get("/search")
+@router.get("/search", response_model=List[schemas.GameCard])
 async def search_games(
+    response: Response,
     query: str, 
     category: str = "all",
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
+    fuzzy: bool = False,
     db: Session = Depends(get_db)
 ):
     """
@@ -337,49 +502,148 @@ async def search_games(
     - category: Category to search in. Options: "all", "games", "developers", "platforms"
     - limit: Maximum number of results to return (default: 50)
     - offset: Number of results to skip (default: 0)
+    - cursor: X-Next-Cursor header of the previous page, instead of offset
+    - fuzzy: Typo-tolerant game name matching, ranked by similarity ("all"/"games" only).
+      Also tried automatically when an exact search finds nothing.
     """
+    name_search = category.lower() in ("all", "games")
+    if fuzzy and name_search:
+        return services.fuzzy_search_games(db, query, limit=limit, offset=offset)
+
     # First check if we have matching games in our database
-    db_games = services.search_games_in_db(db, query, category=category, limit=limit, offset=offset)
+    db_games = services.search_games_in_db(db, query, category=category, limit=limit, offset=offset, cursor=cursor)
     
     # If we have enough results, return them immediately (fast path)
     if len(db_games) >= limit:
-        return db_games[:limit]
+        return _with_next_cursor(response, db_games)
     
     # If we have some results but they're paginated (offset > 0), just return what we have
-    if offset > 0:
+    if offset > 0 or cursor:
         return db_games
     
     # Only fetch from IGDB if we have NO results and it's a game/all search (first page only)
-    if len(db_games) == 0 and (category.lower() == "all" or category.lower() == "games"):
-        try:
-            # Escape backslashes and quotes so the search term can't break the IGDB query syntax
-            safe_query = query.replace("\\", "\\\\").replace('"', '\\"')
-            search_query = f"""
-                {services.IGDB_GAME_FIELDS}
-                search "{safe_query}";
-                where version_parent = null & cover != null;
-                limit {limit};
-            """
-
-            await services.sync_games_from_igdb(db, search_query)
+    if len(db_games) == 0 and name_search:
+        # Misspelled titles usually match a game we already have
+        db_games = services.fuzzy_search_games(db, query, limit=limit)
+        if db_games:
+            return db_games
 
+        if await _import_search_from_igdb(db, query, limit):
             # Search again after importing from IGDB
             db_games = services.search_games_in_db(db, query, category=category, limit=limit, offset=0)
-        except Exception as e:
-            logger.exception("Error fetching from IGDB during search")
     
     return db_games
 
-@router.get("/games", response_model=List[schemas.Game])
+
+async def _import_search_from_igdb(db: Session, query: str, limit: int) -> bool:
+    """Run the search against IGDB and store what it finds.
+    
+    Returns False when IGDB failed or had no storable games; the latter is
+    remembered in the negative cache, so repeating the term skips IGDB.
+    """
+    search_term = services.normalize_query(query)
+    if await negative_cache.contains("search", search_term):
+        return False
+    try:
+        # Escape backslashes and quotes so the search term can't break the IGDB query syntax
+        safe_query = query.replace("\\", "\\\\").replace('"', '\\"')
+        search_query = f"""
+            {services.IGDB_GAME_FIELDS}
+            search "{safe_query}";
+            where version_parent = null & cover != null;
+            limit {limit};
+        """
+
+        igdb_data = await services.fetch_from_igdb_async(query=search_query)
+        new_count, update_count = services.store_igdb_games(db, igdb_data)
+    except Exception:
+        logger.exception("Error fetching from IGDB during search")
+        db.rollback()
+        return False
+
+    if not (new_count or update_count):
+        await negative_cache.remember("search", search_term)
+        return False
+    return True
+
+
+SEARCH_COUNT_TTL_SECONDS = 300
+
+
+@router.get("/search/results", response_model=schemas.SearchResults)
+async def search_games_with_total(
+    query: str,
+    category: str = "all",
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+    fuzzy: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Search results, total count and next-page cursor in one response.
+    
+    Same matching as /search (including the fuzzy and IGDB fallbacks), but the
+    page and its total come from a single query instead of separate /search and
+    /search/count calls. Totals are capped at SEARCH_COUNT_CAP and cached per
+    normalized query. Pass next_cursor back as `cursor` for the following page.
+    """
+    position = pagination.decode_cursor(cursor) if cursor else {}
+    if position.get("fuzzy"):
+        # Fuzzy matches are one short ranked list, paged by offset
+        fuzzy, offset, cursor = True, position.get("offset"), None
+        if not isinstance(offset, int) or offset < 0:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    name_search = category.lower() in ("all", "games")
+    count_key = f"search:count:{category.lower()}:{services.normalize_query(query)}"
+    db_games, total, next_cursor = [], 0, None
+    if not (fuzzy and name_search):
+        cached_total = await cache.get_json(count_key)
+        db_games, total = services.search_games_page(
+            db, query, limit=limit, offset=offset, category=category, known_total=cached_total, cursor=cursor
+        )
+        next_cursor = db_games.next_cursor
+        if cached_total is None and total:
+            await cache.set_json(count_key, total, SEARCH_COUNT_TTL_SECONDS)
+
+    first_page = offset == 0 and not cursor
+    if name_search and (fuzzy or (total == 0 and first_page)):
+        matches = services.fuzzy_search_games(db, query, limit=services.FUZZY_MAX_RESULTS)
+        if not matches and not fuzzy and await _import_search_from_igdb(db, query, limit):
+            db_games, total = services.search_games_page(db, query, limit=limit, category=category)
+            next_cursor = db_games.next_cursor
+            await cache.set_json(count_key, total, SEARCH_COUNT_TTL_SECONDS)
+        else:
+            db_games, total = matches[offset:offset + limit], len(matches)
+            has_more = offset + limit < total
+            next_cursor = pagination.encode_cursor({"fuzzy": True, "offset": offset + limit}) if has_more else None
+
+    return {
+        "results": db_games,
+        "total": min(total, services.SEARCH_COUNT_CAP),
+        "total_capped": total > services.SEARCH_COUNT_CAP,
+        "next_cursor": next_cursor,
+    }
+
+@router.get("/games", response_model=List[schemas.GameCard])
 async def get_games(
+    response: Response,
     db: Session = Depends(get_db), 
     genre: str = None, 
     theme: str = None, 
+    platform: str = None,
     ids: str = None,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    cursor: str | None = None
 ):
-    """Get games with optional filtering by genre, theme, or IDs. Supports pagination."""
+    """Get games with optional filtering by genre, theme, platform, or IDs. Supports pagination.
+    
+    Genre, theme and platform are IGDB-style slugs ("shooter", "science-fiction",
+    "pc-microsoft-windows") matched exactly. Those lists also page by cursor:
+    pass the previous page's X-Next-Cursor header as `cursor`.
+    """
     if ids:
         try:
             game_ids = [int(id) for id in ids.split(",") if id.strip()]
@@ -388,11 +652,15 @@ async def get_games(
         return services.get_games_by_ids(db, game_ids)
     
     if genre:
-        db_games = services.get_games_by_genre(db, genre, limit, offset)
-        return db_games
+        db_games = services.get_games_by_genre(db, genre, limit, offset, cursor)
+        return _with_next_cursor(response, db_games)
     
     if theme:
-        db_games = services.get_games_by_theme(db, theme, limit, offset)
-        return db_games
+        db_games = services.get_games_by_theme(db, theme, limit, offset, cursor)
+        return _with_next_cursor(response, db_games)
+    
+    if platform:
+        db_games = services.get_games_by_platform(db, platform, limit, offset, cursor)
+        return _with_next_cursor(response, db_games)
     
     return services.get_recent_games(db, limit=limit)
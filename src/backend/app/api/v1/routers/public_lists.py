@@ -2,13 +2,13 @@
 Public lists router for community list browsing.
 Endpoints for discovering, viewing, and liking public game lists.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func, desc, select
 from typing import List, Optional
 from datetime import datetime, timezone
 
-from ..core import schemas
+from ..core import schemas, http_cache
 from ..models.user_list import UserList, user_list_games, ListLike
 from ..models.game import Game
 from ..models.user import User
@@ -96,6 +96,25 @@ def build_public_games_info(db: Session, user_list: UserList, limit: int = None,
     return games_info
 
 
+def list_etag(db: Session, user_list: UserList, current_user_id: Optional[int] = None) -> str:
+    """ETag for a public list response, from aggregates instead of the built response."""
+    game_count, last_added, last_game_update = db.query(
+        func.count(user_list_games.c.game_id),
+        func.max(user_list_games.c.added_at),
+        func.max(Game.updated_at),
+    ).select_from(user_list_games).join(
+        Game, Game.id == user_list_games.c.game_id
+    ).filter(user_list_games.c.user_list_id == user_list.id).one()
+    creator = db.query(User.username, User.avatar).filter(User.id == user_list.user_id).first()
+    user_liked = current_user_id is not None and db.query(ListLike.id).filter(
+        ListLike.list_id == user_list.id, ListLike.user_id == current_user_id
+    ).first() is not None
+    return http_cache.etag_for(
+        "list", user_list.id, user_list.updated_at, user_list.likes_count, game_count, last_added,
+        last_game_update, tuple(creator) if creator else None, current_user_id, user_liked,
+    )
+
+
 def build_list_public_response(
     db: Session, 
     user_list: UserList, 
@@ -236,10 +255,17 @@ async def get_featured_lists(
 @router.get("/{list_id}", response_model=schemas.UserListPublic)
 async def get_public_list(
     list_id: int,
+    request: Request,
+    response: Response,
     current_user: Optional[User] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
 ):
-    """Get a single public list by ID."""
+    """Get a single public list by ID.
+    
+    Conditional: the ETag covers the list row, its games (membership and
+    their updated_at), the creator and the viewer's like, so an unchanged
+    list gets an empty 304. Anonymous responses are publicly cacheable.
+    """
     user_list = db.query(UserList).filter(
         and_(
             UserList.id == list_id,
@@ -254,6 +280,14 @@ async def get_public_list(
         )
     
     current_user_id = current_user.id if current_user else None
+    etag = list_etag(db, user_list, current_user_id)
+    not_modified = http_cache.conditional(
+        request, response, etag,
+        cache_control=http_cache.PRIVATE_CACHE_CONTROL if current_user_id else http_cache.PUBLIC_CACHE_CONTROL,
+        vary="Cookie, Authorization",
+    )
+    if not_modified:
+        return not_modified
     return build_list_public_response(db, user_list, current_user_id, include_games=True)
 
 
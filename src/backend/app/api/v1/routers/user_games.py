@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from typing import List
 
-from ..core import schemas
+from ..core import schemas, http_cache
 from ..models.user_game import UserGame, GameStatus
 from ..models.game import Game
 from ..models.user import User
@@ -58,11 +58,27 @@ async def add_game_to_collection(
 
 @router.get("/collection", response_model=schemas.UserGameResponse)
 def get_user_collection(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get user's game collection."""
+    """Get user's game collection.
+    
+    Conditional: the ETag covers the user's collection rows and the games in
+    it, so an unchanged collection gets an empty 304 (never cached by shared caches).
+    """
     import sqlalchemy as sa
+    entries, last_entry_update, last_game_update = db.query(
+        func.count(UserGame.id), func.max(UserGame.updated_at), func.max(Game.updated_at)
+    ).join(Game, UserGame.game_id == Game.id).filter(UserGame.user_id == current_user.id).one()
+    etag = http_cache.etag_for("collection", current_user.id, entries, last_entry_update, last_game_update)
+    not_modified = http_cache.conditional(
+        request, response, etag, cache_control=http_cache.PRIVATE_CACHE_CONTROL
+    )
+    if not_modified:
+        return not_modified
+
     user_games = db.query(UserGame, Game).options(
         sa.orm.joinedload(UserGame.game)
     ).join(
@@ -75,10 +91,7 @@ def get_user_collection(
     
     for user_game, game in user_games:
         # Blended overall rating (IGDB + GameGloom), shown on a 5-point scale.
-        overall = schemas.blend_overall_rating(
-            game.total_rating, game.total_rating_count,
-            game.community_rating, game.community_rating_count,
-        )
+        overall = game.overall_rating
         game_info = schemas.GameBasicInfo(
             id=game.igdb_id,
             igdb_id=game.igdb_id,
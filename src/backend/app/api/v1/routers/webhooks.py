@@ -86,11 +86,11 @@ async def process_created_game(db: Session, game_id: int, game_data: dict = None
             return await process_updated_game(db, game_id, game_data)
             
         # Always fetch complete game data from IGDB
-        igdb_data = await services.fetch_from_igdb_async(game_id=game_id)
+        igdb_data = await services.load_game(game_id)
         if not igdb_data:
             raise ValueError(f"Could not fetch game data for ID {game_id}")
 
-        game_data = services.process_igdb_data(igdb_data[0] if isinstance(igdb_data, list) else igdb_data)
+        game_data = services.process_igdb_data(igdb_data)
         db_game = services.create_game(db, game_data)
         # Ensure new games are not marked as deleted
         db_game.is_deleted = False
@@ -104,30 +104,24 @@ async def process_created_game(db: Session, game_id: int, game_data: dict = None
 async def process_updated_game(db: Session, game_id: int, game_data: dict = None):
     """Fetch and update an existing game from IGDB"""
     try:
-        # Always fetch complete game data from IGDB
-        igdb_data = await services.fetch_from_igdb_async(game_id=game_id)
-        if not igdb_data:
-            raise ValueError(f"Could not fetch game data for ID {game_id}")
-            
-        processed_data = services.process_igdb_data(igdb_data[0] if isinstance(igdb_data, list) else igdb_data)
-        
         # Check if game exists by IGDB ID
         existing_game = services.get_game_by_igdb_id(db, game_id)
         if not existing_game:
             # If game doesn't exist, create it
             return await process_created_game(db, game_id, game_data)
-        
-        # Update the game with new data
-        game_dict = processed_data.model_dump()
-        for key, value in game_dict.items():
-            setattr(existing_game, key, value)
+
+        # Always fetch complete game data from IGDB
+        igdb_data = await services.load_game(game_id)
+        if not igdb_data:
+            raise ValueError(f"Could not fetch game data for ID {game_id}")
+            
+        processed_data = services.process_igdb_data(igdb_data)
         
         # If IGDB sends an update, the game exists in their database
         existing_game.is_deleted = False
         
-        db.add(existing_game)
-        db.commit()
-        db.refresh(existing_game)
+        # Update the game with new data (a no-op write if IGDB's data is unchanged)
+        existing_game = services.update_game(db, existing_game.id, processed_data)
         logger.info(f"Updated game: {processed_data.name} (ID: {game_id})")
         return existing_game
     except Exception as e:
@@ -656,12 +656,27 @@ def import_games_to_library(db: Session, user_id: int, platform: str, games_data
     Returns:
         (imported_count, skipped_count)
     """
-    from ..core.igdb_service import fetch_from_igdb, process_igdb_data
+    from ..core.igdb_service import fetch_games_by_ids, process_igdb_data
+    from ..core.game_service import store_raw_data
     
     imported = 0
     skipped = 0
     now = datetime.now(timezone.utc)
 
+    # Games we don't have yet are fetched from IGDB up front in one multi-id
+    # query, rather than one request per missing game inside the loop.
+    requested_ids = {g.get("igdb_id") for g in games_data if g.get("igdb_id")}
+    known_ids = {
+        row[0] for row in db.query(Game.igdb_id).filter(Game.igdb_id.in_(requested_ids)).all()
+    } if requested_ids else set()
+    missing_ids = sorted(requested_ids - known_ids)
+    igdb_records = {}
+    if missing_ids:
+        try:
+            igdb_records = fetch_games_by_ids(missing_ids)
+        except Exception as e:
+            logger.error(f"[Import] Failed to fetch {len(missing_ids)} IGDB games: {e}")
+
     for game_req in games_data:
         igdb_id = game_req.get("igdb_id")
         platform_id = game_req.get("platform_id")
@@ -673,26 +688,17 @@ def import_games_to_library(db: Session, user_id: int, platform: str, games_data
 
         # 1. Find/Create Game entry
         game = db.query(Game).filter(Game.igdb_id == igdb_id).first()
-        if not game:
+        if not game and igdb_id in igdb_records:
             try:
-                igdb_response = fetch_from_igdb(game_id=igdb_id)
-                if igdb_response:
-                    igdb_data = process_igdb_data(igdb_response[0])
-                    if igdb_data:
-                        game = Game(
-                            igdb_id=igdb_data.igdb_id,
-                            name=igdb_data.name,
-                            slug=igdb_data.slug,
-                            summary=igdb_data.summary,
-                            cover_image=igdb_data.cover_image,
-                            first_release_date=igdb_data.first_release_date,
-                            rating=igdb_data.rating,
-                            rating_count=igdb_data.rating_count or 0,
-                        )
-                        db.add(game)
-                        db.flush()
+                game_data = process_igdb_data(igdb_records[igdb_id]).model_dump()
+                raw_data = game_data.pop("raw_data", None)
+                game = Game(**game_data)
+                db.add(game)
+                db.flush()
+                store_raw_data(db, game.id, raw_data)
             except Exception as e:
-                logger.error(f"[Import] Failed to fetch IGDB game {igdb_id}: {e}")
+                logger.error(f"[Import] Failed to store IGDB game {igdb_id}: {e}")
+                game = None
 
         if not game:
             skipped += 1
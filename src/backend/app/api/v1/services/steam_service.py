@@ -4,7 +4,6 @@ Steam integration service.
 Handles OpenID 2.0 authentication and Steam Web API calls.
 """
 import re
-import time
 import urllib.parse
 from datetime import datetime, timezone
 from typing import Optional
@@ -374,10 +373,6 @@ def batch_match_steam_appids(app_ids: list[str]) -> dict[str, tuple]:
                         
             logger.info(f"[Steam Batch] Batch {batch_num + 1}/{total_batches}: matched {batch_matched}/{len(batch)} games")
             
-            # Rate limiting: IGDB allows 4 req/sec, so wait 0.3s between batches
-            if batch_num < total_batches - 1:
-                time.sleep(0.3)
-            
         except Exception as e:
             logger.error(f"[Steam Batch] Batch {batch_num + 1}/{total_batches} failed: {e}")
             # Continue processing other batches even if one fails
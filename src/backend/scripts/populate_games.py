@@ -16,7 +16,6 @@ Usage:
 """
 import argparse
 import asyncio
-import time
 import logging
 from datetime import datetime, UTC
 
@@ -36,8 +35,7 @@ from backend.app.api.v1.core import services, schemas
 from backend.app.api.settings import settings
 
 
-# IGDB rate limit: 4 requests per second = 250ms between requests
-RATE_LIMIT_DELAY = 0.3  # 300ms to be safe
+# IGDB's 4 req/s limit is enforced by fetch_from_igdb (core/igdb_governor.py).
 BATCH_SIZE = 500  # IGDB max per request
 
 # Minimum user-rating count for a released game to enter the catalog.
@@ -58,41 +56,27 @@ def fetch_games_batch(query: str) -> list:
 
 def store_games(db, games_data: list) -> tuple[int, int, int]:
     """
-    Process and store games in the database.
+    Process and store games in the database with one bulk upsert.
     
     Returns: (new_count, updated_count, skipped_count)
     """
-    new_count = 0
-    updated_count = 0
-    skipped_count = 0
-    
+    processed = []
     for game_data in games_data:
         try:
             if not game_data.get('name'):
                 continue
-            
-            processed = services.process_igdb_data(game_data)
-            
-            # Check quality requirements
-            if not services.meets_quality_requirements(processed, log_warnings=False):
-                skipped_count += 1
-                continue
-            
-            # Check if exists
-            existing = services.get_game_by_igdb_id(db, game_data['id'])
-            
-            if existing:
-                services.update_game(db, existing.id, processed)
-                updated_count += 1
-            else:
-                services.create_game(db, processed)
-                new_count += 1
-                
+            processed.append(services.process_igdb_data(game_data))
         except Exception as e:
             logger.error(f"Error processing game {game_data.get('name', 'Unknown')}: {e}")
             continue
     
-    return new_count, updated_count, skipped_count
+    # Quality requirements apply to existing games too, so low-quality records never refresh them
+    try:
+        return services.upsert_games(db, processed, filter_existing=True, log_warnings=False)
+    except Exception as e:
+        logger.error(f"Error storing batch of {len(processed)} games: {e}")
+        db.rollback()
+        return 0, 0, 0
 
 
 def build_released_query(offset: int, batch_limit: int) -> str:
@@ -147,9 +131,6 @@ def populate_released_games(limit: int = 10000) -> dict:
             
             offset += batch_limit
             
-            # Rate limiting
-            time.sleep(RATE_LIMIT_DELAY)
-            
     finally:
         db.close()
     
@@ -207,7 +188,6 @@ def populate_anticipated_games(limit: int = 2000) -> dict:
             logger.info(f"Batch: +{new} new, {updated} updated, {skipped} skipped | Total: {total_new} new")
             
             offset += batch_limit
-            time.sleep(RATE_LIMIT_DELAY)
             
     finally:
         db.close()
@@ -22,6 +22,7 @@ from sqlalchemy.pool import StaticPool
 from httpx import AsyncClient, ASGITransport
 from fastapi import FastAPI
 
+from app.api import db_setup
 from app.api.db_setup import Base, get_db
 from app.api.v1.core.security import csrf_protect_middleware
 from app.api.v1.routers.games import router as games_router
@@ -84,9 +85,11 @@ def override_get_db(db_session):
 
 
 @pytest_asyncio.fixture
-async def client(override_get_db):
+async def client(override_get_db, monkeypatch):
     """Create async test client with database override."""
     test_app.dependency_overrides[get_db] = override_get_db
+    # Work shared between requests opens its own sessions
+    monkeypatch.setattr(db_setup, "SessionLocal", TestSessionLocal)
     async with AsyncClient(
         transport=ASGITransport(app=test_app),
         base_url="http://test"
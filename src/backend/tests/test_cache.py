@@ -5,9 +5,17 @@ Tests for the discovery cache helper (core/cache.py).
 Drives cached_json with a fake dict-backed async Redis client to assert:
 miss -> producer runs + value stored; hit -> producer not called; producer
 error propagates; empty results are not cached; read errors fall back to the
-producer; and with caching disabled it is a pure pass-through.
+producer; and with caching disabled it is a pure pass-through. Also covers
+stampede protection: concurrent misses, early (XFetch) refresh and serving
+stale values while one caller recomputes, and the in-process L1 tier in front
+of Redis (hits, eviction, invalidation from other workers), and the encoded
+bodies discovery endpoints send as is.
 """
+import asyncio
+import gzip
 import json
+import time
+from collections import OrderedDict
 
 import pytest
 
@@ -23,22 +31,48 @@ class FakeRedis:
         self.store = {}
         self.raise_on = raise_on or set()  # method names that should raise
         self.set_calls = 0
+        self.get_calls = 0
+        self.published = []
 
     async def get(self, key):
         if "get" in self.raise_on:
             raise ConnectionError("boom")
+        self.get_calls += 1
         return self.store.get(key)
 
-    async def set(self, key, value, ex=None):
+    async def set(self, key, value, ex=None, px=None, nx=False):
         if "set" in self.raise_on:
             raise ConnectionError("boom")
-        self.set_calls += 1
+        if nx:
+            # Locks (SET NX) aren't counted as value writes
+            if key in self.store:
+                return None
+        else:
+            self.set_calls += 1
         self.store[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    async def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
 
     async def delete(self, *keys):
         for k in keys:
             self.store.pop(k, None)
 
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture(autouse=True)
+def empty_l1(monkeypatch):
+    monkeypatch.setattr(cache, "_l1", OrderedDict())
+    monkeypatch.setattr(cache, "_l1_bytes", 0)
+    monkeypatch.setattr(cache, "_stats", {key: 0 for key in cache._stats})
+
 
 @pytest.fixture
 def enabled_cache(monkeypatch):
@@ -56,6 +90,11 @@ def disabled_cache(monkeypatch):
     monkeypatch.setattr(cache, "_initialized", True)
 
 
+def stored_value(fake, key):
+    body, _, _ = cache._open_envelope(fake.store[key])
+    return body.value
+
+
 def make_producer(value):
     calls = {"count": 0}
 
@@ -73,7 +112,7 @@ async def test_miss_runs_producer_and_stores(enabled_cache):
 
     assert result == [{"id": 1}]
     assert calls["count"] == 1
-    assert enabled_cache.store["discovery:trending"] == json.dumps([{"id": 1}])
+    assert stored_value(enabled_cache, "discovery:trending") == [{"id": 1}]
 
 
 async def test_hit_does_not_run_producer(enabled_cache):
@@ -142,3 +181,181 @@ async def test_invalidate_deletes_keys(enabled_cache):
 async def test_invalidate_disabled_is_noop(disabled_cache):
     # Should not raise when caching is off.
     await cache.invalidate("discovery:trending")
+
+
+def cached_entry(value, age_seconds, delta=0.0):
+    return f"{time.time() - age_seconds} {delta}\n{json.dumps(value)}"
+
+
+async def test_concurrent_misses_run_producer_once(enabled_cache):
+    calls = {"count": 0}
+
+    async def producer():
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        return [{"id": 1}]
+
+    results = await asyncio.gather(*(
+        cache.cached_json("discovery:trending", 600, producer) for _ in range(200)
+    ))
+
+    assert calls["count"] == 1
+    assert results == [[{"id": 1}]] * 200
+
+
+async def test_stale_value_served_while_one_caller_refreshes(enabled_cache):
+    enabled_cache.store["discovery:trending"] = cached_entry([{"id": 1}], age_seconds=700)
+    calls = {"count": 0}
+
+    async def producer():
+        calls["count"] += 1
+        await asyncio.sleep(0.05)
+        return [{"id": 2}]
+
+    results = await asyncio.gather(*(
+        cache.cached_json("discovery:trending", 600, producer) for _ in range(50)
+    ))
+
+    assert calls["count"] == 1
+    assert results.count([{"id": 2}]) == 1
+    assert results.count([{"id": 1}]) == 49
+    assert stored_value(enabled_cache, "discovery:trending") == [{"id": 2}]
+    assert "cache-refresh:discovery:trending" not in enabled_cache.store
+
+
+async def test_failed_refresh_keeps_serving_the_last_value(enabled_cache):
+    enabled_cache.store["discovery:trending"] = cached_entry([{"id": 1}], age_seconds=700)
+
+    async def producer():
+        raise RuntimeError("IGDB down")
+
+    assert await cache.cached_json("discovery:trending", 600, producer) == [{"id": 1}]
+    assert stored_value(enabled_cache, "discovery:trending") == [{"id": 1}]
+
+
+async def test_early_expiration_depends_on_recompute_time(enabled_cache, monkeypatch):
+    monkeypatch.setattr(cache.random, "random", lambda: 0.1)
+    producer, calls = make_producer([{"id": 2}])
+
+    # 60s left and a 1s recompute: -ln(0.1) * 1s is well short of 60s, keep serving
+    enabled_cache.store["discovery:trending"] = cached_entry([{"id": 1}], age_seconds=540, delta=1.0)
+    assert await cache.cached_json("discovery:trending", 600, producer) == [{"id": 1}]
+
+    # A 30s recompute makes refreshing now worthwhile (drop the L1 copy the first read made)
+    await cache.invalidate("discovery:trending")
+    enabled_cache.store["discovery:trending"] = cached_entry([{"id": 1}], age_seconds=540, delta=30.0)
+    assert await cache.cached_json("discovery:trending", 600, producer) == [{"id": 2}]
+    assert calls["count"] == 1
+
+
+async def test_l1_serves_repeat_reads_without_redis(enabled_cache):
+    producer, calls = make_producer([{"id": 1}])
+
+    for _ in range(5):
+        assert await cache.cached_json("discovery:trending", 600, producer) == [{"id": 1}]
+
+    assert calls["count"] == 1
+    assert enabled_cache.get_calls == 2  # the miss, and its single-flight re-check
+    assert cache.stats()["l1_hits"] == 4
+    assert cache.stats()["l1_hit_ratio"] == 0.8
+
+
+async def test_l1_expires_with_the_value(enabled_cache):
+    # 10s of TTL left: L1 keeps it no longer than that
+    enabled_cache.store["discovery:trending"] = cached_entry([{"id": 1}], age_seconds=590)
+    producer, _ = make_producer([{"id": 2}])
+
+    await cache.cached_json("discovery:trending", 600, producer)
+
+    expires, _, _ = cache._l1["discovery:trending"]
+    assert expires - time.monotonic() <= 10
+
+
+async def test_l1_evicts_least_recently_used(enabled_cache, monkeypatch):
+    monkeypatch.setattr(cache, "L1_MAX_ENTRIES", 2)
+    for name in ("a", "b"):
+        producer, _ = make_producer([name])
+        await cache.cached_json(name, 600, producer)
+    await cache.cached_json("a", 600, make_producer(["a"])[0])  # touch "a"
+    await cache.cached_json("c", 600, make_producer(["c"])[0])
+
+    assert list(cache._l1) == ["a", "c"]
+    assert cache.stats()["l1_evictions"] == 1
+
+    monkeypatch.setattr(cache, "L1_MAX_BYTES", 1)
+    await cache.cached_json("d", 600, make_producer(["d"])[0])
+    assert "d" not in cache._l1
+
+
+async def test_invalidate_publishes_and_peers_drop_l1(enabled_cache):
+    producer, _ = make_producer([{"id": 1}])
+    await cache.cached_json("discovery:trending", 600, producer)
+    await cache.cached_json("discovery:latest", 600, producer)
+
+    await cache.invalidate("discovery:trending")
+
+    assert "discovery:trending" not in cache._l1
+    channel, message = enabled_cache.published[0]
+    assert channel == cache.INVALIDATION_CHANNEL
+
+    # Another worker receiving the message drops its copy too
+    cache._on_invalidation(json.dumps(["discovery:latest"]))
+    assert cache._l1 == OrderedDict()
+    assert cache._l1_bytes == 0
+
+
+async def test_cached_body_is_encoded_once(enabled_cache):
+    producer, calls = make_producer([{"id": 1, "name": "Pokémon"}])
+
+    first = await cache.cached_body("discovery:trending", 600, producer)
+    cache._l1.clear()
+    from_redis = await cache.cached_body("discovery:trending", 600, producer)
+    from_l1 = await cache.cached_body("discovery:trending", 600, producer)
+
+    assert calls["count"] == 1
+    assert first.content == '[{"id":1,"name":"Pokémon"}]'.encode()
+    assert from_redis.content == first.content and from_redis.etag == first.etag
+    assert from_l1 is from_redis
+    assert gzip.decompress(from_l1.encoded("gzip")) == first.content
+
+
+async def test_legacy_entries_are_still_served(enabled_cache):
+    producer, calls = make_producer([{"id": 2}])
+    enabled_cache.store["a"] = json.dumps([{"id": 1}])
+    enabled_cache.store["b"] = json.dumps({"value": [{"id": 1}], "computed_at": time.time(), "delta": 0.0})
+
+    assert await cache.cached_json("a", 600, producer) == [{"id": 1}]
+    assert await cache.cached_json("b", 600, producer) == [{"id": 1}]
+    assert calls["count"] == 0
+
+
+async def test_discovery_endpoint_sends_cached_bytes(enabled_cache, client, db_session, monkeypatch):
+    from datetime import datetime, timedelta
+    from app.api.v1.core import services
+    from app.api.v1.models.game import Game
+
+    synced_on = []
+
+    async def no_igdb(db, query):
+        synced_on.append(db)
+        return 0, 0
+
+    monkeypatch.setattr(services, "sync_games_from_igdb", no_igdb)
+    # One game's card is under the default threshold
+    monkeypatch.setattr(cache.settings, "COMPRESSION_MINIMUM_SIZE", 0)
+    db_session.add(Game(
+        igdb_id=1, name="Hades", slug="hades", cover_image="cover.jpg", hypes=10,
+        first_release_date=datetime.now() - timedelta(days=5),
+    ))
+    db_session.commit()
+
+    first = await client.get("/api/v1/trending-games", headers={"Accept-Encoding": "gzip"})
+    second = await client.get("/api/v1/trending-games", headers={"Accept-Encoding": "identity"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"] == f'W/{second.headers["etag"]}'
+    assert "content-encoding" not in second.headers
+    assert [g["slug"] for g in first.json()] == ["hades"]
+    assert second.content == cache._l1["discovery:trending"][1].content
+    # The cached producer is shared by every waiting request, so it has its own session
+    assert len(synced_on) == 1 and synced_on[0] is not db_session
@@ -0,0 +1,109 @@
+# backend/tests/test_compression.py
+"""
+Tests for response compression (core/compression.py): Accept-Encoding
+negotiation and CompressionMiddleware on whole and streamed bodies.
+"""
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+
+from app.api.v1.core import compression
+
+LARGE = [{"id": i, "name": f"Game {i}", "summary": "A story-driven open world RPG."} for i in range(100)]
+
+
+@pytest.fixture
+def compressed_client():
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large(response: Response):
+        response.headers["ETag"] = '"abc"'
+        return LARGE
+
+    @app.get("/small")
+    async def small():
+        return {"id": 1}
+
+    @app.get("/precompressed")
+    async def precompressed():
+        return Response(gzip.compress(b"[]"), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for game in LARGE:
+                yield json.dumps(game) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    app.add_middleware(compression.CompressionMiddleware, minimum_size=1024)
+    # gzip only, whatever codings this httpx install would advertise
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test", headers={"Accept-Encoding": "gzip"})
+
+
+def test_negotiate():
+    assert compression.negotiate("gzip, deflate") == "gzip"
+    assert compression.negotiate("deflate;q=1.0, *;q=0.5") == "gzip"
+    assert compression.negotiate("gzip;q=0") is None
+    assert compression.negotiate("identity") is None
+    assert compression.negotiate("") is None
+    assert compression.negotiate("GZIP; q=0.8") == "gzip"
+    if compression.brotli is not None:
+        assert compression.negotiate("gzip, br") == "br"
+        assert compression.negotiate("gzip, br;q=0.5") == "gzip"
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_compressed_and_etag_weakened(compressed_client):
+    async with compressed_client as client:
+        response = await client.get("/large")
+        identity = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert int(response.headers["content-length"]) < len(identity.content) // 4
+    # httpx decodes Content-Encoding for us
+    assert response.json() == LARGE
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["vary"] == "Accept-Encoding"
+    assert identity.headers["etag"] == '"abc"'
+
+
+@pytest.mark.asyncio
+async def test_small_precompressed_and_binary_bodies_pass_through(compressed_client):
+    async with compressed_client as client:
+        small = await client.get("/small")
+        precompressed = await client.get("/precompressed")
+        image = await client.get("/image")
+
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"id": 1}
+    # A larger body of the same type would be compressed, so caches must key on the coding
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert precompressed.headers["content-encoding"] == "gzip"
+    assert precompressed.headers["vary"] == "Accept-Encoding"
+    assert precompressed.json() == []
+    assert "content-encoding" not in image.headers
+    assert "vary" not in image.headers
+    assert len(image.content) == 4000
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_is_compressed_chunk_by_chunk(compressed_client):
+    async with compressed_client as client:
+        async with client.stream("GET", "/stream") as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = gzip.decompress(raw).decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == LARGE
@@ -0,0 +1,81 @@
+# backend/tests/test_discovery_rankings.py
+"""
+Tests for the precomputed homepage lists (discovery_rankings) in
+core/discovery_service.py.
+"""
+from datetime import datetime, timedelta
+
+from app.api.v1.core import discovery_service, services
+from app.api.v1.models.discovery_ranking import DiscoveryRanking, DiscoveryList
+from app.api.v1.models.game import Game
+
+
+def add_game(db, igdb_id, days_ago, hypes=None, total_rating=None, total_rating_count=None):
+    db_game = Game(
+        igdb_id=igdb_id, name=f"Game {igdb_id}", cover_image="cover.jpg",
+        first_release_date=datetime.now() - timedelta(days=days_ago),
+        hypes=hypes, total_rating=total_rating, total_rating_count=total_rating_count,
+    )
+    db.add(db_game)
+    db.commit()
+    return db_game
+
+
+def test_refresh_ranks_every_list(db_session):
+    add_game(db_session, 1, days_ago=10, hypes=50)
+    add_game(db_session, 2, days_ago=5, hypes=80)
+    add_game(db_session, 3, days_ago=-30, hypes=20)
+    add_game(db_session, 4, days_ago=2000, total_rating=92, total_rating_count=900)
+
+    sizes = services.refresh_discovery_rankings(db_session)
+
+    assert sizes == {"trending": 2, "anticipated": 1, "highly_rated": 1, "latest": 2}
+    assert [g.igdb_id for g in services.get_trending_games(db_session)] == [2, 1]
+    assert [g.igdb_id for g in services.get_latest_games(db_session)] == [2, 1]
+    assert [g.igdb_id for g in services.get_anticipated_games(db_session)] == [3]
+    assert [g.igdb_id for g in services.get_highly_rated_games(db_session, limit=1)] == [4]
+
+
+def test_reads_serve_the_stored_order_until_the_next_refresh(db_session):
+    add_game(db_session, 1, days_ago=10, hypes=50)
+    services.refresh_discovery_rankings(db_session)
+
+    add_game(db_session, 2, days_ago=5, hypes=80)
+    assert [g.igdb_id for g in services.get_trending_games(db_session)] == [1]
+
+    services.refresh_discovery_rankings(db_session, ["trending"])
+    assert [g.igdb_id for g in services.get_trending_games(db_session)] == [2, 1]
+
+
+def test_unranked_list_is_ranked_on_first_read(db_session):
+    add_game(db_session, 1, days_ago=3)
+
+    assert db_session.query(DiscoveryRanking).count() == 0
+    assert [g.igdb_id for g in services.get_latest_games(db_session)] == [1]
+    assert db_session.query(DiscoveryRanking).filter_by(list_name="latest").count() == 1
+
+
+def test_empty_list_is_ranked_once(db_session, monkeypatch):
+    refreshes = []
+    refresh = discovery_service.refresh_discovery_rankings
+    monkeypatch.setattr(discovery_service, "refresh_discovery_rankings",
+                        lambda db, names=None: refreshes.append(names) or refresh(db, names))
+
+    assert services.get_anticipated_games(db_session) == []
+    assert services.get_anticipated_games(db_session) == []
+
+    assert refreshes == [["anticipated"]]
+    assert db_session.get(DiscoveryList, "anticipated").size == 0
+
+
+def test_refresh_over_an_existing_ranking_trims_the_tail(db_session):
+    add_game(db_session, 1, days_ago=10, hypes=50)
+    add_game(db_session, 2, days_ago=5, hypes=80)
+    services.refresh_discovery_rankings(db_session, ["trending"])
+
+    db_session.query(Game).filter_by(igdb_id=2).update({"hypes": 0})
+    db_session.commit()
+    # Ranking again over the stored rows upserts them rather than colliding on the key
+    assert services.refresh_discovery_rankings(db_session, ["trending"]) == {"trending": 1}
+    assert [g.igdb_id for g in services.get_trending_games(db_session)] == [1]
+    assert db_session.query(DiscoveryRanking).filter_by(list_name="trending").count() == 1
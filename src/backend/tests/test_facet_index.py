@@ -0,0 +1,175 @@
+# backend/tests/test_facet_index.py
+"""
+Tests for the in-memory facet index (core/facet_index.py) and /games/browse.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.api.v1.core import facet_index
+from app.api.v1.core.facet_index import FacetIndex
+
+
+def build(*games):
+    """games: (igdb_id, name, total_rating, rating, rating_count, year, {kind: [slugs]})."""
+    rows = [
+        (igdb_id, name, total_rating, count, rating, datetime(year, 1, 1) if year else None)
+        for igdb_id, name, total_rating, rating, count, year, _ in games
+    ]
+    facet_rows = [
+        (igdb_id, kind, slug)
+        for igdb_id, *_, facets in games
+        for kind, slugs in facets.items()
+        for slug in slugs
+    ]
+    return FacetIndex.build(rows, facet_rows)
+
+
+def sample():
+    return build(
+        (1, "Hades", 92.4, 9.3, 900, 2020, {"genre": ["indie", "role-playing-rpg"], "platform": ["pc", "switch"]}),
+        (2, "Celeste", 90.1, 9.0, 600, 2018, {"genre": ["indie", "platform"], "platform": ["pc", "switch"]}),
+        (3, "Doom", 85.0, 8.5, 1200, 2016, {"genre": ["shooter"], "platform": ["pc", "ps4"]}),
+        (4, "Obscure RPG", 60.0, 9.9, 3, 2009, {"genre": ["role-playing-rpg"], "platform": ["ps4"]}),
+        (5, "Unrated", None, None, None, None, {"genre": ["indie"], "platform": ["pc"]}),
+    )
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(facet_index, "_index", FacetIndex())
+    monkeypatch.setattr(facet_index, "_loaded_at", None)
+
+
+def test_filters_or_within_a_kind_and_across_kinds():
+    index = sample()
+
+    ids, total, _ = index.browse({"genre": ["indie"]})
+    assert (ids, total) == ([1, 2, 5], 3)
+
+    ids, total, _ = index.browse({"genre": ["indie", "shooter"], "platform": ["ps4"]})
+    assert (ids, total) == ([3], 1)
+
+    assert index.browse({"genre": ["unknown"]})[:2] == ([], 0)
+
+
+def test_facet_counts_ignore_their_own_kind():
+    _, _, counts = sample().browse({"genre": ["indie"], "platform": ["switch"]})
+
+    # Genre counts: games on switch, by genre
+    assert counts["genre"] == {"indie": 2, "role-playing-rpg": 1, "platform": 1}
+    # Platform counts: indie games, by platform
+    assert counts["platform"] == {"pc": 3, "switch": 2}
+
+
+def test_year_and_rating_filters():
+    index = sample()
+
+    assert index.browse({}, year_from=2016, year_to=2018)[:2] == ([2, 3], 2)
+    assert index.browse({}, min_rating=90)[:2] == ([1, 2], 2)
+    assert index.browse({"genre": ["role-playing-rpg"]}, year_to=2010)[:2] == ([4], 1)
+
+
+def test_sorts_and_paging():
+    index = sample()
+
+    # Weighted rating: three 9.9 votes don't outrank hundreds of 8.5s
+    assert index.browse({}, sort="rating")[0] == [1, 2, 3, 4, 5]
+    assert index.browse({}, sort="release_new")[0] == [1, 2, 3, 4, 5]
+    assert index.browse({}, sort="release_old")[0] == [4, 3, 2, 1, 5]
+    assert index.browse({}, sort="name")[0] == [2, 3, 1, 4, 5]
+    assert index.browse({}, sort="name", limit=2, offset=2)[0] == [1, 4]
+
+
+def test_updates_merge_into_sorted_order():
+    index = sample()
+
+    index.upsert(6, "Balatro", {"genre": ["indie"]}, 95.0, 2000, 9.6, datetime(2024, 2, 20))
+    index.upsert(3, "Doom", None, 85.0, 1200, 8.5, datetime(2016, 5, 13))
+    index.upsert(2, "Celeste", {"genre": ["platform"]}, 90.1, 600, 2.0, datetime(2018, 1, 25))
+
+    ids, total, counts = index.browse({"genre": ["indie"]}, sort="rating")
+    assert (ids, total) == ([6, 1, 5], 3)
+    assert index.browse({}, sort="release_new")[0] == [6, 1, 2, 3, 4, 5]
+    assert index.browse({"genre": ["shooter"]})[0] == [3]
+    assert counts["genre"]["indie"] == 3
+
+
+@pytest.mark.asyncio
+async def test_resort_runs_off_the_write_path(fresh_index, monkeypatch):
+    index = sample()
+    monkeypatch.setattr(facet_index, "_index", index)
+    monkeypatch.setattr(facet_index, "_loaded_at", 0.0)
+    monkeypatch.setattr(facet_index, "MAX_DIRTY", 0)
+
+    # Writes only mark games dirty, however many accumulate
+    facet_index._apply("upsert", 7, "Zelda", {"genre": ["indie"]}, 50.0, 100, 5.0, None)
+    assert index._dirty == {index._positions[7]}
+
+    snapshot_orders = FacetIndex.sorted_orders
+
+    def write_during_sort(snapshot):
+        # A write landing while the thread sorts stays dirty past the swap
+        facet_index._apply("upsert", 8, "Another", {"genre": ["indie"]}, 99.0, 5000, 9.9, None)
+        return snapshot_orders(snapshot)
+
+    monkeypatch.setattr(FacetIndex, "sorted_orders", staticmethod(write_during_sort))
+    await facet_index.resort_if_needed()
+
+    assert index._dirty == {index._positions[8]} and not index._sorting
+    assert index.browse({}, sort="rating")[0] == [8, 1, 2, 3, 4, 7, 5]
+    assert facet_index.stats()["unsorted"] == 1
+
+
+def test_remove():
+    index = sample()
+
+    index.remove(1)
+
+    ids, total, counts = index.browse({"genre": ["indie"]})
+    assert (ids, total) == ([2, 5], 2)
+    assert counts["genre"] == {"indie": 2, "platform": 1, "role-playing-rpg": 1, "shooter": 1}
+    assert index.browse({}, min_rating=92)[:2] == ([], 0)
+
+
+def test_writes_update_loaded_index(fresh_index, db_session):
+    from app.api.v1.core import game_service, schemas
+
+    facet_index.load_from_db(db_session)
+    db_game = game_service.create_game(db_session, schemas.GameCreate(
+        igdb_id=7, name="Celeste", slug="celeste", facets={"genre": ["platform"]},
+    ))
+    assert facet_index.browse({"genre": ["platform"]})[:2] == ([7], 1)
+
+    game_service.mark_game_as_deleted(db_session, db_game.igdb_id)
+    assert facet_index.browse({"genre": ["platform"]})[:2] == ([], 0)
+
+
+@pytest.mark.asyncio
+async def test_browse_endpoint(fresh_index, client, db_session):
+    from app.api.v1.core import game_service, schemas
+
+    for igdb_id, name, genres, platforms in [
+        (1, "Hades", ["indie", "role-playing-rpg"], ["pc-microsoft-windows"]),
+        (2, "Celeste", ["indie", "platform"], ["nintendo-switch"]),
+        (3, "Doom", ["shooter"], ["pc-microsoft-windows"]),
+    ]:
+        game_service.create_game(db_session, schemas.GameCreate(
+            igdb_id=igdb_id, name=name, slug=name.lower(),
+            facets={"genre": genres, "platform": platforms},
+        ))
+
+    # Until the startup load has run there is nothing to browse
+    loading = await client.get("/api/v1/games/browse", params={"genre": "rpg"})
+    facet_index.load_from_db(db_session)
+    response = await client.get(
+        "/api/v1/games/browse", params={"genre": "rpg,platform", "sort": "name"}
+    )
+
+    assert loading.status_code == 503 and loading.headers["retry-after"] == "5"
+    assert response.status_code == 200
+    body = response.json()
+    assert [g["slug"] for g in body["results"]] == ["celeste", "hades"]
+    assert body["total"] == 2
+    assert body["facets"]["platform"] == {"pc-microsoft-windows": 1, "nintendo-switch": 1}
+    assert body["facets"]["genre"]["shooter"] == 1
@@ -0,0 +1,61 @@
+# backend/tests/test_facets.py
+"""
+Tests for exact genre/theme/platform filtering (core/facets.py, game_facets).
+"""
+import pytest
+
+from app.api.v1.core import facets, services
+from app.api.v1.models.game_facet import GameFacet
+
+
+def igdb_game(igdb_id, name, genres=(), themes=(), platforms=()):
+    """A minimal IGDB record that passes the quality requirements."""
+    return {
+        "id": igdb_id,
+        "name": name,
+        "slug": name.lower().replace(" ", "-"),
+        "summary": f"About {name}",
+        "cover": {"image_id": f"co{igdb_id}"},
+        "genres": [{"name": n} for n in genres],
+        "themes": [{"name": n} for n in themes],
+        "platforms": [{"name": n} for n in platforms],
+    }
+
+
+def test_slugs_follow_igdb_names():
+    assert facets.facet_slug("Role-playing (RPG)") == "role-playing-rpg"
+    assert facets.facet_slug("Card & Board Game") == "card-and-board-game"
+    assert facets.facet_slug("Hack and slash/Beat 'em up") == "hack-and-slash-beat-em-up"
+    # Commas inside parentheses are part of the name, not separators
+    assert facets.split_names("Action, 4X (explore, expand, exploit, and exterminate)") == [
+        "Action", "4X (explore, expand, exploit, and exterminate)",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_filters_and_counts_match_exact_slugs(client, db_session):
+    services.upsert_games(db_session, [
+        services.process_igdb_data(igdb_game(1, "Diablo", ["Role-playing (RPG)", "Hack and slash/Beat 'em up"], ["Action"], ["PC (Microsoft Windows)"])),
+        services.process_igdb_data(igdb_game(2, "Portal", ["Puzzle", "Shooter"], ["Science fiction"], ["PC (Microsoft Windows)"])),
+        services.process_igdb_data(igdb_game(3, "Uncharted", ["Adventure", "Shooter"], ["Action"], ["PlayStation 3"])),
+    ])
+
+    async def ids(**params):
+        response = await client.get("/api/v1/games", params=params)
+        return sorted(g["igdb_id"] for g in response.json())
+
+    assert await ids(genre="shooter") == [2, 3]
+    assert await ids(genre="rpg") == [1]
+    assert await ids(genre="slash") == []
+    assert await ids(theme="science-fiction") == [2]
+    assert await ids(platform="pc-microsoft-windows") == [1, 2]
+    count = await client.get("/api/v1/games/count", params={"theme": "action"})
+    assert count.json() == {"total": 2}
+
+
+def test_refresh_replaces_facets(db_session):
+    services.upsert_games(db_session, [services.process_igdb_data(igdb_game(1, "Hades", ["Indie"]))])
+    services.upsert_games(db_session, [services.process_igdb_data(igdb_game(1, "Hades", ["Indie", "Role-playing (RPG)"]))])
+
+    stored = db_session.query(GameFacet.kind, GameFacet.slug).order_by(GameFacet.slug).all()
+    assert stored == [("genre", "indie"), ("genre", "role-playing-rpg")]
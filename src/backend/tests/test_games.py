@@ -39,3 +39,118 @@ async def test_get_games_by_ids_ignores_trailing_comma(client, sample_games):
     response = await client.get(f"/api/v1/games?ids={sample_games[0].id},")
     assert response.status_code == 200
     assert [g["id"] for g in response.json()] == [sample_games[0].id]
+
+
+async def test_concurrent_misses_share_one_fetch(client, db_session, monkeypatch):
+    """Simultaneous requests for a game not yet in the DB make one IGDB call and one row."""
+    import asyncio
+    from app.api.v1.core import services
+
+    calls = []
+
+    async def fake_load_game(igdb_id):
+        calls.append(igdb_id)
+        await asyncio.sleep(0.05)  # keep the fetch in flight while the others arrive
+        return {
+            "id": igdb_id,
+            "name": "Brand New Game",
+            "slug": "brand-new-game",
+            "summary": "Fresh from IGDB.",
+            "cover": {"image_id": "abc123"},
+        }
+
+    monkeypatch.setattr(services, "load_game", fake_load_game)
+
+    responses = await asyncio.gather(*(client.get("/api/v1/games/4242") for _ in range(5)))
+
+    assert [r.status_code for r in responses] == [200] * 5
+    assert {r.json()["id"] for r in responses} == {responses[0].json()["id"]}
+    assert calls == [4242]
+    assert db_session.query(Game).filter(Game.igdb_id == 4242).count() == 1
+
+
+async def test_shared_fetch_runs_on_its_own_session(client, db_session, monkeypatch):
+    """The single-flight fetch outlives any one request, so it doesn't borrow a request's session."""
+    from app.api.v1.core import services
+
+    async def fake_load_game(igdb_id):
+        return {"id": igdb_id, "name": "Own Session", "summary": "Fresh from IGDB.", "cover": {"image_id": "abc123"}}
+
+    sessions = []
+    create_game = services.create_game
+
+    def recording_create_game(db, game_data):
+        sessions.append(db)
+        return create_game(db, game_data)
+
+    monkeypatch.setattr(services, "load_game", fake_load_game)
+    monkeypatch.setattr(services, "create_game", recording_create_game)
+
+    response = await client.get("/api/v1/games/4343")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Own Session"
+    assert len(sessions) == 1 and sessions[0] is not db_session
+
+
+async def test_raw_data_stored_out_of_line(client, db_session, monkeypatch):
+    """The IGDB payload goes to game_raw_data and is only served to admins."""
+    from app.api.v1.core import services
+    from app.api.v1.models.game_raw_data import GameRawData
+    from app.api.settings import settings
+
+    igdb_data = {
+        "id": 5151,
+        "name": "Raw Game",
+        "slug": "raw-game",
+        "summary": "Has a payload.",
+        "cover": {"image_id": "raw1"},
+    }
+    db_game = services.create_game(db_session, services.process_igdb_data(igdb_data))
+
+    row = db_session.get(GameRawData, db_game.id)
+    assert row.encoding == "gzip" and row.data[:2] == b"\x1f\x8b"
+    assert services.get_game_raw_data(db_session, db_game.id) == igdb_data
+
+    public = await client.get("/api/v1/games/5151")
+    assert public.status_code == 200
+    assert "raw_data" not in public.json()
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    assert (await client.get("/api/v1/games/5151/raw-data")).status_code == 404
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "letmein")
+    denied = await client.get("/api/v1/games/5151/raw-data", headers={"X-Admin-Key": "nope"})
+    assert denied.status_code == 403
+    allowed = await client.get("/api/v1/games/5151/raw-data", headers={"X-Admin-Key": "letmein"})
+    assert allowed.status_code == 200
+    assert allowed.json() == igdb_data
+
+
+async def test_list_endpoints_return_lean_cards(client, db_session):
+    """List endpoints load and return only GameCard columns."""
+    from sqlalchemy import inspect
+    from app.api.v1.core import services
+
+    db_session.add(Game(
+        igdb_id=303, name="Card Game", slug="card-game", cover_image="cover.jpg",
+        storyline="A long storyline", total_rating=90.0, total_rating_count=10,
+        screenshots=["s1.jpg", "s2.jpg", "s3.jpg"],
+        similar_games=[{"id": 1, "name": "Other"}],
+        language_supports=[{"language": "English"}],
+    ))
+    db_session.commit()
+    db_session.expunge_all()
+
+    loaded = services.get_all_games(db_session, sort="name")[0]
+    unloaded = inspect(loaded).unloaded
+    assert {"storyline", "similar_games", "language_supports"} <= unloaded
+    assert "cover_image" not in unloaded
+
+    response = await client.get("/api/v1/all-games?sort=name")
+    assert response.status_code == 200
+    card = response.json()[0]
+    assert card["name"] == "Card Game"
+    assert card["overall_rating"] == 90.0
+    assert card["screenshots"] == ["s1.jpg"]
+    assert not {"storyline", "similar_games", "language_supports", "raw_data"} & card.keys()
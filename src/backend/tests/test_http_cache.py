@@ -0,0 +1,163 @@
+# backend/tests/test_http_cache.py
+"""
+Tests for HTTP conditional requests (core/http_cache.py): ETag and
+Last-Modified validators, 304 Not Modified, and Cache-Control on the game,
+discovery, public list and collection endpoints.
+
+Each test also checks what a revalidation saves: a 304 carries no body.
+"""
+from datetime import datetime, timedelta, UTC
+
+import pytest
+import pytest_asyncio
+
+from app.api.v1.core import http_cache, services
+from app.api.v1.models.game import Game
+
+
+@pytest.fixture
+def stored_game(db_session):
+    game = Game(
+        igdb_id=1942, name="The Witcher 3: Wild Hunt", slug="the-witcher-3-wild-hunt",
+        summary="A story-driven open world RPG. " * 40, checked_at=datetime.now(UTC),
+    )
+    db_session.add(game)
+    db_session.commit()
+    return game
+
+
+@pytest_asyncio.fixture
+async def auth_headers(client, test_user_data):
+    await client.post("/api/v1/register", json=test_user_data)
+    response = await client.post("/api/v1/login", json={
+        "username": test_user_data["username"],
+        "password": test_user_data["password"]
+    })
+    # Bearer auth is used here; drop the login cookie so CSRF doesn't reject later calls.
+    client.cookies.clear()
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+async def revalidate(client, url, first, **headers):
+    """Repeat a request with the validators of `first`; returns (response, bytes saved)."""
+    second = await client.get(url, headers={"If-None-Match": first.headers["etag"], **headers})
+    return second, len(first.content) - len(second.content)
+
+
+@pytest.mark.asyncio
+async def test_game_304_on_matching_etag_and_last_modified(client, stored_game):
+    url = "/api/v1/games/the-witcher-3-wild-hunt"
+    first = await client.get(url)
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == http_cache.PUBLIC_CACHE_CONTROL
+    assert "last-modified" in first.headers
+
+    second, saved = await revalidate(client, url, first)
+    assert second.status_code == 304
+    assert second.content == b""
+    assert saved == len(first.content) > 1000
+    assert second.headers["etag"] == first.headers["etag"]
+
+    by_date = await client.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert by_date.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_game_change_invalidates_validators(client, db_session, stored_game):
+    url = "/api/v1/games/1942"
+    first = await client.get(url)
+
+    stored_game.summary = "Updated"
+    stored_game.updated_at = datetime.now(UTC) + timedelta(seconds=5)
+    db_session.commit()
+
+    second, _ = await revalidate(client, url, first)
+    assert second.status_code == 200
+    assert second.json()["summary"] == "Updated"
+    assert second.headers["etag"] != first.headers["etag"]
+    by_date = await client.get(url, headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert by_date.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_discovery_list_304(client, db_session, monkeypatch):
+    async def no_igdb(db, query):
+        return 0, 0
+
+    monkeypatch.setattr(services, "sync_games_from_igdb", no_igdb)
+    db_session.add(Game(
+        igdb_id=1, name="Hades", slug="hades", cover_image="cover.jpg", hypes=10,
+        first_release_date=datetime.now() - timedelta(days=5),
+    ))
+    db_session.commit()
+
+    first = await client.get("/api/v1/trending-games")
+    second, saved = await revalidate(client, "/api/v1/trending-games", first)
+
+    assert second.status_code == 304
+    assert saved == len(first.content)
+    assert first.headers["cache-control"] == http_cache.PUBLIC_CACHE_CONTROL
+
+
+@pytest.mark.asyncio
+async def test_public_list_304_until_its_games_change(client, db_session, stored_game, auth_headers):
+    created = await client.post(
+        "/api/v1/user-lists", json={"name": "RPGs", "is_public": True}, headers=auth_headers
+    )
+    list_id = created.json()["id"]
+    await client.post(f"/api/v1/user-lists/{list_id}/games", json={"game_id": 1942}, headers=auth_headers)
+    url = f"/api/v1/lists/{list_id}"
+
+    first = await client.get(url)
+    assert first.headers["cache-control"] == http_cache.PUBLIC_CACHE_CONTROL
+    second, saved = await revalidate(client, url, first)
+    assert second.status_code == 304
+    assert saved == len(first.content)
+
+    # The owner's view carries their like state: private, and its own ETag
+    own = await client.get(url, headers=auth_headers)
+    assert own.headers["cache-control"] == http_cache.PRIVATE_CACHE_CONTROL
+    assert own.headers["etag"] != first.headers["etag"]
+
+    db_session.add(Game(igdb_id=2, name="Hades", slug="hades"))
+    db_session.commit()
+    await client.post(f"/api/v1/user-lists/{list_id}/games", json={"game_id": 2}, headers=auth_headers)
+    third, _ = await revalidate(client, url, first)
+    assert third.status_code == 200
+    assert len(third.json()["games"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_collection_304_until_status_changes(client, stored_game, auth_headers):
+    await client.post("/api/v1/user-games", json={"game_id": 1942, "status": "playing"}, headers=auth_headers)
+    url = "/api/v1/user-games/collection"
+
+    first = await client.get(url, headers=auth_headers)
+    assert first.headers["cache-control"] == http_cache.PRIVATE_CACHE_CONTROL
+    second, saved = await revalidate(client, url, first, **auth_headers)
+    assert second.status_code == 304
+    assert saved == len(first.content)
+
+    await client.patch("/api/v1/user-games/1942", json={"status": "played"}, headers=auth_headers)
+    third, _ = await revalidate(client, url, first, **auth_headers)
+    assert third.status_code == 200
+    assert [g["igdb_id"] for g in third.json()["played"]] == [1942]
+
+
+def test_if_none_match_parsing():
+    class FakeRequest:
+        def __init__(self, **headers):
+            self.headers = {key.replace("_", "-"): value for key, value in headers.items()}
+
+    etag = http_cache.etag_for("game", 1)
+
+    assert http_cache.is_not_modified(FakeRequest(if_none_match=f'"other", W/{etag}'), etag)
+    assert http_cache.is_not_modified(FakeRequest(if_none_match="*"), etag)
+    assert not http_cache.is_not_modified(FakeRequest(if_none_match='"other"'), etag)
+    # If-None-Match wins over a matching If-Modified-Since
+    assert not http_cache.is_not_modified(
+        FakeRequest(if_none_match='"other"', if_modified_since="Fri, 01 Jan 2100 00:00:00 GMT"),
+        etag, datetime(2020, 1, 1),
+    )
+    assert not http_cache.is_not_modified(FakeRequest(if_modified_since="garbage"), etag, datetime(2020, 1, 1))
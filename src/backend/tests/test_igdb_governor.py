@@ -0,0 +1,73 @@
+# backend/tests/test_igdb_governor.py
+"""
+Tests for the outbound IGDB throttle (core/igdb_governor.py).
+
+Runs the in-process bucket only (no REDIS_URL): burst allowance, steady-state
+spacing, 429 cooldowns and the stats counters.
+"""
+import time
+
+import pytest
+
+from app.api.v1.core import igdb_governor
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    """Fresh local bucket at 20 req/s with a burst of 2, and zeroed stats."""
+    monkeypatch.setattr(igdb_governor.settings, "IGDB_RATE_LIMIT", 20.0)
+    monkeypatch.setattr(igdb_governor.settings, "IGDB_RATE_BURST", 2)
+    monkeypatch.setattr(igdb_governor.settings, "REDIS_URL", "")
+    monkeypatch.setattr(igdb_governor, "_sync_redis", None)
+    monkeypatch.setattr(igdb_governor, "_sync_redis_initialized", True)
+    monkeypatch.setattr(igdb_governor, "_local_bucket", igdb_governor._LocalBucket())
+    monkeypatch.setattr(igdb_governor, "_stats", {k: 0 for k in igdb_governor._stats})
+    return igdb_governor._local_bucket
+
+
+def test_burst_then_spacing(bucket):
+    interval, tolerance = igdb_governor._bucket_params()
+
+    waits = [bucket.reserve(interval, tolerance) for _ in range(4)]
+
+    # Two requests go out immediately, then each waits one more interval.
+    assert waits[0] == 0
+    assert waits[1] == 0
+    assert waits[2] == pytest.approx(interval, abs=0.01)
+    assert waits[3] == pytest.approx(2 * interval, abs=0.01)
+
+
+def test_429_pushes_next_caller_back(bucket):
+    igdb_governor.record_429(0.5)
+
+    wait = igdb_governor._reserve_sync()
+
+    assert wait == pytest.approx(0.5, abs=0.05)
+    assert igdb_governor.stats()["rate_limited_429"] == 1
+
+
+def test_throttle_records_queue_wait(bucket):
+    start = time.perf_counter()
+    for _ in range(3):
+        with igdb_governor.throttle():
+            pass
+    elapsed = time.perf_counter() - start
+
+    stats = igdb_governor.stats()
+    assert stats["requests"] == 3
+    assert stats["queued"] == 1
+    assert stats["backend"] == "local"
+    assert elapsed >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_async_throttle_shares_bucket(bucket):
+    with igdb_governor.throttle():
+        pass
+    async with igdb_governor.athrottle():
+        pass
+    async with igdb_governor.athrottle():
+        pass
+
+    assert igdb_governor.stats()["requests"] == 3
+    assert igdb_governor.stats()["queued"] == 1
@@ -0,0 +1,122 @@
+# backend/tests/test_igdb_service.py
+"""
+Tests for the IGDB HTTP layer (core/igdb_service.py).
+
+Covers the shared pooled async client: it is reused across calls, rebuilt
+after close, and fetch_from_igdb_async routes every request through it.
+Also covers the load_game() coalescer in core/igdb_loader.py.
+"""
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.api.v1.core import igdb_service, igdb_loader
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def fresh_client():
+    """Start and end each test without a shared client."""
+    await igdb_service.close_igdb_client()
+    yield
+    await igdb_service.close_igdb_client()
+
+
+def install_mock_client(handler):
+    """Swap a MockTransport-backed client in as the shared IGDB client."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    igdb_service._async_client = client
+    igdb_service._async_client_loop = asyncio.get_running_loop()
+    return client
+
+
+async def test_shared_client_is_reused(fresh_client):
+    first = igdb_service.get_igdb_client()
+    second = igdb_service.get_igdb_client()
+
+    assert first is second
+    assert not first.is_closed
+
+
+async def test_close_then_rebuild(fresh_client):
+    first = igdb_service.get_igdb_client()
+
+    await igdb_service.close_igdb_client()
+
+    assert first.is_closed
+    second = igdb_service.get_igdb_client()
+    assert second is not first
+    assert not second.is_closed
+
+
+async def test_fetch_goes_through_shared_client(fresh_client):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json=[{"id": 1942, "name": "The Witcher 3"}])
+
+    install_mock_client(handler)
+
+    game = await igdb_service.fetch_from_igdb_async(game_id=1942)
+    games = await igdb_service.fetch_from_igdb_async(query="fields name; limit 1;", endpoint="games")
+
+    assert game == {"id": 1942, "name": "The Witcher 3"}
+    assert games == [{"id": 1942, "name": "The Witcher 3"}]
+    assert len(seen) == 2
+    assert seen[0].url.path.endswith("/games")
+    assert b"where id = 1942;" in seen[0].content
+
+
+async def test_concurrent_loads_share_one_query(monkeypatch):
+    calls = []
+
+    async def fake_fetch(ids):
+        calls.append(sorted(ids))
+        return {i: {"id": i, "name": f"Game {i}"} for i in ids if i != 404}
+
+    monkeypatch.setattr(igdb_loader, "fetch_games_by_ids_async", fake_fetch)
+
+    results = await asyncio.gather(*(igdb_loader.load_game(i) for i in (1, 2, 2, 404)))
+
+    assert calls == [[1, 2, 404]]  # duplicate ids share a slot
+    assert results[0] == {"id": 1, "name": "Game 1"}
+    assert results[1] == results[2] == {"id": 2, "name": "Game 2"}
+    assert results[3] is None
+
+
+async def test_batch_failure_reaches_every_caller(monkeypatch):
+    async def failing_fetch(ids):
+        raise httpx.ConnectError("IGDB unreachable")
+
+    monkeypatch.setattr(igdb_loader, "fetch_games_by_ids_async", failing_fetch)
+
+    results = await asyncio.gather(
+        igdb_loader.load_game(1), igdb_loader.load_game(2), return_exceptions=True
+    )
+
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
+
+
+async def test_in_flight_batch_is_held_until_done(monkeypatch):
+    release = asyncio.Event()
+
+    async def slow_fetch(ids):
+        await release.wait()
+        return {i: {"id": i} for i in ids}
+
+    monkeypatch.setattr(igdb_loader, "fetch_games_by_ids_async", slow_fetch)
+
+    pending = asyncio.ensure_future(igdb_loader.load_game(7))
+    await asyncio.sleep(igdb_loader.COALESCE_WINDOW_SECONDS * 2)
+    loader = igdb_loader._get_loader()
+    # The loop only keeps weak references to tasks
+    assert len(loader._dispatches) == 1
+
+    release.set()
+    assert await pending == {"id": 7}
+    await asyncio.sleep(0)
+    assert not loader._dispatches
@@ -0,0 +1,62 @@
+# backend/tests/test_negative_cache.py
+"""
+Tests for the negative cache (core/negative_cache.py): IGDB misses for
+unknown slugs and search terms are remembered, IGDB errors are not.
+"""
+from collections import OrderedDict
+
+import pytest
+
+from app.api.v1.core import negative_cache, services
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def empty_negative_cache(monkeypatch):
+    monkeypatch.setattr(negative_cache, "_local", OrderedDict())
+
+
+@pytest.fixture
+def igdb_calls(monkeypatch):
+    """Queries sent to IGDB; IGDB finds nothing."""
+    calls = []
+
+    async def fake_fetch(query=None, **kwargs):
+        calls.append(query)
+        return []
+
+    monkeypatch.setattr(services, "fetch_from_igdb_async", fake_fetch)
+    return calls
+
+
+async def test_unknown_slug_calls_igdb_once(client, igdb_calls):
+    first = await client.get("/api/v1/games/not-a-real-game")
+    second = await client.get("/api/v1/games/not-a-real-game")
+
+    assert first.status_code == second.status_code == 404
+    assert len(igdb_calls) == 1
+
+
+async def test_search_without_igdb_results_calls_igdb_once(client, igdb_calls):
+    for query in ("Zzyzx Quest", "  zzyzx   QUEST "):
+        response = await client.get("/api/v1/search", params={"query": query})
+        assert response.json() == []
+
+    assert len(igdb_calls) == 1
+    assert negative_cache.stats()["hits"] >= 1
+
+
+async def test_igdb_errors_are_not_cached(client, monkeypatch):
+    calls = []
+
+    async def failing_fetch(query=None, **kwargs):
+        calls.append(query)
+        raise RuntimeError("IGDB unavailable")
+
+    monkeypatch.setattr(services, "fetch_from_igdb_async", failing_fetch)
+
+    for _ in range(2):
+        await client.get("/api/v1/search", params={"query": "zzyzx quest"})
+
+    assert len(calls) == 2
@@ -0,0 +1,77 @@
+# backend/tests/test_pagination.py
+"""
+Tests for keyset (cursor) pagination of the game list endpoints.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.api.v1.core import schemas, services
+from app.api.v1.models.game import Game
+
+pytestmark = pytest.mark.asyncio
+
+
+def walk(fetch, limit):
+    """Every page of a list, following next_cursor until the last page."""
+    pages, cursor = [], None
+    while True:
+        page = fetch(limit=limit, cursor=cursor)
+        pages.append([g.igdb_id for g in page])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+async def test_cursor_pages_match_offset_pages_with_ties_and_nulls(db_session):
+    db_session.add_all([
+        Game(
+            igdb_id=i, name=f"Game {i}", slug=f"game-{i}",
+            rating=80.0 if i % 3 else 90.0, total_rating_count=100,
+            first_release_date=None if i % 4 == 0 else datetime(2020, 1, 1 + i % 2),
+        )
+        for i in range(1, 12)
+    ])
+    db_session.commit()
+
+    for sort in ("rating", "overall_rating", "release_new", "release_old", "name"):
+        by_offset = [
+            [g.igdb_id for g in services.get_all_games(db_session, limit=4, offset=offset, sort=sort)]
+            for offset in (0, 4, 8)
+        ]
+        by_cursor = walk(lambda **kw: services.get_all_games(db_session, sort=sort, **kw), limit=4)
+
+        assert by_cursor == by_offset, sort
+        assert sorted(sum(by_cursor, [])) == list(range(1, 12))
+
+
+async def test_genre_list_returns_next_cursor_header(client, db_session):
+    for i in range(1, 6):
+        services.create_game(db_session, schemas.GameCreate(
+            igdb_id=i, name=f"Shooter {i}", slug=f"shooter-{i}", genres="Shooter", total_rating=50 + i,
+            facets={"genre": ["shooter"]},
+        ))
+
+    first = await client.get("/api/v1/games", params={"genre": "shooter", "limit": 3})
+    second = await client.get(
+        "/api/v1/games", params={"genre": "shooter", "limit": 3, "cursor": first.headers["X-Next-Cursor"]}
+    )
+
+    assert [g["igdb_id"] for g in first.json()] == [5, 4, 3]
+    assert [g["igdb_id"] for g in second.json()] == [2, 1]
+    assert "X-Next-Cursor" not in second.headers
+
+
+async def test_cursor_from_another_sort_is_rejected(client, db_session):
+    db_session.add_all([
+        Game(igdb_id=i, name=f"Game {i}", slug=f"game-{i}", rating=80.0, total_rating_count=10)
+        for i in range(1, 4)
+    ])
+    db_session.commit()
+
+    first = await client.get("/api/v1/all-games", params={"sort": "rating", "limit": 1})
+    response = await client.get(
+        "/api/v1/all-games", params={"sort": "release_new", "cursor": first.headers["X-Next-Cursor"]}
+    )
+
+    assert response.status_code == 400
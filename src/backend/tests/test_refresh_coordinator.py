@@ -0,0 +1,103 @@
+# backend/tests/test_refresh_coordinator.py
+"""
+Tests for the background refresh coordinator (core/refresh_coordinator.py).
+
+Covers collapsing repeat triggers, draining the queue most-viewed first,
+skipping a game whose lease another worker holds, and batching time to beat.
+"""
+import asyncio
+
+import pytest
+
+from app.api import db_setup
+from app.api.v1.core import cache, refresh_coordinator
+from app.api.v1.models.game import Game
+from app.api.settings import settings
+from tests.conftest import TestSessionLocal
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(cache, "_client", None)
+    monkeypatch.setattr(cache, "_initialized", True)
+
+
+@pytest.fixture
+def refreshed(monkeypatch, no_redis):
+    """Record refreshes instead of calling IGDB; one worker so order is observable."""
+    calls = []
+
+    async def fake_refresh(igdb_id, game_id):
+        calls.append(igdb_id)
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(refresh_coordinator, "_refresh", fake_refresh)
+    monkeypatch.setattr(settings, "REFRESH_MAX_CONCURRENCY", 1)
+    yield calls
+
+
+async def _drain():
+    for _ in range(20):
+        await asyncio.sleep(0)
+    await refresh_coordinator.shutdown()
+
+
+async def test_repeat_views_collapse_into_one_refresh(refreshed):
+    results = [refresh_coordinator.schedule_refresh(42, 1) for _ in range(500)]
+    await _drain()
+
+    assert results.count(True) == 1
+    assert refreshed == [42]
+
+
+async def test_most_viewed_game_refreshes_first(refreshed):
+    refresh_coordinator.schedule_refresh(1, 1)
+    for _ in range(3):
+        refresh_coordinator.schedule_refresh(2, 2)
+    refresh_coordinator.schedule_refresh(3, 3)
+    refresh_coordinator.schedule_refresh(3, 3)
+    await _drain()
+
+    assert refreshed == [2, 3, 1]
+
+
+async def test_lease_held_elsewhere_skips_refresh(monkeypatch):
+    class HeldLease:
+        async def set(self, key, value, nx=False, px=None):
+            return None
+
+    monkeypatch.setattr(cache, "_client", HeldLease())
+    monkeypatch.setattr(cache, "_initialized", True)
+    monkeypatch.setattr(refresh_coordinator, "_still_stale", lambda igdb_id: pytest.fail("ran without the lease"))
+    before = refresh_coordinator.stats()["lease_conflicts"]
+
+    await refresh_coordinator._refresh(7, 7)
+
+    assert refresh_coordinator.stats()["lease_conflicts"] == before + 1
+
+
+async def test_time_to_beat_batched_across_games(db_session, monkeypatch):
+    games = [Game(igdb_id=900 + i, name=f"Game {i}", slug=f"game-{i}") for i in range(3)]
+    db_session.add_all(games)
+    db_session.commit()
+    calls = []
+
+    async def fake_fetch(igdb_ids):
+        calls.append(sorted(igdb_ids))
+        return {900: {"normally": {"hours": 12}}, 901: {"normally": {"hours": 30}}}
+
+    monkeypatch.setattr(refresh_coordinator, "fetch_time_to_beat_by_ids_async", fake_fetch)
+    monkeypatch.setattr(refresh_coordinator, "TIME_TO_BEAT_BATCH_SECONDS", 0.01)
+    monkeypatch.setattr(db_setup, "SessionLocal", TestSessionLocal)
+
+    for g in games:
+        refresh_coordinator.schedule_time_to_beat(g.igdb_id, g.id)
+    await asyncio.sleep(0.05)
+    await refresh_coordinator.shutdown()
+
+    assert calls == [[900, 901, 902]]
+    for g in games:
+        db_session.refresh(g)
+    assert [g.time_to_beat for g in games] == [{"normally": {"hours": 12}}, {"normally": {"hours": 30}}, None]
@@ -119,6 +119,9 @@ class TestCreateReview:
         # IGDB's aggregate is never mutated by reviews.
         assert sample_game.total_rating == 80.0
         assert sample_game.total_rating_count == 10
+        # The persisted blend follows: (80 * 10 + 100 * 1) / 11 votes
+        assert sample_game.overall_rating == pytest.approx(900 / 11)
+        assert sample_game.overall_rating_count == 11
 
 
 class TestReadReview:
@@ -0,0 +1,156 @@
+# backend/tests/test_search.py
+"""
+Tests for game search (core/search_service.py).
+
+SQLite runs the ILIKE and difflib fallbacks end to end; the Postgres
+full-text and trigram paths are checked at the SQL level since the tests have
+no Postgres.
+"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.core import pagination, search_service, services
+from app.api.v1.models.game import Game
+
+
+def make_game(igdb_id, name, **fields):
+    return Game(igdb_id=igdb_id, name=name, slug=name.lower().replace(" ", "-"), **fields)
+
+
+def postgres_session():
+    """Just enough of a Session for search_service to pick the Postgres path."""
+    return SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=postgresql.dialect()))
+
+
+def test_sqlite_search_matches_name_and_summary(db_session):
+    db_session.add_all([
+        make_game(1, "Elden Ring", total_rating=95),
+        make_game(2, "Ring Fit Adventure", total_rating=80),
+        make_game(3, "Hollow Knight", summary="A ring of bugs", total_rating=90),
+    ])
+    db_session.commit()
+
+    results = search_service.search_games_in_db(db_session, "ring")
+
+    # Name matches first (by rating), then the summary-only match
+    assert [g.igdb_id for g in results] == [1, 2, 3]
+    assert search_service.count_search_results(db_session, "ring", category="games") == 2
+
+
+def test_postgres_search_uses_ranked_fulltext():
+    where_clause, sort_keys = search_service._search_filter(postgres_session(), "witcher 3", "all")
+    order_by = pagination.order_by(sort_keys, Game.id)
+    sql = str(select(Game.id).where(where_clause).order_by(*order_by).compile(dialect=postgresql.dialect()))
+
+    assert "games.search_vector @@" in sql
+    assert "websearch_to_tsquery" in sql
+    assert "ts_rank(games.search_vector" in sql
+    assert "ILIKE" not in sql.upper()
+
+
+def test_postgres_cursor_compares_the_rank_it_stored():
+    where_clause, sort_keys = search_service._search_filter(postgres_session(), "witcher", "all")
+    cursor = pagination.encode_cursor({"after": [1, 0.0607927, 90.0, 42]})
+    stmt = pagination.keyset(select(Game).where(where_clause), sort_keys, Game.id, limit=20, cursor=cursor)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    rank = "CAST(ts_rank(games.search_vector"
+    where, _, order = sql.partition("ORDER BY")
+    # A bare ts_rank is a real: the cursor's float never equals it again
+    assert where.count(rank) >= 2 and "AS DOUBLE PRECISION)" in where
+    assert rank in order
+    assert "ts_rank(games.search_vector" not in sql.replace(rank, "")
+
+
+def test_postgres_keeps_ilike_for_single_column_categories():
+    where_clause, _ = search_service._search_filter(postgres_session(), "fromsoftware", "developers")
+    sql = str(where_clause.compile(dialect=postgresql.dialect()))
+
+    assert "search_vector" not in sql
+    assert "ILIKE" in sql.upper()
+
+
+def test_fuzzy_search_tolerates_typos(db_session):
+    db_session.add_all([
+        make_game(1, "Elden Ring", total_rating_count=900),
+        make_game(2, "The Witcher 3: Wild Hunt", alt_names_search="|witcher 3|", total_rating_count=1500),
+        make_game(3, "Hollow Knight", total_rating_count=400),
+    ])
+    db_session.commit()
+
+    assert [g.igdb_id for g in search_service.fuzzy_search_games(db_session, "elden rign")] == [1]
+    assert [g.igdb_id for g in search_service.fuzzy_search_games(db_session, "witcher 3 wild hun")] == [2]
+    assert search_service.fuzzy_search_games(db_session, "zzzz") == []
+
+
+def test_postgres_fuzzy_search_uses_trigram_operators():
+    captured = {}
+
+    class Capture:
+        get_bind = staticmethod(postgres_session().get_bind)
+
+        def scalars(self, stmt):
+            captured["sql"] = str(stmt.compile(dialect=postgresql.dialect()))
+            return []
+
+    search_service.fuzzy_search_games(Capture(), "elden rign")
+
+    assert "games.name %% " in captured["sql"]
+    assert "<%% games.alt_names_search" in captured["sql"]
+    assert "similarity(games.name" in captured["sql"]
+
+
+@pytest.mark.asyncio
+async def test_misspelled_search_resolves_locally(client, db_session, monkeypatch):
+    db_session.add(make_game(1, "Elden Ring", total_rating_count=900))
+    db_session.commit()
+
+    async def no_igdb(*args, **kwargs):
+        pytest.fail("misspelled search went to IGDB")
+
+    monkeypatch.setattr(services, "fetch_from_igdb_async", no_igdb)
+
+    response = await client.get("/api/v1/search", params={"query": "elden rign", "category": "games"})
+    count = await client.get("/api/v1/search/count", params={"query": "elden rign", "category": "games"})
+
+    assert response.status_code == 200
+    assert [g["igdb_id"] for g in response.json()] == [1]
+    assert count.json() == {"total": 1}
+
+
+@pytest.mark.asyncio
+async def test_search_results_returns_page_total_and_cursor(client, db_session):
+    db_session.add_all([make_game(i, f"Ring Game {i}", total_rating=i) for i in range(1, 6)])
+    db_session.commit()
+
+    first = (await client.get("/api/v1/search/results", params={"query": "ring", "limit": 3})).json()
+    second = (await client.get(
+        "/api/v1/search/results", params={"query": "ring", "limit": 3, "cursor": first["next_cursor"]}
+    )).json()
+
+    assert [g["igdb_id"] for g in first["results"]] == [5, 4, 3]
+    assert (first["total"], first["total_capped"]) == (5, False)
+    assert [g["igdb_id"] for g in second["results"]] == [2, 1]
+    assert second["total"] == 5
+    assert second["next_cursor"] is None
+
+
+def test_search_page_count_stops_at_cap(db_session, monkeypatch):
+    monkeypatch.setattr(search_service, "SEARCH_COUNT_CAP", 3)
+    db_session.add_all([make_game(i, f"Ring Game {i}") for i in range(1, 6)])
+    db_session.commit()
+
+    games, total = search_service.search_games_page(db_session, "ring", limit=2)
+
+    assert len(games) == 2
+    assert total == 4
+
+
+@pytest.mark.asyncio
+async def test_search_results_rejects_bad_cursor(client):
+    response = await client.get("/api/v1/search/results", params={"query": "ring", "cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
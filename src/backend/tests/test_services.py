@@ -1,11 +1,18 @@
 # backend/tests/test_services.py
 """
 Tests for game data processing services.
-Tests focus on data transformation and quality validation logic.
+Tests focus on data transformation and quality validation logic, plus the
+bulk upsert used by IGDB sync batches and the persisted rating scores.
 """
 import pytest
-from backend.app.api.v1.core.services import process_igdb_data, meets_quality_requirements
+from datetime import datetime, timedelta
+
+from backend.app.api.v1.core.services import (
+    process_igdb_data, meets_quality_requirements, upsert_games, get_game_raw_data,
+    create_game, update_game, refresh_stats, is_stale, get_all_games,
+)
 from backend.app.api.v1.core.schemas import GameCreate
+from backend.app.api.v1.models.game import Game
 
 
 class TestProcessIgdbData:
@@ -222,3 +229,153 @@ class TestMeetsQualityRequirements:
         )
         
         assert meets_quality_requirements(game_data, log_warnings=False) is False
+
+
+def igdb_record(igdb_id, name, quality=True, **extra):
+    """A minimal IGDB record; quality=False drops the cover so it fails the filter."""
+    record = {"id": igdb_id, "name": name, "slug": name.lower().replace(" ", "-"), "summary": "About it."}
+    if quality:
+        record["cover"] = {"image_id": f"co{igdb_id}"}
+    record.update(extra)
+    return record
+
+
+class TestUpsertGames:
+    """Tests for the bulk INSERT ... ON CONFLICT path."""
+
+    def test_inserts_new_and_updates_existing(self, db_session):
+        db_session.add(Game(igdb_id=2, name="Old Name", time_to_beat={"normally": 36000}))
+        db_session.commit()
+
+        games = [
+            process_igdb_data(igdb_record(1, "Fresh Game")),
+            process_igdb_data(igdb_record(2, "New Name", quality=False, total_rating=91.0)),
+            process_igdb_data(igdb_record(3, "Coverless", quality=False)),
+        ]
+        new, updated, skipped = upsert_games(db_session, games)
+
+        assert (new, updated, skipped) == (1, 1, 1)
+        stored = {g.igdb_id: g for g in db_session.query(Game).all()}
+        assert set(stored) == {1, 2}
+        assert stored[2].name == "New Name" and stored[2].total_rating == 91.0
+        # Fields the processed record never set are left alone, as in update_game
+        assert stored[2].time_to_beat == {"normally": 36000}
+        assert get_game_raw_data(db_session, stored[1].id)["name"] == "Fresh Game"
+
+    def test_filter_existing_skips_low_quality_updates(self, db_session):
+        db_session.add(Game(igdb_id=4, name="Keep Me"))
+        db_session.commit()
+
+        result = upsert_games(
+            db_session, [process_igdb_data(igdb_record(4, "Worse", quality=False))], filter_existing=True
+        )
+
+        assert result == (0, 0, 1)
+        assert db_session.query(Game).filter_by(igdb_id=4).one().name == "Keep Me"
+
+    def test_duplicate_ids_in_batch_keep_last(self, db_session):
+        games = [
+            process_igdb_data(igdb_record(5, "First Pass")),
+            process_igdb_data(igdb_record(5, "Second Pass")),
+        ]
+
+        assert upsert_games(db_session, games) == (1, 0, 0)
+        assert db_session.query(Game).filter_by(igdb_id=5).one().name == "Second Pass"
+
+
+class TestContentHash:
+    """Unchanged IGDB data must not rewrite the game row."""
+
+    def test_unchanged_update_only_touches_checked_at(self, db_session):
+        record = igdb_record(6, "Same Game")
+        db_game = create_game(db_session, process_igdb_data(record))
+        long_ago = datetime(2020, 1, 1)
+        db_game.updated_at = long_ago
+        db_game.checked_at = long_ago
+        db_session.commit()
+        before = refresh_stats()["unchanged"]
+
+        update_game(db_session, db_game.id, process_igdb_data(record))
+
+        db_session.refresh(db_game)
+        assert db_game.updated_at == long_ago
+        assert db_game.checked_at > long_ago
+        assert refresh_stats()["unchanged"] == before + 1
+        assert not is_stale(db_game)
+
+    def test_changed_update_rewrites(self, db_session):
+        db_game = create_game(db_session, process_igdb_data(igdb_record(7, "Before")))
+        old_hash = db_game.content_hash
+
+        update_game(db_session, db_game.id, process_igdb_data(igdb_record(7, "After")))
+
+        db_session.refresh(db_game)
+        assert db_game.name == "After"
+        assert db_game.content_hash != old_hash
+
+    def test_bulk_skips_unchanged_rows(self, db_session):
+        games = [process_igdb_data(igdb_record(8, "Stable")), process_igdb_data(igdb_record(9, "Moving"))]
+        upsert_games(db_session, games)
+        stable = db_session.query(Game).filter_by(igdb_id=8).one()
+        stable_updated_at = stable.updated_at
+
+        result = upsert_games(db_session, [
+            process_igdb_data(igdb_record(8, "Stable")),
+            process_igdb_data(igdb_record(9, "Moved")),
+        ])
+
+        assert result == (0, 1, 0)
+        db_session.refresh(stable)
+        assert stable.updated_at == stable_updated_at
+        assert stable.checked_at >= stable_updated_at
+        assert db_session.query(Game).filter_by(igdb_id=9).one().name == "Moved"
+
+
+class TestRatingScores:
+    """overall_rating(_count) and weighted_score are stored on every write path."""
+
+    def test_orm_writes_keep_scores_current(self, db_session):
+        db_game = Game(igdb_id=10, name="Rated", rating=80.0, total_rating=90.0, total_rating_count=10)
+        db_session.add(db_game)
+        db_session.commit()
+
+        assert db_game.overall_rating == 90.0
+        assert db_game.overall_rating_count == 10
+        assert db_game.weighted_score == pytest.approx((10 * 80.0 + 50 * 7.0) / 60)
+
+        db_game.community_rating, db_game.community_rating_count = 60.0, 10
+        db_session.commit()
+
+        assert db_game.overall_rating == 75.0
+        assert db_game.overall_rating_count == 20
+
+    def test_bulk_upsert_blends_stored_community_rating(self, db_session):
+        db_session.add(Game(igdb_id=11, name="Reviewed", community_rating=100.0, community_rating_count=5))
+        db_session.commit()
+
+        upsert_games(db_session, [
+            process_igdb_data(igdb_record(11, "Reviewed", rating=70.0, total_rating=70.0, total_rating_count=20)),
+            process_igdb_data(igdb_record(12, "Unrated")),
+        ])
+
+        stored = {g.igdb_id: g for g in db_session.query(Game).all()}
+        assert stored[11].overall_rating == pytest.approx((70.0 * 20 + 100.0 * 5) / 25)
+        assert stored[11].overall_rating_count == 25
+        assert stored[11].weighted_score == pytest.approx((20 * 70.0 + 50 * 7.0) / 70)
+        assert stored[12].overall_rating is None and stored[12].weighted_score is None
+        # The SQL used by the bulk path matches the ORM's computation
+        for db_game in stored.values():
+            expected = (db_game.overall_rating, db_game.overall_rating_count, db_game.weighted_score)
+            db_game.refresh_rating_scores()
+            assert (db_game.overall_rating, db_game.overall_rating_count, db_game.weighted_score) == pytest.approx(expected)
+
+    def test_sorts_read_stored_scores(self, db_session):
+        db_session.add_all([
+            Game(igdb_id=13, name="Few Votes", rating=99.0, total_rating=99.0, total_rating_count=1),
+            Game(igdb_id=14, name="Many Votes", rating=85.0, total_rating=85.0, total_rating_count=5000),
+            Game(igdb_id=15, name="Community Only", community_rating=100.0, community_rating_count=3),
+        ])
+        db_session.commit()
+
+        assert [g.igdb_id for g in get_all_games(db_session, sort="rating")] == [14, 13]
+        assert [g.igdb_id for g in get_all_games(db_session, sort="overall_rating")] == [15, 13, 14]
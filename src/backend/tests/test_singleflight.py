@@ -0,0 +1,103 @@
+# backend/tests/test_singleflight.py
+"""
+Tests for single-flight deduplication (core/singleflight.py).
+
+Covers the in-process layer (concurrent callers share one run and its result
+or exception) and the Redis layer (a worker that loses the lock waits for the
+holder, then runs its own work).
+"""
+import asyncio
+
+import pytest
+
+from app.api.v1.core import cache, singleflight
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeLockRedis:
+    """Async Redis stand-in supporting just what the lock needs."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    async def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(cache, "_client", None)
+    monkeypatch.setattr(cache, "_initialized", True)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeLockRedis()
+    monkeypatch.setattr(cache, "_client", fake)
+    monkeypatch.setattr(cache, "_initialized", True)
+    monkeypatch.setattr(singleflight, "LOCK_POLL_SECONDS", 0.005)
+    return fake
+
+
+async def test_concurrent_callers_share_one_run(no_redis):
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "row"
+
+    results = await asyncio.gather(*(singleflight.do("game:1", work) for _ in range(10)))
+
+    assert results == ["row"] * 10
+    assert calls == 1
+
+
+async def test_exception_reaches_every_caller(no_redis):
+    async def work():
+        await asyncio.sleep(0.01)
+        raise LookupError("not on IGDB")
+
+    results = await asyncio.gather(
+        *(singleflight.do("game:2", work) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, LookupError) for r in results)
+    # The key is free again once the flight lands
+    assert await singleflight.do("game:2", lambda: asyncio.sleep(0, result="ok")) == "ok"
+
+
+async def test_lock_holder_blocks_other_workers(fake_redis):
+    # Another worker holds the lock for this key
+    fake_redis.store["singleflight:game:3"] = "other-worker"
+    order = []
+
+    async def release_later():
+        await asyncio.sleep(0.03)
+        order.append("released")
+        del fake_redis.store["singleflight:game:3"]
+
+    async def work():
+        order.append("work")
+        return "row"
+
+    releaser = asyncio.create_task(release_later())
+    assert await singleflight.do("game:3", work) == "row"
+    await releaser
+
+    assert order == ["released", "work"]
+    assert "singleflight:game:3" not in fake_redis.store
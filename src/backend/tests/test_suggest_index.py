@@ -0,0 +1,108 @@
+# backend/tests/test_suggest_index.py
+"""
+Tests for the in-memory typeahead index (core/suggest_index.py) and
+/search/suggest.
+"""
+import pytest
+
+from app.api.v1.core import suggest_index
+from app.api.v1.core.suggest_index import SuggestIndex
+from app.api.v1.models.game import Game
+
+
+def build(*games):
+    """Rows as loaded from the games table: (igdb_id, name, slug, cover, rating_count, alt_names_search)."""
+    return SuggestIndex.build([(i, name, None, None, count, alt) for i, name, count, alt in games])
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(suggest_index, "_index", SuggestIndex())
+    monkeypatch.setattr(suggest_index, "_loaded_at", None)
+
+
+def test_prefix_matches_names_alt_names_and_skips_leading_article():
+    index = build(
+        (1, "The Witcher 3: Wild Hunt", 5000, "|witcher3|"),
+        (2, "Wizardry", 100, None),
+        (3, "Grand Theft Auto V", 4000, "|gtav|gta5|"),
+    )
+
+    assert [s.igdb_id for s in index.suggest("wi")] == [1, 2]
+    assert [s.igdb_id for s in index.suggest("the witch")] == [1]
+    assert [s.igdb_id for s in index.suggest("witcher 3")] == [1]
+    assert [s.igdb_id for s in index.suggest("GTA")] == [3]
+    assert index.suggest("zelda") == []
+
+
+def test_long_and_short_prefixes_rank_by_rating_count():
+    index = build(*[(i, f"Star Game {i}", i * 10, None) for i in range(1, 30)])
+
+    assert [s.igdb_id for s in index.suggest("st", limit=3)] == [29, 28, 27]
+    assert [s.igdb_id for s in index.suggest("star game 1", limit=3)] == [19, 18, 17]
+
+
+def test_incremental_updates_keep_short_prefix_lists_exact():
+    index = build(*[(i, f"Halo {i}", 100 + i, None) for i in range(1, 15)])
+    assert index.suggest("ha", limit=1)[0].igdb_id == 14
+
+    index.upsert(99, "Hades", None, None, 10_000, None)
+    assert index.suggest("ha", limit=1)[0].igdb_id == 99
+
+    # Demoting the leader lets the next-best game back into the precomputed list
+    index.upsert(99, "Hades", None, None, 1, None)
+    assert [s.igdb_id for s in index.suggest("ha", limit=10)] == list(range(14, 4, -1))
+
+    index.remove(14)
+    assert index.suggest("ha", limit=1)[0].igdb_id == 13
+    assert index.suggest("halo 14") == []
+
+
+def test_writes_update_loaded_index(fresh_index, db_session):
+    from app.api.v1.core import game_service, schemas
+
+    suggest_index.load_from_db(db_session)
+    db_game = game_service.create_game(db_session, schemas.GameCreate(igdb_id=7, name="Celeste", slug="celeste"))
+    assert [s.name for s in suggest_index.suggest("cel")] == ["Celeste"]
+
+    game_service.mark_game_as_deleted(db_session, db_game.igdb_id)
+    assert suggest_index.suggest("cel") == []
+
+
+@pytest.mark.asyncio
+async def test_suggest_endpoint(fresh_index, client, db_session):
+    db_session.add_all([
+        Game(igdb_id=1, name="Elden Ring", slug="elden-ring", total_rating_count=900),
+        Game(igdb_id=2, name="Elder Scrolls Online", slug="eso", total_rating_count=300),
+    ])
+    db_session.commit()
+
+    # Nothing until the startup load has run, then answered from the index
+    before = await client.get("/api/v1/search/suggest", params={"query": "eld"})
+    suggest_index.load_from_db(db_session)
+    response = await client.get("/api/v1/search/suggest", params={"query": "eld"})
+
+    assert before.json() == []
+    assert response.status_code == 200
+    assert [(g["igdb_id"], g["slug"]) for g in response.json()] == [(1, "elden-ring"), (2, "eso")]
+
+
+def test_batch_upsert_matches_one_by_one(monkeypatch):
+    # Small enough batches are edited in place; force the one-pass merge
+    monkeypatch.setattr(suggest_index, "SPLICE_IN_PLACE_MAX", 0)
+    rows = [(i, f"Star Game {i}", None, None, i, f"|sg{i}|") for i in range(1, 40)]
+    one_by_one = build((100, "Halo", 50, None), (101, "Star Fox", 70, None))
+    batched = build((100, "Halo", 50, None), (101, "Star Fox", 70, None))
+
+    for row in rows:
+        one_by_one.upsert(*row)
+    batched.upsert_many(rows + [(101, "Star Fox 64", None, None, 5, None), (100, "Halo", None, None, 50, None)])
+    one_by_one.upsert(101, "Star Fox 64", None, None, 5, None)
+
+    assert batched._keys == one_by_one._keys == sorted(batched._keys)
+    assert sorted(zip(batched._keys, batched._ids, batched._scores)) == sorted(
+        zip(one_by_one._keys, one_by_one._ids, one_by_one._scores)
+    )
+    assert batched._top == one_by_one._top
+    assert [s.igdb_id for s in batched.suggest("star fox")] == [101]
+    assert batched.suggest("star fox 64")[0].total_rating_count == 5
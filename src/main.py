@@ -24,11 +24,20 @@ from backend.app.api.v1.models.user_platform_link import UserPlatformLink
 from backend.app.api.v1.models.password_reset_token import PasswordResetToken
 from backend.app.api.v1.models.email_verification import EmailVerification
 from backend.app.api.v1.models.user_oauth_account import UserOAuthAccount
+from backend.app.api.v1.models.game_raw_data import GameRawData
+from backend.app.api.v1.models.game_facet import GameFacet
+from backend.app.api.v1.models.discovery_ranking import DiscoveryRanking, DiscoveryList
 from scripts.scheduler.scheduler import init_scheduler
 from backend.app.api.v1.core.logging_config import configure_logging, request_id_ctx
 from backend.app.api.v1.core.security import csrf_protect_middleware
+from backend.app.api.v1.core.igdb_service import close_igdb_client
+from backend.app.api.v1.core.compression import CompressionMiddleware
+from backend.app.api.v1.core import (
+    cache, facet_index, igdb_governor, game_service, negative_cache, refresh_coordinator, suggest_index
+)
 from backend.app.api.settings import settings
 from starlette.middleware.sessions import SessionMiddleware
+import asyncio
 import logging
 import os
 import uuid
@@ -64,9 +73,20 @@ async def lifespan(app: FastAPI):
         logger.info("Scheduler started successfully")
     except Exception as e:
         logger.error(f"Failed to start scheduler: {str(e)}")
+    refresh_coordinator.start()
+    suggest_task = asyncio.create_task(suggest_index.keep_fresh())
+    facet_task = asyncio.create_task(facet_index.keep_fresh())
+    cache_task = asyncio.create_task(cache.listen_for_invalidations())
     
     yield
 
+    suggest_task.cancel()
+    facet_task.cancel()
+    cache_task.cancel()
+    await refresh_coordinator.shutdown()
+    # Release the pooled IGDB connections held by the shared async client.
+    await close_igdb_client()
+
 app = FastAPI(
     title="GameGloom API",
     description="API for GameGloom - Your Gaming Discovery Platform",
@@ -139,6 +159,12 @@ async def add_security_headers(request: Request, call_next):
     return response
 
 
+# gzip (or brotli, if installed) for JSON bodies over the threshold. Inside CORS so
+# preflights and CORS headers are untouched; the discovery lists arrive already
+# compressed from the cache and pass through.
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+
 # Registered last == outermost: CORS headers are applied to every response,
 # including early error returns from inner middleware (e.g. the CSRF 403).
 app.add_middleware(
@@ -147,6 +173,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -156,6 +183,26 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/igdb")
+async def igdb_health():
+    """Outbound IGDB throttle metrics: queue wait times and 429 counts since startup,
+    plus lookups the negative cache answered without calling IGDB."""
+    return {**igdb_governor.stats(), "negative_cache": negative_cache.stats()}
+
+
+@app.get("/health/cache")
+async def cache_health():
+    """Discovery cache lookups since startup by tier (in-process L1, Redis L2) and their hit ratios."""
+    return cache.stats()
+
+
+@app.get("/health/refreshes")
+async def refresh_health():
+    """Game refreshes since startup that changed data vs. no-ops caught by the content hash,
+    plus the background refresh queue (triggers collapsed, leases lost, queue depth)."""
+    return {**game_service.refresh_stats(), "coordinator": refresh_coordinator.stats()}
+
+
 # Include the routers
 app.include_router(games_router, prefix="/api/v1")
 app.include_router(auth_router, prefix="/api/v1")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Benchmark the in-memory facet index behind /games/browse.
+
+Builds FacetIndex from synthetic game and facet rows (as loaded from the games
+and game_facets tables) at each catalog size and reports:
+
+- build time and memory held by the index (tracemalloc)
+- browse() latency (filtering, facet counts and one sorted page) for one,
+  two and three combined filters, plus a year range and minimum rating
+  (p50 / p99 / max)
+- incremental upsert latency, as paid by create_game/update_game/webhooks,
+  over more than MAX_DIRTY writes (the slowest write is reported), and the
+  re-sort keep_fresh then runs: the snapshot taken on the event loop and the
+  sort done in a thread
+
+No database is needed.
+
+Usage:
+    cd src
+    python scripts/benchmarks/bench_facets.py --sizes 20000 200000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.abspath('.'))
+
+# Settings validate on import; the benchmark never touches the database.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("IGDB_CLIENT_ID", "bench")
+os.environ.setdefault("IGDB_ACCESS_TOKEN", "bench")
+os.environ.setdefault("IGDB_WEBHOOK_SECRET", "bench")
+
+from backend.app.api.v1.core.facet_index import FacetIndex, MAX_DIRTY, SORTS
+
+# Roughly IGDB's vocabulary sizes per kind
+VOCABULARY = {
+    "genre": [f"genre-{i}" for i in range(23)],
+    "theme": [f"theme-{i}" for i in range(22)],
+    "platform": [f"platform-{i}" for i in range(60)],
+    "game_mode": [f"mode-{i}" for i in range(6)],
+    "player_perspective": [f"perspective-{i}" for i in range(7)],
+}
+
+
+def synthetic_facets(rng: random.Random) -> dict[str, list[str]]:
+    # Skewed picks so a few values are common, like "indie" or "pc-microsoft-windows"
+    return {
+        kind: list({values[min(int(rng.expovariate(0.25)), len(values) - 1)] for _ in range(rng.randint(0, 3))})
+        for kind, values in VOCABULARY.items()
+    }
+
+
+def synthetic_game(igdb_id: int, rng: random.Random) -> tuple:
+    rated = rng.random() < 0.6
+    released = datetime(rng.randint(1980, 2025), rng.randint(1, 12), 1) if rng.random() < 0.9 else None
+    return (
+        igdb_id,
+        f"Game {rng.randint(0, 10 ** 9)}",
+        rng.uniform(20, 99) if rated else None,
+        rng.randint(1, 5000) if rated else None,
+        rng.uniform(2, 10) if rated else None,
+        released,
+    )
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def bench_size(n: int, queries: int, rng: random.Random) -> None:
+    games = [synthetic_game(igdb_id, rng) for igdb_id in range(1, n + 1)]
+    facets_by_game = {game[0]: synthetic_facets(rng) for game in games}
+    facet_rows = [
+        (igdb_id, kind, slug)
+        for igdb_id, facets in facets_by_game.items()
+        for kind, slugs in facets.items()
+        for slug in slugs
+    ]
+
+    started = time.perf_counter()
+    index = FacetIndex.build(games, facet_rows)
+    build_s = time.perf_counter() - started
+
+    # Measured on a second build: tracemalloc slows allocation down considerably
+    del index
+    tracemalloc.start()
+    index = FacetIndex.build(games, facet_rows)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{n:>7} games: {len(facet_rows)} facet rows, built in {build_s:.2f}s, index holds {held / 1024 / 1024:.1f} MiB")
+
+    kinds = list(VOCABULARY)
+    for filter_count in (1, 2, 3):
+        timings = []
+        for _ in range(queries):
+            filters = {
+                kind: rng.sample(VOCABULARY[kind][:8], rng.randint(1, 2))
+                for kind in rng.sample(kinds, filter_count)
+            }
+            options = {"sort": rng.choice(SORTS), "offset": rng.choice((0, 0, 50, 200))}
+            if rng.random() < 0.3:
+                options.update(year_from=2010, year_to=2020, min_rating=70)
+            start = time.perf_counter()
+            index.browse(filters, **options)
+            timings.append((time.perf_counter() - start) * 1_000)
+        print(
+            f"    {filter_count} filter kind(s)   p50 {statistics.median(timings):7.2f} ms"
+            f"   p99 {percentile(timings, 0.99):7.2f} ms   max {max(timings):8.2f} ms"
+        )
+
+    # Past MAX_DIRTY, so any re-sort a write triggered would show up in max
+    timings = []
+    for _ in range(2 * MAX_DIRTY + 1):
+        igdb_id, name, *_ = rng.choice(games)
+        _, _, total_rating, rating_count, rating, released = synthetic_game(igdb_id, rng)
+        start = time.perf_counter()
+        index.upsert(igdb_id, name, synthetic_facets(rng), total_rating, rating_count, rating, released)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    print(
+        f"    upsert x{len(timings)}        p50 {statistics.median(timings):7.1f} us"
+        f"   p99 {percentile(timings, 0.99):7.1f} us   max {max(timings):8.1f} us"
+    )
+
+    start = time.perf_counter()
+    snapshot = index.sort_snapshot()
+    snapshot_ms = (time.perf_counter() - start) * 1_000
+    start = time.perf_counter()
+    orders = FacetIndex.sorted_orders(snapshot)
+    sort_ms = (time.perf_counter() - start) * 1_000
+    index.install_orders(orders)
+    print(f"    re-sort             snapshot (on loop) {snapshot_ms:7.2f} ms   sort (in thread) {sort_ms:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /games/browse facet index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 200000], help="Catalog sizes (default: 20000 200000)")
+    parser.add_argument("--queries", type=int, default=500, help="Browse calls per filter count (default: 500)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for n in args.sizes:
+        bench_size(n, args.queries, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Benchmark the shared pooled IGDB client against a client-per-call baseline.
+
+Starts a local stub IGDB server (plain HTTP/1.1 with keep-alive) and times
+200 sequential and 200 concurrent single-game fetches two ways:
+
+- unpooled: a fresh httpx.AsyncClient per call (the old fetch_from_igdb_async)
+- pooled:   fetch_from_igdb_async via the shared client from get_igdb_client()
+
+The stub has no TLS, so the numbers understate the real saving against
+api.igdb.com, where every new connection also pays a TLS handshake.
+
+Usage:
+    cd src
+    python scripts/benchmarks/bench_igdb_client.py --requests 200 --latency-ms 2
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath('.'))
+
+# Settings validate on import; the benchmark never touches the database.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("IGDB_CLIENT_ID", "bench")
+os.environ.setdefault("IGDB_ACCESS_TOKEN", "bench")
+os.environ.setdefault("IGDB_WEBHOOK_SECRET", "bench")
+
+import httpx
+
+from backend.app.api.settings import settings
+from backend.app.api.v1.core import igdb_service
+
+STUB_GAME = json.dumps([{"id": 1942, "name": "The Witcher 3: Wild Hunt", "slug": "the-witcher-3-wild-hunt"}]).encode()
+
+
+def start_stub_server(latency_ms: float) -> ThreadingHTTPServer:
+    """Serve a canned IGDB game payload on 127.0.0.1 in a background thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like api.igdb.com
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(STUB_GAME)))
+            self.end_headers()
+            self.wfile.write(STUB_GAME)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 512  # the unpooled run opens a connection per request
+
+    server = Server(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def fetch_unpooled(game_id: int) -> dict:
+    """The pre-pool behaviour: one client, and one connection, per call."""
+    async with httpx.AsyncClient(timeout=10) as client:
+        response = await client.post(
+            f"{settings.IGDB_API_BASE}/games",
+            headers=igdb_service._igdb_headers(),
+            content=f"{igdb_service.IGDB_GAME_FIELDS} where id = {game_id};",
+        )
+        response.raise_for_status()
+        return response.json()[0]
+
+
+async def fetch_pooled(game_id: int) -> dict:
+    return await igdb_service.fetch_from_igdb_async(game_id=game_id)
+
+
+async def timed(fetch, game_id: int) -> float:
+    start = time.perf_counter()
+    await fetch(game_id)
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_sequential(fetch, n: int) -> list[float]:
+    return [await timed(fetch, i) for i in range(n)]
+
+
+async def run_concurrent(fetch, n: int) -> list[float]:
+    return list(await asyncio.gather(*(timed(fetch, i) for i in range(n))))
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(label: str, samples: list[float], wall_ms: float) -> None:
+    print(
+        f"  {label:<10} p50 {percentile(samples, 50):7.2f} ms   p99 {percentile(samples, 99):7.2f} ms"
+        f"   mean {statistics.mean(samples):7.2f} ms   wall {wall_ms:8.1f} ms"
+    )
+
+
+async def main_async(n: int) -> None:
+    for mode, runner in (("sequential", run_sequential), ("concurrent", run_concurrent)):
+        print(f"{n} {mode} game fetches:")
+        for label, fetch in (("unpooled", fetch_unpooled), ("pooled", fetch_pooled)):
+            await runner(fetch, 5)  # warm-up (and open the pool)
+            start = time.perf_counter()
+            samples = await runner(fetch, n)
+            report(label, samples, (time.perf_counter() - start) * 1000)
+    await igdb_service.close_igdb_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs unpooled IGDB fetches")
+    parser.add_argument("--requests", type=int, default=200, help="Fetches per scenario (default: 200)")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Stub server latency per request (default: 2ms)")
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency_ms)
+    settings.IGDB_API_BASE = f"http://127.0.0.1:{server.server_address[1]}"
+    # Lift the 4 req/s IGDB throttle so only the transport is measured.
+    settings.IGDB_RATE_LIMIT = 1_000_000
+    try:
+        asyncio.run(main_async(args.requests))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
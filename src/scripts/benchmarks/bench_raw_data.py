@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+Benchmark list-endpoint cost with raw_data inline on games vs in game_raw_data.
+
+Seeds a throwaway SQLite database with synthetic IGDB-sized games, then times
+what a discovery endpoint does for one page of 100 games: select the rows,
+build schemas.Game for each, and JSON-encode the list (the Redis cache value).
+
+- before: games carries the raw_data JSON column, so every select reads and
+          decodes the full IGDB payload even though no schema exposes it
+- after:  the payload sits gzip-compressed in game_raw_data and list queries
+          never touch it
+
+Usage:
+    cd src
+    python scripts/benchmarks/bench_raw_data.py --games 2000 --page 100
+"""
+import os
+import sys
+import json
+import gzip
+import time
+import random
+import argparse
+import statistics
+import tempfile
+
+sys.path.append(os.path.abspath('.'))
+
+# Settings validate on import; point them at a throwaway database.
+_db_dir = tempfile.mkdtemp(prefix="bench_raw_data_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench.db"
+os.environ.setdefault("IGDB_CLIENT_ID", "bench")
+os.environ.setdefault("IGDB_ACCESS_TOKEN", "bench")
+os.environ.setdefault("IGDB_WEBHOOK_SECRET", "bench")
+
+from sqlalchemy import create_engine, text
+
+from backend.app.api.db_setup import Base
+from backend.app.api.v1.core import schemas
+from backend.app.api.v1.core.igdb_service import process_igdb_data
+from backend.app.api.v1.models.game import Game
+from backend.app.api.v1.models.game_raw_data import GameRawData
+
+
+def synthetic_igdb_game(igdb_id: int, rng: random.Random) -> dict:
+    """An IGDB games record shaped (and sized) like a real IGDB_GAME_FIELDS response."""
+    words = ["shadow", "crown", "star", "iron", "echo", "frontier", "legend", "void", "ember", "tide"]
+    name = " ".join(rng.choice(words).title() for _ in range(3))
+    return {
+        "id": igdb_id,
+        "name": name,
+        "slug": f"{name.lower().replace(' ', '-')}-{igdb_id}",
+        "summary": " ".join(rng.choice(words) for _ in range(120)),
+        "storyline": " ".join(rng.choice(words) for _ in range(200)),
+        "cover": {"id": igdb_id, "image_id": f"co{igdb_id:05x}"},
+        "rating": rng.uniform(40, 95),
+        "total_rating": rng.uniform(40, 95),
+        "total_rating_count": rng.randint(1, 3000),
+        "hypes": rng.randint(0, 500),
+        "first_release_date": rng.randint(946684800, 1767225600),
+        "genres": [{"id": i, "name": rng.choice(words).title()} for i in range(3)],
+        "themes": [{"id": i, "name": rng.choice(words).title()} for i in range(3)],
+        "platforms": [{"id": i, "name": f"Platform {i}"} for i in range(6)],
+        "game_modes": [{"id": 1, "name": "Single player"}, {"id": 2, "name": "Multiplayer"}],
+        "player_perspectives": [{"id": 1, "name": "Third person"}],
+        "screenshots": [{"id": i, "image_id": f"sc{igdb_id:05x}{i}"} for i in range(12)],
+        "artworks": [{"id": i, "image_id": f"ar{igdb_id:05x}{i}"} for i in range(8)],
+        "videos": [{"id": i, "video_id": f"v{igdb_id}{i}", "name": "Trailer"} for i in range(4)],
+        "involved_companies": [
+            {"id": i, "company": {"id": i, "name": f"Studio {i}"}, "developer": i == 0, "publisher": i == 1}
+            for i in range(4)
+        ],
+        "similar_games": [
+            {"id": igdb_id * 10 + i, "name": f"Similar {i}", "cover": {"image_id": f"co{i}"},
+             "rating": 70.0, "genres": [{"name": "Adventure"}]}
+            for i in range(10)
+        ],
+        "alternative_names": [{"id": i, "name": f"{name} {i}"} for i in range(5)],
+        "keywords": [{"id": i, "name": rng.choice(words)} for i in range(30)],
+        "age_ratings": [{"id": i, "rating_category": {"rating": "PEGI 16"}} for i in range(2)],
+        "language_supports": [
+            {"id": i, "language": {"name": f"Language {i}"}, "language_support_type": {"name": "Audio"}}
+            for i in range(20)
+        ],
+    }
+
+
+def seed(engine, n: int) -> None:
+    Base.metadata.create_all(bind=engine, tables=[Game.__table__, GameRawData.__table__])
+    rng = random.Random(42)
+    columns = [c.name for c in Game.__table__.columns if c.name not in ("id", "created_at", "updated_at", "is_deleted")]
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE games_before AS SELECT * FROM games WHERE 0"))
+        conn.execute(text("ALTER TABLE games_before ADD COLUMN raw_data JSON"))
+        for igdb_id in range(1, n + 1):
+            payload = synthetic_igdb_game(igdb_id, rng)
+            data = process_igdb_data(payload).model_dump()
+            raw_data = data.pop("raw_data")
+            row = {k: json.dumps(v) if isinstance(v, (list, dict)) else v for k, v in data.items() if k in columns}
+            row.update(id=igdb_id, created_at="2026-01-01 00:00:00", updated_at="2026-01-01 00:00:00", is_deleted=False)
+            names = ", ".join(row)
+            params = ", ".join(f":{k}" for k in row)
+            conn.execute(text(f"INSERT INTO games ({names}) VALUES ({params})"), row)
+            conn.execute(
+                text(f"INSERT INTO games_before ({names}, raw_data) VALUES ({params}, :raw_data)"),
+                {**row, "raw_data": json.dumps(raw_data)},
+            )
+            conn.execute(
+                text("INSERT INTO game_raw_data (game_id, encoding, data, updated_at) VALUES (:id, 'gzip', :data, :updated_at)"),
+                {
+                    "id": igdb_id,
+                    "data": gzip.compress(json.dumps(raw_data, separators=(",", ":")).encode(), compresslevel=6),
+                    "updated_at": row["updated_at"],
+                },
+            )
+
+
+JSON_COLUMNS = {c.name for c in Game.__table__.columns if c.type.__class__.__name__ == "JSON"} | {"raw_data"}
+
+
+def load_page(engine, table: str, page: int) -> tuple[list[dict], int]:
+    """Select one list page like the ORM would: every column, JSON columns decoded."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT * FROM {table} ORDER BY hypes DESC LIMIT :page"), {"page": page}).mappings().all()
+    bytes_read = sum(len(v) if isinstance(v, (str, bytes)) else 8 for row in rows for v in row.values() if v is not None)
+    decoded = [
+        {k: json.loads(v) if k in JSON_COLUMNS and isinstance(v, str) else v for k, v in row.items()}
+        for row in rows
+    ]
+    return decoded, bytes_read
+
+
+def serialize(rows: list[dict]) -> str:
+    return json.dumps([schemas.Game.model_validate(r).model_dump(mode="json") for r in rows])
+
+
+def bench(engine, table: str, page: int, rounds: int) -> tuple[float, float, int, int]:
+    load_ms, total_ms = [], []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        rows, bytes_read = load_page(engine, table, page)
+        loaded = time.perf_counter()
+        body = serialize(rows)
+        done = time.perf_counter()
+        load_ms.append((loaded - start) * 1000)
+        total_ms.append((done - start) * 1000)
+    return statistics.median(load_ms), statistics.median(total_ms), bytes_read, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark raw_data inline vs out of line")
+    parser.add_argument("--games", type=int, default=2000, help="Games to seed (default: 2000)")
+    parser.add_argument("--page", type=int, default=100, help="Games per list page (default: 100)")
+    parser.add_argument("--rounds", type=int, default=30, help="Timed rounds per variant (default: 30)")
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    print(f"Seeding {args.games} games into {os.environ['DATABASE_URL']} ...")
+    seed(engine, args.games)
+
+    with engine.connect() as conn:
+        inline = conn.execute(text("SELECT AVG(LENGTH(raw_data)) FROM games_before")).scalar()
+        packed = conn.execute(text("SELECT AVG(LENGTH(data)) FROM game_raw_data")).scalar()
+    print(f"raw_data per game: {inline / 1024:.1f} KiB inline JSON -> {packed / 1024:.1f} KiB gzip")
+
+    print(f"One list page of {args.page} games (median of {args.rounds}):")
+    for label, table in (("before", "games_before"), ("after", "games")):
+        load_ms, total_ms, bytes_read, body_bytes = bench(engine, table, args.page, args.rounds)
+        print(
+            f"  {label:<7} read {bytes_read / 1024:8.1f} KiB from DB   load {load_ms:7.2f} ms"
+            f"   load+serialize {total_ms:7.2f} ms   response/cache value {body_bytes / 1024:7.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
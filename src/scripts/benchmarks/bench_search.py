@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark /search on a synthetic catalog: eight-way ILIKE vs ranked full-text.
+
+Needs PostgreSQL (tsvector and GIN don't exist on SQLite). Seeds a scratch
+schema with synthetic games, lets the after_create DDL on the games table add
+the generated search_vector column and its GIN index, then times one page of
+results for a mix of queries two ways:
+
+- ilike:    the old predicate (name, alt names, summary, storyline, genres,
+            themes, developers, keywords with ILIKE '%q%'), a sequential scan
+- fulltext: search_vector @@ websearch_to_tsquery(...) ordered by ts_rank
+
+The scratch schema is dropped afterwards unless --keep is given.
+
+Usage:
+    cd src
+    python scripts/benchmarks/bench_search.py --database-url postgresql://localhost/gamegloom_bench --games 100000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.append(os.path.abspath('.'))
+
+# Settings validate on import; the benchmark uses its own engine.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("IGDB_CLIENT_ID", "bench")
+os.environ.setdefault("IGDB_ACCESS_TOKEN", "bench")
+os.environ.setdefault("IGDB_WEBHOOK_SECRET", "bench")
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session
+
+from backend.app.api.db_setup import Base
+from backend.app.api.v1.core.pagination import order_by
+from backend.app.api.v1.core.search_service import _ilike_filter, _fulltext_filter
+from backend.app.api.v1.models.game import Game
+
+SCHEMA = "bench_search"
+WORDS = [
+    "shadow", "crown", "star", "iron", "echo", "frontier", "legend", "void", "ember", "tide",
+    "witcher", "knight", "dragon", "empire", "galaxy", "racer", "souls", "city", "ring", "hunt",
+]
+STUDIOS = [f"Studio {name.title()}" for name in WORDS]
+QUERIES = ["witcher", "dragon knight", "iron empire", "studio ember", "galaxy racer 3", "souls -dragon"]
+
+
+def synthetic_game(igdb_id: int, rng: random.Random) -> dict:
+    name = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(2, 4)))
+    alt = f"{name} {rng.randint(2, 5)}"
+    return {
+        "igdb_id": igdb_id,
+        "name": f"{name} {igdb_id % 7 or ''}".strip(),
+        "slug": f"{name.lower().replace(' ', '-')}-{igdb_id}",
+        "summary": " ".join(rng.choice(WORDS) for _ in range(60)),
+        "storyline": " ".join(rng.choice(WORDS) for _ in range(80)),
+        "genres": "Adventure, Role-playing (RPG)",
+        "themes": "Fantasy",
+        "developers": rng.choice(STUDIOS),
+        "alternative_names": [alt],
+        "alt_names_search": f"|{alt.lower()}|",
+        "keywords": [rng.choice(WORDS) for _ in range(8)],
+        "total_rating": rng.uniform(40, 95),
+        "total_rating_count": rng.randint(1, 3000),
+        "is_deleted": False,
+    }
+
+
+def seed(engine, n: int) -> None:
+    Base.metadata.create_all(bind=engine, tables=[Game.__table__])
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        for start in range(1, n + 1, 5000):
+            conn.execute(insert(Game), [synthetic_game(i, rng) for i in range(start, min(start + 5000, n + 1))])
+        conn.execute(text("ANALYZE games"))
+
+
+def bench(engine, build, query: str, page: int, rounds: int) -> tuple[float, int]:
+    where_clause, sort_keys = build(query, "all")
+    stmt = select(Game.id, Game.name).where(where_clause).order_by(*order_by(sort_keys, Game.id)).limit(page)
+    timings = []
+    with Session(engine) as db:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            rows = db.execute(stmt).all()
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ILIKE vs full-text game search")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), help="PostgreSQL URL (or BENCH_DATABASE_URL)")
+    parser.add_argument("--games", type=int, default=100000, help="Games to seed (default: 100000)")
+    parser.add_argument("--page", type=int, default=50, help="Results per page (default: 50)")
+    parser.add_argument("--rounds", type=int, default=10, help="Timed rounds per query (default: 10)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    args = parser.parse_args()
+
+    if not args.database_url or not args.database_url.startswith("postgresql"):
+        sys.exit("A PostgreSQL --database-url is required (full-text search is Postgres-only)")
+
+    admin = create_engine(args.database_url)
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    engine = create_engine(args.database_url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+
+    try:
+        print(f"Seeding {args.games} games into schema {SCHEMA} ...")
+        started = time.perf_counter()
+        seed(engine, args.games)
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+        print(f"One page of {args.page} results (median of {args.rounds}):")
+        for query in QUERIES:
+            ilike_ms, ilike_rows = bench(engine, _ilike_filter, query, args.page, args.rounds)
+            fts_ms, fts_rows = bench(engine, _fulltext_filter, query, args.page, args.rounds)
+            print(
+                f"  {query!r:<18} ilike {ilike_ms:8.2f} ms ({ilike_rows:>3} rows)"
+                f"   fulltext {fts_ms:8.2f} ms ({fts_rows:>3} rows)   {ilike_ms / fts_ms:6.1f}x"
+            )
+    finally:
+        engine.dispose()
+        if not args.keep:
+            with admin.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        admin.dispose()
+
+
+if __name__ == "__main__":
+    main()
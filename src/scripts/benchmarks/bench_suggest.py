@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Benchmark the in-memory typeahead index behind /search/suggest.
+
+Builds SuggestIndex from synthetic game rows (names plus alt_names_search, as
+loaded from the games table) at each catalog size and reports:
+
+- build time and memory held by the index (tracemalloc)
+- suggest() latency for prefixes of 1-12 characters, typed the way a user
+  would type an existing title (p50 / p99 / max)
+- incremental upsert latency, as paid by create_game/update_game/webhooks
+
+No database is needed.
+
+Usage:
+    cd src
+    python scripts/benchmarks/bench_suggest.py --sizes 20000 200000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.append(os.path.abspath('.'))
+
+# Settings validate on import; the benchmark never touches the database.
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("IGDB_CLIENT_ID", "bench")
+os.environ.setdefault("IGDB_ACCESS_TOKEN", "bench")
+os.environ.setdefault("IGDB_WEBHOOK_SECRET", "bench")
+
+from backend.app.api.v1.core.matching_utils import normalize_for_match
+from backend.app.api.v1.core.suggest_index import SuggestIndex
+
+WORDS = [
+    "shadow", "crown", "star", "iron", "echo", "frontier", "legend", "void", "ember", "tide",
+    "witcher", "knight", "dragon", "empire", "galaxy", "racer", "souls", "city", "ring", "hunt",
+    "dark", "final", "fantasy", "super", "mario", "zelda", "halo", "doom", "quest", "tales",
+]
+
+
+def synthetic_rows(n: int, rng: random.Random) -> list[tuple]:
+    rows = []
+    for igdb_id in range(1, n + 1):
+        words = [rng.choice(WORDS).title() for _ in range(rng.randint(1, 4))]
+        if rng.random() < 0.15:
+            words.insert(0, "The")
+        name = " ".join(words) + (f" {rng.randint(2, 9)}" if rng.random() < 0.3 else "")
+        alts = [normalize_for_match(f"{name} {suffix}") for suffix in rng.sample(["HD", "Remastered", "GOTY"], rng.randint(0, 2))]
+        alt_names_search = "|" + "|".join(alts) + "|" if alts else None
+        rows.append((igdb_id, name, name.lower().replace(" ", "-"), None, rng.randint(0, 5000), alt_names_search))
+    return rows
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def bench_size(n: int, queries: int, rng: random.Random) -> None:
+    rows = synthetic_rows(n, rng)
+
+    started = time.perf_counter()
+    index = SuggestIndex.build(rows)
+    build_s = time.perf_counter() - started
+
+    # Measured on a second build: tracemalloc slows allocation down considerably
+    del index
+    tracemalloc.start()
+    index = SuggestIndex.build(rows)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{n:>7} games: {len(index._keys)} keys, built in {build_s:.2f}s, index holds {held / 1024 / 1024:.1f} MiB")
+
+    for lengths in ((1, 3), (4, 6), (7, 12)):
+        timings = []
+        for _ in range(queries):
+            name = rng.choice(rows)[1]
+            prefix = name[:rng.randint(*lengths)]
+            start = time.perf_counter()
+            index.suggest(prefix, limit=8)
+            timings.append((time.perf_counter() - start) * 1_000_000)
+        print(
+            f"    prefix {lengths[0]:>2}-{lengths[1]:<2} chars  p50 {statistics.median(timings):7.1f} us"
+            f"   p99 {percentile(timings, 0.99):7.1f} us   max {max(timings):8.1f} us"
+        )
+
+    timings = []
+    for i in range(min(queries, 2000)):
+        igdb_id, name, slug, cover, _, alt = rng.choice(rows)
+        start = time.perf_counter()
+        index.upsert(igdb_id, name, slug, cover, rng.randint(0, 5000), alt)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    print(f"    upsert              p50 {statistics.median(timings):7.1f} us   p99 {percentile(timings, 0.99):7.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the typeahead prefix index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 200000], help="Catalog sizes (default: 20000 200000)")
+    parser.add_argument("--queries", type=int, default=20000, help="Lookups per prefix-length band (default: 20000)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for n in args.sizes:
+        bench_size(n, args.queries, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,6 @@ Usage:
 """
 import os
 import sys
-import time
 import argparse
 import logging
 from datetime import datetime, timedelta
@@ -35,6 +34,7 @@ try:
     from backend.app.api.db_setup import init_db, get_db
     from backend.app.api.v1.core.services import (
         fetch_from_igdb, 
+        fetch_games_by_ids,
         process_igdb_data, 
         get_game_by_igdb_id, 
         update_game, 
@@ -47,14 +47,20 @@ except ImportError as e:
     sys.exit(1)
 
 
-def update_single_game(db, igdb_id: int) -> bool:
+# Ids per IGDB request when prefetching a batch of games (IGDB's max is 500).
+PREFETCH_BATCH_SIZE = 500
+
+
+def update_single_game(db, igdb_id: int, igdb_data: dict | None = None) -> bool:
     """
     Fetch and update a single game by IGDB ID.
+    Pass igdb_data when the record was already prefetched in a batch.
     Returns True if successful, False otherwise.
     """
     try:
-        logger.info(f"Fetching game {igdb_id} from IGDB...")
-        igdb_data = fetch_from_igdb(game_id=igdb_id)
+        if igdb_data is None:
+            logger.info(f"Fetching game {igdb_id} from IGDB...")
+            igdb_data = fetch_from_igdb(game_id=igdb_id)
         
         if not igdb_data:
             logger.warning(f"No data returned from IGDB for game {igdb_id}")
@@ -106,14 +112,18 @@ def update_games_by_ids(igdb_ids: list[int]):
     fail_count = 0
     
     try:
-        for igdb_id in igdb_ids:
-            if update_single_game(db, igdb_id):
-                success_count += 1
-            else:
-                fail_count += 1
-            
-            # Rate limiting - IGDB allows ~4 requests per second
-            time.sleep(0.3)
+        for i in range(0, len(igdb_ids), PREFETCH_BATCH_SIZE):
+            chunk = igdb_ids[i:i + PREFETCH_BATCH_SIZE]
+            logger.info(f"Fetching {len(chunk)} games from IGDB...")
+            records = fetch_games_by_ids(chunk)
+            for igdb_id in chunk:
+                if igdb_id not in records:
+                    logger.warning(f"No data returned from IGDB for game {igdb_id}")
+                    fail_count += 1
+                elif update_single_game(db, igdb_id, records[igdb_id]):
+                    success_count += 1
+                else:
+                    fail_count += 1
         
         db.commit()
         
@@ -138,8 +148,8 @@ def update_stale_games(days: int, limit: int = 500):
         threshold = datetime.utcnow() - timedelta(days=days)
         
         stale_games = db.query(Game).filter(
-            Game.updated_at < threshold
-        ).order_by(Game.updated_at.asc()).limit(limit).all()
+            Game.last_checked_at < threshold
+        ).order_by(Game.last_checked_at.asc()).limit(limit).all()
         
         logger.info(f"Found {len(stale_games)} stale games")
         
@@ -150,15 +160,19 @@ def update_stale_games(days: int, limit: int = 500):
         success_count = 0
         fail_count = 0
         
+        records = {}
+        for i in range(0, len(stale_games), PREFETCH_BATCH_SIZE):
+            records.update(fetch_games_by_ids([g.igdb_id for g in stale_games[i:i + PREFETCH_BATCH_SIZE]]))
+        
         for game in stale_games:
-            if update_single_game(db, game.igdb_id):
+            if game.igdb_id not in records:
+                logger.warning(f"No data returned from IGDB for game {game.igdb_id}")
+                fail_count += 1
+            elif update_single_game(db, game.igdb_id, records[game.igdb_id]):
                 success_count += 1
             else:
                 fail_count += 1
             
-            # Rate limiting
-            time.sleep(0.3)
-            
             # Commit periodically
             if (success_count + fail_count) % 50 == 0:
                 db.commit()
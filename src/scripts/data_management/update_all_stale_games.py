@@ -48,14 +48,14 @@ def get_stats(db):
     
     total = db.query(func.count(Game.id)).scalar()
     stale_7d = db.query(func.count(Game.id)).filter(
-        Game.updated_at < now - timedelta(days=7)
+        Game.last_checked_at < now - timedelta(days=7)
     ).scalar()
     stale_30d = db.query(func.count(Game.id)).filter(
-        Game.updated_at < now - timedelta(days=30)
+        Game.last_checked_at < now - timedelta(days=30)
     ).scalar()
     
-    oldest = db.query(Game.name, Game.updated_at).order_by(
-        Game.updated_at.asc()
+    oldest = db.query(Game.name, Game.last_checked_at).order_by(
+        Game.last_checked_at.asc()
     ).first()
     
     return {
@@ -111,8 +111,8 @@ def update_all_stale(min_age_days: int = 7, batch_size: int = 100, dry_run: bool
         threshold = now - timedelta(days=min_age_days)
         
         stale_games = db.query(Game).filter(
-            Game.updated_at < threshold
-        ).order_by(Game.updated_at.asc()).all()
+            Game.last_checked_at < threshold
+        ).order_by(Game.last_checked_at.asc()).all()
         
         total_stale = len(stale_games)
         if total_stale == 0:
@@ -139,8 +139,6 @@ def update_all_stale(min_age_days: int = 7, batch_size: int = 100, dry_run: bool
                 rate = (i + 1) / elapsed
                 remaining = (total_stale - i - 1) / rate
                 print(f"Progress: {i+1}/{total_stale} ({success} ok, {failed} fail) - ETA: {remaining/60:.1f}m")
-            
-            time.sleep(0.3)  # Rate limit
         
         db.commit()
         
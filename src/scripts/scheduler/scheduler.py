@@ -2,7 +2,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime, timedelta, UTC
 from backend.app.api.db_setup import SessionLocal
-from backend.app.api.v1.core import services
+from backend.app.api.v1.core import cache, services
 from backend.app.api.v1.models.token import Token
 from backend.app.api.v1.models.password_reset_token import PasswordResetToken
 from backend.app.api.v1.models.email_verification import EmailVerification
@@ -22,6 +22,8 @@ async def update_featured_games():
     - Highly rated games (top rated of all time)
     - Latest releases (past 30 days)
     
+    Then re-ranks the discovery_rankings lists the homepage endpoints read.
+    
     Individual game pages use SWR pattern for on-demand refresh.
     """
     try:
@@ -83,6 +85,12 @@ async def update_featured_games():
             total_new = trending_new + anticipated_new + rated_new + latest_new
             total_updated = trending_updated + anticipated_updated + rated_updated + latest_updated
             logger.info(f"[Scheduler] Complete: {total_new} new, {total_updated} updated")
+
+            # Re-rank the homepage lists over the whole table, then drop the
+            # cached responses so the new rankings are served right away
+            sizes = services.refresh_discovery_rankings(db)
+            await cache.invalidate(*(f"discovery:{list_name}" for list_name in sizes))
+            logger.info(f"[Scheduler] Discovery rankings: {sizes}")
             
         finally:
             db.close()